@@ -1 +0,0 @@
-from django.contrib import admin
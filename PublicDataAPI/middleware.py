@@ -1,18 +1,64 @@
-from django.http import JsonResponse
+import gzip
+import hashlib
+import json
+import logging
+from urllib.parse import urlencode
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse, JsonResponse
 from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.http import parse_http_date_safe
+from apps.health import metrics
+from apps.public_api.instrumentation import ameasuring, measuring
+from apps.public_api.routers import areading_from_replicas, reading_from_replicas, replica_aliases
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Encodings CompressionMiddleware can produce, in order of preference. Levels favour speed,
+# since bodies are compressed per request (or per response cache entry).
+COMPRESSORS = {}
+if brotli is not None:
+    COMPRESSORS['br'] = lambda content: brotli.compress(content, quality=5)
+COMPRESSORS['gzip'] = lambda content: gzip.compress(content, compresslevel=6, mtime=0)
+
+timing_logger = logging.getLogger('PublicDataAPI.timing')
+slow_request_logger = logging.getLogger('PublicDataAPI.slow_requests')
+
 
 class APIKeyMiddleware:
+    # Works in both sync (WSGI) and async (ASGI) request paths, the check itself does no I/O
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        # Decided once, like Django's MiddlewareMixin: the check is measurable on every request
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.reject(request) or self.get_response(request)
+
+    async def __acall__(self, request):
+        return self.reject(request) or await self.get_response(request)
+
+    def reject(self, request):
         # Skip API key check for swagger docs
         if request.path == '/':
-            return self.get_response(request)
+            return None
         
         # Skip API key check for swagger docs
         if request.path.startswith('/api/public/schema/'):
-            return self.get_response(request)
+            return None
 
         # Get API key from header
         api_key = request.headers.get(settings.API_KEY_HEADER)
@@ -33,4 +79,298 @@ class APIKeyMiddleware:
                 'code': 'invalid_api_key'
             }, status=401)
 
-        return self.get_response(request) 
+        return None
+
+
+class ResponseCacheMiddleware:
+    """
+    Caches the rendered JSON of the endpoints listed in PUBLIC_API_RESPONSE_CACHE_TTLS (by URL
+    name, with their TTL in seconds). The key is the path plus the sorted, non-empty query
+    parameters, so parameter order does not split entries. Sits after APIKeyMiddleware, so only
+    authenticated requests reach it.
+
+    Clients can skip the cache with `Cache-Control: no-cache` (the fresh response replaces the
+    entry) or `X-Cache-Bypass: 1` (the cache is neither read nor written). The outcome is
+    reported in the X-Cache header: HIT, MISS or BYPASS.
+    """
+    BYPASS_HEADER = 'X-Cache-Bypass'
+    STORED_HEADERS = ('ETag', 'Last-Modified', 'Content-Encoding', 'Vary')
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        entry = self.entry_to_store(request, response)
+        if entry:
+            cache.set(*entry)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        entry = self.entry_to_store(request, response)
+        if entry:
+            await cache.aset(*entry)
+        return response
+
+    def entry_to_store(self, request, response):
+        # Sets X-Cache and returns the (key, value, ttl) to cache for this response, if any
+        status = getattr(request, '_response_cache_status', None)
+        if status is None:
+            return None
+        response['X-Cache'] = status
+        if status == 'MISS' and response.status_code == 200 and not response.streaming \
+                and response.get('Content-Type', '').startswith('application/json'):
+            key, ttl = request._response_cache_entry
+            headers = {name: response[name] for name in self.STORED_HEADERS if response.has_header(name)}
+            return key, (response.content, response['Content-Type'], headers), ttl
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method != 'GET' or request.resolver_match is None:
+            return None
+        ttl = settings.PUBLIC_API_RESPONSE_CACHE_TTLS.get(request.resolver_match.url_name)
+        if not ttl:
+            return None
+
+        if request.headers.get(self.BYPASS_HEADER, '').lower() in ('1', 'true'):
+            request._response_cache_status = 'BYPASS'
+            return None
+
+        key = self.cache_key(request)
+        request._response_cache_status = 'MISS'
+        request._response_cache_entry = (key, ttl)
+        if 'no-cache' in request.headers.get('Cache-Control', '').lower():
+            return None
+
+        entry = cache.get(key)
+        if entry is None:
+            return None
+
+        content, content_type, headers = entry
+        response = HttpResponse(content, content_type=content_type)
+        for name, value in headers.items():
+            response[name] = value
+        request._response_cache_status = 'HIT'
+        # Honour If-None-Match/If-Modified-Since against the cached validators
+        return get_conditional_response(
+            request,
+            etag=headers.get('ETag'),
+            last_modified=parse_http_date_safe(headers['Last-Modified']) if 'Last-Modified' in headers else None,
+            response=response,
+        )
+
+    @staticmethod
+    def cache_key(request):
+        # Stable sort on the name only, repeated parameters keep their order (it can be significant)
+        params = sorted(
+            ((name, value) for name, values in request.GET.lists() for value in values if value != ''),
+            key=lambda item: item[0],
+        )
+        # Entries hold the body as CompressionMiddleware encoded it for this client
+        raw = f"{request.path}?{urlencode(params)}|{request.headers.get('Accept', '')}|{negotiate_encoding(request) or ''}"
+        return f"public_api:response:{hashlib.sha1(raw.encode()).hexdigest()}"
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses JSON responses of at least PUBLIC_API_COMPRESSION_MIN_SIZE bytes with brotli (when
+    the brotli package is installed) or gzip, whichever the client's Accept-Encoding prefers.
+    Sits after ResponseCacheMiddleware, so cache entries store the compressed body and hits are
+    served without compressing again.
+    """
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding') \
+                or not response.get('Content-Type', '').startswith('application/json') \
+                or len(response.content) < settings.PUBLIC_API_COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request)
+        if encoding is None:
+            return response
+        compressed = COMPRESSORS[encoding](response.content)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        # The encoded bytes differ from the identity ones, so a strong ETag becomes weak
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        return response
+
+
+def negotiate_encoding(request):
+    # The encoding in COMPRESSORS with the highest Accept-Encoding quality, ties go to the first one
+    accepted = {}
+    for item in request.headers.get('Accept-Encoding', '').split(','):
+        coding, _, params = item.partition(';')
+        quality = 1.0
+        params = params.strip().lower()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for coding in COMPRESSORS:
+        quality = accepted.get(coding, accepted.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class MetricsMiddleware:
+    """
+    Records the Prometheus metrics of apps.health.metrics for every request: counts by status,
+    latency and SQL time histograms, query counts, response cache outcomes and requests in
+    progress. Shares the per-request SQL measurement with QueryTimingMiddleware, so it must come
+    before it. Only installed when PUBLIC_API_METRICS is on.
+    """
+    METHODS = ('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS')
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PUBLIC_API_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with metrics.IN_PROGRESS.track_inprogress(), measuring() as request_metrics:
+            response = self.get_response(request)
+        self.observe(request, response, request_metrics)
+        return response
+
+    async def __acall__(self, request):
+        with metrics.IN_PROGRESS.track_inprogress():
+            async with ameasuring() as request_metrics:
+                response = await self.get_response(request)
+        self.observe(request, response, request_metrics)
+        return response
+
+    def observe(self, request, response, request_metrics):
+        # Labels stay bounded: URL names (or the route pattern) instead of paths, known methods only
+        match = request.resolver_match
+        view = (match.url_name or match.route) if match else 'unmatched'
+        method = request.method if request.method in self.METHODS else 'other'
+        metrics.REQUESTS.labels(view, method, str(response.status_code)).inc()
+        metrics.REQUEST_DURATION.labels(view).observe(request_metrics.elapsed_ms / 1000)
+        metrics.REQUEST_DB_DURATION.labels(view).observe(request_metrics.db_ms / 1000)
+        for alias, count in request_metrics.aliases.items():
+            metrics.DB_QUERIES.labels(view, alias).inc(count)
+        if response.has_header('X-Cache'):
+            metrics.RESPONSE_CACHE.labels(view, response['X-Cache']).inc()
+
+
+class QueryTimingMiddleware:
+    """
+    Times the SQL of each request with an execute wrapper on every database connection, plus the
+    serialize and render phases recorded by apps.public_api.instrumentation.timed. Reports them
+    in a Server-Timing header and a JSON line on the PublicDataAPI.timing logger. Requests taking
+    PUBLIC_API_SLOW_REQUEST_MS or longer are also logged to PublicDataAPI.slow_requests with every
+    statement they ran (without parameters). Only installed when PUBLIC_API_QUERY_TIMING is on.
+
+    Queries run while a streaming response is consumed happen after the headers are sent and
+    are not counted.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PUBLIC_API_QUERY_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with measuring() as metrics:
+            response = self.get_response(request)
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request):
+        async with ameasuring() as metrics:
+            response = await self.get_response(request)
+        return self.report(request, response, metrics)
+
+    def report(self, request, response, metrics):
+        total_ms = metrics.elapsed_ms
+        timings = [f'db;dur={metrics.db_ms:.2f};desc="{len(metrics.queries)} queries"']
+        timings += [f'{phase};dur={milliseconds:.2f}' for phase, milliseconds in metrics.phases.items()]
+        timings.append(f'total;dur={total_ms:.2f}')
+        response['Server-Timing'] = ', '.join(timings)
+
+        slowest_sql, slowest_ms = metrics.slowest
+        line = {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'view': request.resolver_match.url_name if request.resolver_match else None,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 2),
+            'db_ms': round(metrics.db_ms, 2),
+            'queries': len(metrics.queries),
+            **{f'{phase}_ms': round(milliseconds, 2) for phase, milliseconds in metrics.phases.items()},
+            'slowest_ms': round(slowest_ms, 2),
+            'slowest_sql': slowest_sql,
+        }
+        timing_logger.info(json.dumps(line))
+        if total_ms >= settings.PUBLIC_API_SLOW_REQUEST_MS:
+            line['sql'] = [{'sql': sql, 'ms': round(milliseconds, 2)} for sql, milliseconds in metrics.queries]
+            slow_request_logger.warning(json.dumps(line))
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Lets apps.public_api.routers.ReplicaRouter send the queries of GET and HEAD requests to a
+    read replica, so public traffic does not compete with the primary's writes. Requests with
+    other methods keep every query on the primary. Only installed when PUBLIC_API_REPLICA_URLS
+    configures at least one replica.
+    """
+    READ_METHODS = ('GET', 'HEAD')
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_aliases():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if request.method not in self.READ_METHODS:
+            return self.get_response(request)
+        with reading_from_replicas():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.method not in self.READ_METHODS:
+            return await self.get_response(request)
+        # The context variable follows the request into the sync_to_async threads running its queries
+        async with areading_from_replicas():
+            return await self.get_response(request)
@@ -0,0 +1,97 @@
+import hashlib
+import threading
+from pathlib import Path
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from drf_spectacular.generators import SchemaGenerator
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SpectacularAPIView
+from .middleware import COMPRESSORS, negotiate_encoding
+
+# Rendered schema files written by `manage.py build_schema`, by renderer format
+SCHEMA_FILES = {
+    'yaml': ('openapi.yaml', OpenApiYamlRenderer),
+    'json': ('openapi.json', OpenApiJsonRenderer),
+}
+
+_artifacts = {}
+_artifacts_lock = threading.Lock()
+
+
+def render_schema():
+    # {format: bytes} of the schema, generated the way SpectacularAPIView does for an anonymous request
+    schema = SchemaGenerator().get_schema(request=None, public=True)
+    return {
+        schema_format: renderer().render(schema, renderer.media_type, {})
+        for schema_format, (_, renderer) in SCHEMA_FILES.items()
+    }
+
+
+def write_schema_files(directory):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for schema_format, content in render_schema().items():
+        path = directory / SCHEMA_FILES[schema_format][0]
+        path.write_bytes(content)
+        paths.append(path)
+    return paths
+
+
+def get_schema_artifacts():
+    """
+    {format: {encoding: (bytes, etag)}} of the schema, with None as the identity encoding. Read
+    from PUBLIC_API_SCHEMA_DIR when build_schema wrote the files there at deploy, generated on
+    the first request of the process otherwise. Every encoding is compressed once, here.
+    """
+    if not _artifacts:
+        with _artifacts_lock:
+            if not _artifacts:
+                directory = Path(settings.PUBLIC_API_SCHEMA_DIR)
+                if all((directory / filename).exists() for filename, _ in SCHEMA_FILES.values()):
+                    rendered = {schema_format: (directory / filename).read_bytes()
+                                for schema_format, (filename, _) in SCHEMA_FILES.items()}
+                else:
+                    rendered = render_schema()
+                _artifacts.update({
+                    schema_format: _encode_variants(content) for schema_format, content in rendered.items()
+                })
+    return _artifacts
+
+
+def _encode_variants(content):
+    variants = {None: content}
+    variants.update({encoding: compress(content) for encoding, compress in COMPRESSORS.items()})
+    # Strong ETags: each encoding is a different byte sequence
+    return {encoding: (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"') for encoding, body in variants.items()}
+
+
+class PrecomputedSchemaView(SpectacularAPIView):
+    """
+    SpectacularAPIView serving the schema rendered once per deploy (see get_schema_artifacts)
+    instead of introspecting every view on each request, with strong ETags and a long max-age.
+    Formats are negotiated as before. The `lang` and `version` parameters are ignored. With
+    DEBUG on the schema is generated per request, so code changes show up immediately.
+    """
+    @extend_schema(exclude=True)
+    def get(self, request, *args, **kwargs):
+        if settings.DEBUG:
+            return super().get(request, *args, **kwargs)
+
+        variants = get_schema_artifacts()[request.accepted_renderer.format]
+        encoding = negotiate_encoding(request)
+        body, etag = variants[encoding]
+
+        content_type = request.accepted_media_type
+        if request.accepted_renderer.charset:
+            content_type = f'{content_type}; charset={request.accepted_renderer.charset}'
+        response = HttpResponse(body, content_type=content_type)
+        response['Content-Disposition'] = f'inline; filename="{self._get_filename(request, None)}"'
+        if encoding is not None:
+            response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Accept-Encoding',))
+        patch_cache_control(response, public=True, max_age=settings.PUBLIC_API_SCHEMA_MAX_AGE)
+        return get_conditional_response(request, etag=etag, response=response)
@@ -1,6 +1,6 @@
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import config, Csv
 import dj_database_url
 import os
 from corsheaders.defaults import default_headers
@@ -20,7 +20,34 @@ DATABASE_URL = config('DATABASE_URL')  # Ensure DATABASE_URL is set in .env or e
 
 # Configure databases
 DATABASES = {
-    'default': dj_database_url.config(default=DATABASE_URL, conn_max_age=600, ssl_require=True)
+    'default': dj_database_url.config(
+        default=DATABASE_URL,
+        # Use 0 when serving through ASGI, persistent connections are not reused across async requests
+        conn_max_age=config('DATABASE_CONN_MAX_AGE', default=600, cast=int),
+        # Set DATABASE_SSL_REQUIRE=False for a local SQLite database
+        ssl_require=config('DATABASE_SSL_REQUIRE', default=True, cast=bool)
+    )
+}
+
+# Read replicas for the public API's GET requests, as comma-separated database URLs. They become the
+# aliases replica_1, replica_2, ... routed by apps.public_api.routers.ReplicaRouter.
+PUBLIC_API_REPLICA_URLS = config('PUBLIC_API_REPLICA_URLS', default='', cast=Csv())
+for number, replica_url in enumerate(PUBLIC_API_REPLICA_URLS, start=1):
+    DATABASES[f'replica_{number}'] = dj_database_url.parse(
+        replica_url,
+        conn_max_age=config('DATABASE_CONN_MAX_AGE', default=600, cast=int),
+        ssl_require=config('DATABASE_SSL_REQUIRE', default=True, cast=bool)
+    )
+DATABASE_ROUTERS = ['apps.public_api.routers.ReplicaRouter']
+
+# Cache backend, local memory per process unless a shared backend is configured
+# (e.g. CACHE_BACKEND=django.core.cache.backends.redis.RedisCache CACHE_LOCATION=redis://host:6379).
+# Production needs a shared one: `manage.py check --deploy` warns otherwise (public_api.W001)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
 }
 
 # Allow all hosts
@@ -51,7 +78,14 @@ MIDDLEWARE = [
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Outside the API key check and the response cache, so rejected requests and cache hits are measured too.
+    # MetricsMiddleware must precede QueryTimingMiddleware, they share the per-request SQL measurement.
+    'PublicDataAPI.middleware.MetricsMiddleware',
+    'PublicDataAPI.middleware.QueryTimingMiddleware',
     'PublicDataAPI.middleware.APIKeyMiddleware',  # Add API Key middleware
+    'PublicDataAPI.middleware.ReplicaRoutingMiddleware',  # Only active when read replicas are configured
+    'PublicDataAPI.middleware.ResponseCacheMiddleware',  # Must stay after APIKeyMiddleware
+    'PublicDataAPI.middleware.CompressionMiddleware',  # After ResponseCacheMiddleware so cached bodies are stored compressed
 ]
 
 
@@ -85,6 +119,11 @@ REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'EXCEPTION_HANDLER': 'PublicDataAPI.utils.custom_exception_handler',
     'NON_FIELD_ERRORS_KEY': 'message',
+    # orjson-backed, same output as the stock JSONRenderer (stdlib json when orjson is missing)
+    'DEFAULT_RENDERER_CLASSES': [
+        'apps.public_api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 PRODUCTION_URL = config('PRODUCTION_URL', default='https://default-url.app')
@@ -123,6 +162,12 @@ Authentication:
     'SCHEMA_PATH_PREFIX': '/api/'
 }
 
+# Rendered OpenAPI schema written by `manage.py build_schema` at deploy. Without the files the schema is
+# rendered on the first request of each process; with DEBUG on it is generated on every request.
+PUBLIC_API_SCHEMA_DIR = config('PUBLIC_API_SCHEMA_DIR', default=str(BASE_DIR / 'build' / 'schema'))
+# Seconds clients and CDNs may reuse the schema before revalidating its ETag
+PUBLIC_API_SCHEMA_MAX_AGE = config('PUBLIC_API_SCHEMA_MAX_AGE', default=86400, cast=int)
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -141,3 +186,94 @@ FTP_ALLOW_OVERWRITE = True
 CORS_ALLOW_HEADERS = list(default_headers) + [
     'X-API-KEY',
 ]
+
+# Total count strategy of each public list endpoint in page-number mode:
+# 'exact', 'cached' (TTL below) or 'estimate' (planner statistics, unfiltered listings only)
+PUBLIC_API_COUNT_STRATEGIES = {
+    'list-quizzes-in-hallofquiz': 'exact',
+    'list-user-feedback': 'cached',
+    'list-quiz-feedback': 'estimate',
+    'list-leaderboard': 'exact',
+}
+PUBLIC_API_COUNT_CACHE_TTL = config('PUBLIC_API_COUNT_CACHE_TTL', default=60, cast=int)
+# Below this many estimated rows the table is counted exactly
+PUBLIC_API_COUNT_ESTIMATE_THRESHOLD = config('PUBLIC_API_COUNT_ESTIMATE_THRESHOLD', default=100000, cast=int)
+
+# Largest page_size of the paginated list endpoints, larger values are lowered to it
+PUBLIC_API_MAX_PAGE_SIZE = config('PUBLIC_API_MAX_PAGE_SIZE', default=1000, cast=int)
+
+# Maximum number of identifiers accepted by get-user-info-batch
+PUBLIC_API_USER_INFO_BATCH_LIMIT = config('PUBLIC_API_USER_INFO_BATCH_LIMIT', default=100, cast=int)
+# Maximum number of quiz IDs accepted by get-quiz-rating-summary
+PUBLIC_API_QUIZ_RATING_BATCH_LIMIT = config('PUBLIC_API_QUIZ_RATING_BATCH_LIMIT', default=100, cast=int)
+# Maximum number of quiz IDs accepted by get-quiz-detail
+PUBLIC_API_QUIZ_DETAIL_BATCH_LIMIT = config('PUBLIC_API_QUIZ_DETAIL_BATCH_LIMIT', default=20, cast=int)
+
+# Lifetime of the cached per-user stats and of the user info versions the get-user-info ETags are built from.
+# Writes made through this service invalidate them immediately, the TTL bounds how long writes from other
+# services can go unseen.
+PUBLIC_API_USER_STATS_CACHE_TTL = config('PUBLIC_API_USER_STATS_CACHE_TTL', default=300, cast=int)
+# Lifetime of the cached quiz content (questions and answer options), invalidated the same way
+PUBLIC_API_QUIZ_CONTENT_CACHE_TTL = config('PUBLIC_API_QUIZ_CONTENT_CACHE_TTL', default=3600, cast=int)
+
+# Full-response cache TTL in seconds per public endpoint (by URL name); endpoints not listed are not cached
+PUBLIC_API_RESPONSE_CACHE_TTLS = {
+    'list-quizzes-in-hallofquiz': 30,
+    'list-user-feedback': 30,
+    'list-quiz-feedback': 30,
+    'get-user-info': 60,
+    'get-quiz-rating-summary': 60,
+    'list-leaderboard': 60,
+    'get-leaderboard-rank': 60,
+}
+
+# Rows fetched per round trip by the streaming export endpoints
+PUBLIC_API_EXPORT_CHUNK_SIZE = config('PUBLIC_API_EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# JSON responses smaller than this many bytes are sent uncompressed
+PUBLIC_API_COMPRESSION_MIN_SIZE = config('PUBLIC_API_COMPRESSION_MIN_SIZE', default=1024, cast=int)
+
+# Serialize list and export rows from QuerySet.values() (apps/public_api/serialization.py) instead of through
+# the DRF serializers; the output is identical, see `manage.py benchmark_serialization`
+PUBLIC_API_FAST_SERIALIZATION = config('PUBLIC_API_FAST_SERIALIZATION', default=True, cast=bool)
+
+# Serve get-user-info and the three list endpoints with the native async views (apps/public_api/AsyncPublicData.py).
+# Only useful under an ASGI server, see "Serving with ASGI" in the README.
+PUBLIC_API_ASYNC_VIEWS = config('PUBLIC_API_ASYNC_VIEWS', default=False, cast=bool)
+
+# Per-request SQL timing (PublicDataAPI.middleware.QueryTimingMiddleware): a Server-Timing header and a JSON
+# log line per request, and the statements of requests slower than PUBLIC_API_SLOW_REQUEST_MS
+PUBLIC_API_QUERY_TIMING = config('PUBLIC_API_QUERY_TIMING', default=False, cast=bool)
+PUBLIC_API_SLOW_REQUEST_MS = config('PUBLIC_API_SLOW_REQUEST_MS', default=500, cast=int)
+
+# Replica selection: round_robin, or least_loaded (fewest requests of this process reading from it)
+PUBLIC_API_REPLICA_STRATEGY = config('PUBLIC_API_REPLICA_STRATEGY', default='round_robin')
+# Replicas further behind than this many seconds are skipped, reads go to the primary when none is usable
+PUBLIC_API_REPLICA_MAX_LAG = config('PUBLIC_API_REPLICA_MAX_LAG', default=5.0, cast=float)
+# Seconds between health and lag checks of each replica, per process
+PUBLIC_API_REPLICA_CHECK_INTERVAL = config('PUBLIC_API_REPLICA_CHECK_INTERVAL', default=10.0, cast=float)
+
+# Hours of submissions the trending sort of the Hall of Quiz counts in hourly buckets. `manage.py compact_quiz_activity`
+# rolls older hours into daily buckets, which the 7d and 30d windows count whole.
+PUBLIC_API_TRENDING_HOURLY_RETENTION = config('PUBLIC_API_TRENDING_HOURLY_RETENTION', default=48, cast=int)
+
+# Leaderboards materialized by `manage.py build_leaderboards`: candidates kept per board, and the number of
+# quiz results a candidate needs to be ranked
+PUBLIC_API_LEADERBOARD_SIZE = config('PUBLIC_API_LEADERBOARD_SIZE', default=1000, cast=int)
+PUBLIC_API_LEADERBOARD_MIN_ATTEMPTS = config('PUBLIC_API_LEADERBOARD_MIN_ATTEMPTS', default=5, cast=int)
+
+# Prometheus metrics (apps/health/metrics.py), served at /api/public/health/metrics/. Under gunicorn set
+# PROMETHEUS_MULTIPROC_DIR so the workers share one file-backed store, see gunicorn.conf.py.
+PUBLIC_API_METRICS = config('PUBLIC_API_METRICS', default=True, cast=bool)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'PublicDataAPI.timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+        'PublicDataAPI.slow_requests': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
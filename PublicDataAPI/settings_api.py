@@ -0,0 +1,36 @@
+"""
+API-only settings profile: DJANGO_SETTINGS_MODULE=PublicDataAPI.settings_api
+
+The public API authenticates with the X-API-KEY header alone and never reads sessions, CSRF
+tokens or flash messages, so this profile removes those apps and middleware, DRF's session and
+basic authentication, and the browsable API renderer (responses are always JSON). Fewer apps
+and middleware mean less work at worker boot and on every request; compare both profiles with
+`manage.py benchmark_startup`.
+"""
+from copy import deepcopy
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK, TEMPLATES
+
+UNUSED_APPS = ('django.contrib.sessions', 'django.contrib.messages')
+UNUSED_MIDDLEWARE = (
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in UNUSED_APPS]
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in UNUSED_MIDDLEWARE]
+
+TEMPLATES = deepcopy(TEMPLATES)
+TEMPLATES[0]['OPTIONS']['context_processors'] = [
+    processor for processor in TEMPLATES[0]['OPTIONS']['context_processors']
+    if not processor.startswith('django.contrib.messages.')
+]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    # APIKeyMiddleware has already checked the key; request.user stays None
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'UNAUTHENTICATED_USER': None,
+    'DEFAULT_RENDERER_CLASSES': ['apps.public_api.renderers.FastJSONRenderer'],
+}
@@ -1,13 +1,28 @@
-from django.contrib import admin
 from django.urls import path, include
 from django.shortcuts import redirect
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework.permissions import AllowAny
 
-# Swagger views with authentication disabled
-schema_view = SpectacularAPIView.as_view(permission_classes=[AllowAny])
-swagger_view = SpectacularSwaggerView.as_view(url_name='schema', permission_classes=[AllowAny])
-redoc_view = SpectacularRedocView.as_view(url_name='schema', permission_classes=[AllowAny])
+
+def lazy_view(view_class, **initkwargs):
+    # Imports the view class on its first request. drf_spectacular's views pull in the schema
+    # generator and its renderers, which workers serving only API requests never need.
+    view = None
+
+    @csrf_exempt
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(view_class).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+    return dispatch
+
+
+# Swagger views with authentication disabled. The schema is rendered once per process, see PublicDataAPI/schema.py
+schema_view = lazy_view('PublicDataAPI.schema.PrecomputedSchemaView', permission_classes=[AllowAny])
+swagger_view = lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema', permission_classes=[AllowAny])
+redoc_view = lazy_view('drf_spectacular.views.SpectacularRedocView', url_name='schema', permission_classes=[AllowAny])
 
 urlpatterns = [
     path('', include('apps.utility.urls')),
@@ -0,0 +1,57 @@
+import os
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, generate_latest
+from prometheus_client import multiprocess
+
+# Metrics of the public API, exposed by apps.health.views.metrics. With PROMETHEUS_MULTIPROC_DIR set
+# (before prometheus_client is imported), every process writes its values to memory-mapped files
+# in that directory and the endpoint aggregates all of them, so any gunicorn worker serves the
+# totals of the whole box. See gunicorn.conf.py for the directory cleanup.
+
+REQUESTS = Counter(
+    'public_api_requests_total', 'Requests handled, by view, method and status code',
+    ['view', 'method', 'status'],
+)
+REQUEST_DURATION = Histogram(
+    'public_api_request_duration_seconds', 'Time from the request entering the middleware stack to the response',
+    ['view'],
+)
+REQUEST_DB_DURATION = Histogram(
+    'public_api_request_db_seconds', 'Time spent executing SQL per request',
+    ['view'],
+)
+DB_QUERIES = Counter(
+    'public_api_db_queries_total', 'SQL statements executed, by view and database alias',
+    ['view', 'alias'],
+)
+# Not labelled by view: the URL is only resolved further down the middleware stack
+IN_PROGRESS = Gauge(
+    'public_api_requests_in_progress', 'Requests being handled right now',
+    multiprocess_mode='livesum',
+)
+RESPONSE_CACHE = Counter(
+    'public_api_response_cache_total', 'ResponseCacheMiddleware lookups, by X-Cache outcome',
+    ['view', 'result'],
+)
+USER_STATS_CACHE = Counter(
+    'public_api_user_stats_cache_total', 'Per-user stats cache lookups',
+    ['result'],
+)
+# Set by the replica checks of apps.public_api.routers, the latest check of any process wins
+REPLICA_LAG = Gauge(
+    'public_api_replica_lag_seconds', 'Replication lag measured by the last replica check',
+    ['alias'],
+    multiprocess_mode='mostrecent',
+)
+REPLICA_FALLBACKS = Counter(
+    'public_api_replica_fallbacks_total', 'Replica checks that took a replica out of rotation',
+    ['alias', 'reason'],
+)
+
+
+def render_metrics():
+    # Prometheus text format of all processes in multiprocess mode, of this process otherwise
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
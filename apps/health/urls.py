@@ -4,4 +4,5 @@ from . import views
 
 urlpatterns = [
     path('check/', views.health_check, name='health_check'),
+    path('metrics/', views.metrics, name='metrics'),
 ]
\ No newline at end of file
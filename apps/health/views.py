@@ -5,6 +5,8 @@ from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
 from drf_spectacular.types import OpenApiTypes
+from prometheus_client import CONTENT_TYPE_LATEST
+from .metrics import render_metrics
 
 @extend_schema(
     request={'application/json': {'type': 'object', 'properties': {'message': {'type': 'string'}}}},
@@ -40,4 +42,18 @@ def health_check(request):
         "greeting": f"Hello, {message}!"
     }
     
-    return Response(response_data)
\ No newline at end of file
+    return Response(response_data)
+
+
+@extend_schema(
+    responses={(200, 'text/plain'): OpenApiTypes.STR},
+    description=(
+        'Request counts, latency and SQL time histograms, query counts, response and user stats cache '
+        'lookups and in-flight requests of the public API, in the Prometheus text exposition format. '
+        'When PROMETHEUS_MULTIPROC_DIR is set the values cover every worker process of the server.'
+    ),
+)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def metrics(request):
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,131 @@
+from functools import wraps
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, HttpResponseNotAllowed
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from .GetUserInformation import UserInfoSerializer, build_user_info, profile_queryset, requested_user
+from . import ListUserFeedback, ListQuizFeedback
+from .ListUserFeedback import UserFeedbackSerializer, filter_user_feedback
+from .ListQuizFeedback import QuizFeedbackSerializer, filter_quiz_feedback
+from .ListQuizzesInHallOfQuiz import filter_global_quizzes, hall_of_quiz_listing, trending_changed_at
+from .fieldsets import requested_fields
+from .serialization import aserialize_page
+from .conditional import alist_condition, has_validators, version_etag
+from .user_stats import aget_cached_user_stats, aget_profile_with_user_stats, aget_user_version
+from .renderers import FastJSONRenderer
+
+# Native async versions of the four public read endpoints, routed in place of the DRF views
+# when PUBLIC_API_ASYNC_VIEWS is on (see urls.py). They take the same parameters and return the
+# same bodies, status codes and validators; the DRF views stay the documented implementation.
+
+
+def async_get_view(view):
+    # DRF's @api_view only wraps sync functions, so method checks, rendering and the
+    # APIException -> {'field': {'message', 'code'}} mapping of custom_exception_handler live here
+    @wraps(view)
+    async def inner(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return HttpResponseNotAllowed(['GET'])
+        try:
+            data, status_code = await view(request, *args, **kwargs)
+        except APIException as exc:
+            data, status_code = exc.get_full_details(), exc.status_code
+        return render_json(data, status_code)
+    return inner
+
+
+def render_json(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(FastJSONRenderer().render(data), status=status_code, content_type='application/json')
+
+
+# Query building can hit the database once per process on SQLite (see SQLiteFTSSearchBackend),
+# which is not allowed from the event loop
+async_filter_user_feedback = sync_to_async(filter_user_feedback)
+async_filter_quiz_feedback = sync_to_async(filter_quiz_feedback)
+async_filter_global_quizzes = sync_to_async(filter_global_quizzes)
+
+
+async def get_user_info(request):
+    # Same validator as user_info_etag on the DRF view, whose @condition is sync only
+    etag = await auser_info_etag(request) if request.method == 'GET' else None
+    if etag is None:
+        return await _get_user_info(request)
+    etag = quote_etag(etag)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = await _get_user_info(request)
+        if has_validators(response):
+            response.headers.setdefault('ETag', etag)
+    return response
+
+
+async def arequested_profile(request):
+    # Async counterpart of GetUserInformation.requested_profile
+    if not hasattr(request, '_public_api_profile'):
+        request._public_api_profile = await profile_queryset(*requested_user(request.GET)).afirst()
+    return request._public_api_profile
+
+
+async def auser_info_etag(request):
+    requested = requested_user(request.GET)
+    if requested is None:
+        return None
+    lookup, value = requested
+    if lookup == 'user_id':
+        if not value.isdigit():
+            return None
+        user_pk = int(value)
+    else:
+        profile = await arequested_profile(request)
+        if profile is None:
+            return None
+        user_pk = profile.user_id
+    return version_etag(request, {user_pk: await aget_user_version(user_pk)})
+
+
+@async_get_view
+async def _get_user_info(request):
+    if requested_user(request.GET) is None:
+        return {'error': 'One of user_id, username, or email query parameters must be provided'}, status.HTTP_400_BAD_REQUEST
+
+    lookup, value = requested_user(request.GET)
+    if lookup == 'user_id' and value.isdigit():
+        profile, stats = await aget_profile_with_user_stats(profile_queryset(lookup, value), int(value))
+    else:
+        profile = await arequested_profile(request)
+        stats = profile and await aget_cached_user_stats(profile.user_id)
+    if not profile:
+        return {'error': 'User or user profile not found'}, status.HTTP_404_NOT_FOUND
+
+    return UserInfoSerializer(build_user_info(profile, stats)).data, status.HTTP_200_OK
+
+
+@alist_condition(async_filter_global_quizzes, modified_fields=('create_date', 'stats__updated_at'), changed_at=trending_changed_at)
+@async_get_view
+async def list_quizzes_in_hallofquiz(request):
+    quizzes, serializer_class, fields, ordering = hall_of_quiz_listing(request.GET, await async_filter_global_quizzes(request.GET))
+
+    results, pagination = await aserialize_page(request, quizzes, serializer_class, fields, ordering, default_page_size=12)
+    return {**pagination, "results": results}, status.HTTP_200_OK
+
+
+@alist_condition(async_filter_user_feedback, modified_fields=('create_date',))
+@async_get_view
+async def list_user_feedback(request):
+    fields = requested_fields(request.GET, UserFeedbackSerializer)
+    feedbacks = await async_filter_user_feedback(request.GET)
+
+    results, pagination = await aserialize_page(request, feedbacks, UserFeedbackSerializer, fields, ListUserFeedback.ORDERING, default_page_size=10)
+    return {**pagination, "results": results}, status.HTTP_200_OK
+
+
+@alist_condition(async_filter_quiz_feedback, modified_fields=('create_date',))
+@async_get_view
+async def list_quiz_feedback(request):
+    fields = requested_fields(request.GET, QuizFeedbackSerializer)
+    feedbacks = await async_filter_quiz_feedback(request.GET)
+
+    results, pagination = await aserialize_page(request, feedbacks, QuizFeedbackSerializer, fields, ListQuizFeedback.ORDERING, default_page_size=10)
+    return {**pagination, "results": results}, status.HTTP_200_OK
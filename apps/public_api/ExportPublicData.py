@@ -0,0 +1,231 @@
+import csv
+import json
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework import status
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
+from .ListUserFeedback import UserFeedbackSerializer, filter_user_feedback
+from .ListQuizFeedback import QuizFeedbackSerializer, filter_quiz_feedback
+from .ListQuizzesInHallOfQuiz import QuizSerializer, filter_global_quizzes, with_quiz_stats, with_creator_name
+from .serialization import ValuesSerializer
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+class Echo:
+    # File-like object for csv.writer that hands each written line back instead of buffering it
+    def write(self, value):
+        return value
+
+
+def stream_export(request, queryset, serializer_class, filename):
+    """
+    Streams every row of `queryset` as NDJSON (default) or CSV, chosen with the `output` query
+    parameter. Rows are read in chunks (a server-side cursor under WSGI, aiterator() under ASGI)
+    and serialized one at a time, so memory use does not depend on the size of the export.
+    """
+    output = request.query_params.get('output', 'ndjson')
+    if output not in EXPORT_FORMATS:
+        return Response({'error': f"output must be one of: {', '.join(EXPORT_FORMATS)}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    # Rows are read while the response streams, after the request's replica routing has ended,
+    # so the database is pinned to the one chosen for this request now
+    queryset = queryset.using(queryset.db)
+    chunk_size = settings.PUBLIC_API_EXPORT_CHUNK_SIZE
+    if settings.PUBLIC_API_FAST_SERIALIZATION:
+        serializer = ValuesSerializer(serializer_class)
+        source, to_row = serializer.values(queryset), serializer.serialize_row
+    else:
+        serializer = serializer_class()
+        source, to_row = queryset, serializer.to_representation
+    if output == 'csv':
+        writer = csv.DictWriter(Echo(), fieldnames=list(serializer_class().fields))
+        header, encode = writer.writeheader(), writer.writerow
+    else:
+        header, encode = None, _ndjson_line
+
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        # StreamingHttpResponse reads a sync iterator to the end before sending anything under ASGI,
+        # so the rows come from an async generator there
+        content = _alines(source.aiterator(chunk_size=chunk_size), to_row, header, encode)
+    else:
+        content = _lines(source.iterator(chunk_size=chunk_size), to_row, header, encode)
+
+    response = StreamingHttpResponse(content, content_type=EXPORT_FORMATS[output])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{output}"'
+    return response
+
+
+def _ndjson_line(row):
+    return json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + '\n'
+
+
+def _lines(items, to_row, header, encode):
+    if header is not None:
+        yield header
+    for item in items:
+        yield encode(to_row(item))
+
+
+async def _alines(items, to_row, header, encode):
+    if header is not None:
+        yield header
+    async for item in items:
+        yield encode(to_row(item))
+
+
+OUTPUT_PARAMETER = OpenApiParameter(
+    name='output',
+    type=str,
+    location=OpenApiParameter.QUERY,
+    enum=list(EXPORT_FORMATS),
+    description='Export format: ndjson (one JSON object per line, default) or csv'
+)
+API_KEY_PARAMETER = OpenApiParameter(
+    name='X-API-KEY',
+    type=str,
+    location=OpenApiParameter.HEADER,
+    description='API key for authentication',
+    required=True
+)
+TEXT_FILTERS = [
+    OpenApiParameter(
+        name="title",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description="Filter by feedback title (case-insensitive partial match)"
+    ),
+    OpenApiParameter(
+        name="full_name",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description="Filter by full name of feedback creator (matches firstname or lastname)"
+    ),
+    OpenApiParameter(
+        name="email",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description="Filter by email address (case-insensitive partial match)"
+    ),
+]
+EXPORT_RESPONSES = {
+    (200, 'application/x-ndjson'): OpenApiResponse(
+        response=OpenApiTypes.STR,
+        description='One JSON object per line, same fields as the list endpoint'
+    ),
+    (200, 'text/csv'): OpenApiResponse(
+        response=OpenApiTypes.STR,
+        description='CSV with a header row, same fields as the list endpoint'
+    ),
+    (400, 'application/json'): OpenApiResponse(
+        response={'type': 'object', 'properties': {'error': {'type': 'string'}}},
+        description='Bad Request'
+    ),
+}
+
+
+@extend_schema(
+    methods=["GET"],
+    parameters=[
+        API_KEY_PARAMETER,
+        *TEXT_FILTERS,
+        OpenApiParameter(
+            name="show_all",
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description="Optional: Filter by public display flag. Accepts true or false. Defaults to true if not provided."
+        ),
+        OUTPUT_PARAMETER,
+    ],
+    responses=EXPORT_RESPONSES,
+    summary="Export User Feedback",
+    description=(
+        "Streams every user feedback record matching the list-user-feedback filters in a single response, "
+        "newest first, as NDJSON or CSV."
+    ),
+    tags=["User Feedback"]
+)
+@api_view(['GET'])
+def export_user_feedback(request):
+    feedbacks = filter_user_feedback(request.query_params).order_by('-create_date', '-id')
+    return stream_export(request, feedbacks, UserFeedbackSerializer, 'user-feedback')
+
+
+@extend_schema(
+    methods=["GET"],
+    parameters=[
+        API_KEY_PARAMETER,
+        *TEXT_FILTERS,
+        OpenApiParameter(
+            name="quiz",
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description="Filter by quiz ID"
+        ),
+        OUTPUT_PARAMETER,
+    ],
+    responses=EXPORT_RESPONSES,
+    summary="Export Quiz Feedback",
+    description=(
+        "Streams every quiz feedback record matching the list-quiz-feedback filters in a single response, "
+        "newest first, as NDJSON or CSV."
+    ),
+    tags=["Quiz Feedback"]
+)
+@api_view(['GET'])
+def export_quiz_feedback(request):
+    feedbacks = filter_quiz_feedback(request.query_params).order_by('-create_date', '-id')
+    return stream_export(request, feedbacks, QuizFeedbackSerializer, 'quiz-feedback')
+
+
+@extend_schema(
+    methods=["GET"],
+    parameters=[
+        API_KEY_PARAMETER,
+        OpenApiParameter(
+            name="quiz_id",
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description="Filter by quiz ID"
+        ),
+        OpenApiParameter(
+            name="title",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Filter by quiz title"
+        ),
+        OpenApiParameter(
+            name="category",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Filter by quiz category"
+        ),
+        OpenApiParameter(
+            name="creator",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Filter by the quiz creator's name (first or last name)"
+        ),
+        OUTPUT_PARAMETER,
+    ],
+    responses=EXPORT_RESPONSES,
+    summary="Export Global Quizzes",
+    description=(
+        "Streams every global quiz matching the list-quizzes-in-hallofquiz filters in a single response, "
+        "ordered by the number of attempts, as NDJSON or CSV."
+    ),
+    tags=["Hall Of Quiz"]
+)
+@api_view(['GET'])
+def export_quizzes(request):
+    quizzes = with_creator_name(with_quiz_stats(filter_global_quizzes(request.query_params)))
+    return stream_export(request, quizzes.order_by('-attempts', '-id'), QuizSerializer, 'quizzes')
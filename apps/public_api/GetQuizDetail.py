@@ -0,0 +1,157 @@
+from django.conf import settings
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, OpenApiExample
+from rest_framework import serializers
+from .conditional import condition, version_etag
+from .quiz_content import get_quiz_content_many, get_quiz_content_versions, without_answers
+
+
+class AnswerOptionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    label = serializers.CharField()
+    text = serializers.CharField()
+    # Left out with hide_answers=true
+    is_correct = serializers.BooleanField(required=False)
+
+
+class QuestionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    text = serializers.CharField()
+    options = AnswerOptionSerializer(many=True)
+
+
+class QuizDetailSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    quiz_title = serializers.CharField()
+    description = serializers.CharField(allow_null=True)
+    category = serializers.CharField()
+    difficulty_level = serializers.CharField()
+    number_of_questions = serializers.IntegerField()
+    is_timed = serializers.BooleanField()
+    time_limit = serializers.FloatField(allow_null=True)
+    questions = QuestionSerializer(many=True)
+
+
+class QuizDetailBatchSerializer(serializers.Serializer):
+    results = QuizDetailSerializer(many=True)
+    not_found = serializers.ListField(child=serializers.IntegerField())
+
+
+def quiz_detail_etag(request, *args, **kwargs):
+    # Content versions of the requested quizzes, so a matching If-None-Match gets a 304 without a query.
+    # Invalid requests get no validator.
+    requested = [value.strip() for param in request.GET.getlist('quiz_id') for value in param.split(',') if value.strip()]
+    if not requested or not all(value.isdigit() for value in requested):
+        return None
+    quiz_ids = set(int(value) for value in requested)
+    if len(quiz_ids) > settings.PUBLIC_API_QUIZ_DETAIL_BATCH_LIMIT:
+        return None
+    return version_etag(request, get_quiz_content_versions(quiz_ids))
+
+
+@extend_schema(
+    operation_id='public_quiz_detail',
+    parameters=[
+        OpenApiParameter(
+            name='X-API-KEY',
+            type=str,
+            location=OpenApiParameter.HEADER,
+            description='API key for authentication',
+            required=True
+        ),
+        OpenApiParameter(
+            name='quiz_id',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Quiz ID, or comma-separated quiz IDs (the parameter may also be repeated)',
+            required=True
+        ),
+        OpenApiParameter(
+            name='hide_answers',
+            type=bool,
+            location=OpenApiParameter.QUERY,
+            description='Set to true to leave is_correct out of the answer options'
+        )
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=QuizDetailBatchSerializer,
+            description='Content of every quiz that was found, plus the IDs that were not'
+        ),
+        400: OpenApiResponse(
+            response={'type': 'object', 'properties': {'error': {'type': 'string'}}},
+            description='Bad Request'
+        ),
+        401: OpenApiResponse(
+            response={'type': 'object', 'properties': {'error': {'type': 'string'}}},
+            description='API key is missing or invalid'
+        )
+    },
+    description=(
+        "Questions and answer options of one or several Hall of Quiz quizzes, up to the configured batch limit. "
+        "Quiz content is cached per quiz and refreshed when a quiz, question or answer option is written."
+    ),
+    examples=[
+        OpenApiExample(
+            'Success Response',
+            value={
+                'results': [{
+                    'id': 42,
+                    'quiz_title': 'Quantum Algebra Basics',
+                    'description': 'A short introduction',
+                    'category': 'physics',
+                    'difficulty_level': 'Medium',
+                    'number_of_questions': 1,
+                    'is_timed': False,
+                    'time_limit': None,
+                    'questions': [{
+                        'id': 7,
+                        'text': 'What is a qubit?',
+                        'options': [
+                            {'id': 21, 'label': 'A', 'text': 'A unit of quantum information', 'is_correct': True},
+                            {'id': 22, 'label': 'B', 'text': 'A classical bit', 'is_correct': False}
+                        ]
+                    }]
+                }],
+                'not_found': [999]
+            },
+            response_only=True
+        )
+    ],
+    tags=['Hall Of Quiz']
+)
+# ETag from the quizzes' content versions, answers If-None-Match with 304 before the content is read
+@condition(etag_func=quiz_detail_etag)
+@api_view(['GET'])
+def get_quiz_detail(request):
+    requested = [
+        value.strip()
+        for param in request.query_params.getlist('quiz_id')
+        for value in param.split(',')
+        if value.strip()
+    ]
+
+    if not requested:
+        return Response({'error': 'At least one quiz_id must be provided'}, status=status.HTTP_400_BAD_REQUEST)
+    if not all(value.isdigit() for value in requested):
+        return Response({'error': 'quiz_id values must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    # Drop repeated IDs but keep the request order
+    quiz_ids = list(dict.fromkeys(int(value) for value in requested))
+    if len(quiz_ids) > settings.PUBLIC_API_QUIZ_DETAIL_BATCH_LIMIT:
+        return Response({'error': f'At most {settings.PUBLIC_API_QUIZ_DETAIL_BATCH_LIMIT} quiz IDs can be requested at once'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    # Cached content of every quiz, all misses loaded in three queries
+    contents = get_quiz_content_many(quiz_ids)
+    hide_answers = request.query_params.get('hide_answers', '').lower() == 'true'
+
+    # The cached content is already in the shape of QuizDetailSerializer, so it is not run through it again
+    return Response({
+        'results': [
+            without_answers(contents[quiz_id]) if hide_answers else contents[quiz_id]
+            for quiz_id in quiz_ids if quiz_id in contents
+        ],
+        'not_found': [quiz_id for quiz_id in quiz_ids if quiz_id not in contents],
+    }, status=status.HTTP_200_OK)
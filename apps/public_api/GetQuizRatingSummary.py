@@ -0,0 +1,156 @@
+from django.conf import settings
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, OpenApiExample
+from apps.contract.models import Quiz
+from rest_framework import serializers
+from .conditional import condition, version_etag
+from .models import QuizStats
+
+
+class QuizRatingSummarySerializer(serializers.Serializer):
+    quiz_id = serializers.IntegerField()
+    rating_count = serializers.IntegerField()
+    average_rating = serializers.FloatField(allow_null=True)
+    # Number of ratings of each value from 0 to 5, keyed by the value
+    histogram = serializers.DictField(child=serializers.IntegerField())
+
+
+class QuizRatingSummaryBatchSerializer(serializers.Serializer):
+    results = QuizRatingSummarySerializer(many=True)
+    not_found = serializers.ListField(child=serializers.IntegerField())
+
+
+def build_rating_summary(row):
+    # row holds the quiz id and its QuizStats counters, None for a quiz without a stats row yet
+    rating_count = row['stats__rating_count'] or 0
+    return {
+        'quiz_id': row['id'],
+        'rating_count': rating_count,
+        'average_rating': row['stats__rating_sum'] / rating_count if rating_count else None,
+        'histogram': {
+            str(rating): row[f'stats__{field}'] or 0
+            for rating, field in zip(QuizStats.RATING_VALUES, QuizStats.HISTOGRAM_FIELDS)
+        },
+    }
+
+
+def requested_quiz_ids(params):
+    # Requested quiz IDs without repeats in the request order, None when the request is invalid
+    requested = [value.strip() for param in params.getlist('quiz_id') for value in param.split(',') if value.strip()]
+    if not requested or not all(value.isdigit() for value in requested):
+        return None
+    quiz_ids = list(dict.fromkeys(int(value) for value in requested))
+    if len(quiz_ids) > settings.PUBLIC_API_QUIZ_RATING_BATCH_LIMIT:
+        return None
+    return quiz_ids
+
+
+def rating_summary_rows(request, quiz_ids):
+    # One query: the quizzes joined to their stats rows, read once per request by the validator and the view
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, '_public_api_rows'):
+        columns = ['stats__rating_sum', 'stats__rating_count', 'stats__updated_at'] + [
+            f'stats__{field}' for field in QuizStats.HISTOGRAM_FIELDS
+        ]
+        http_request._public_api_rows = {
+            row['id']: row for row in Quiz.objects.filter(id__in=quiz_ids).values('id', *columns)
+        }
+    return http_request._public_api_rows
+
+
+def rating_summary_etag(request, *args, **kwargs):
+    # QuizStats.updated_at moves on every rating write, so it versions each quiz's summary
+    quiz_ids = requested_quiz_ids(request.GET)
+    if quiz_ids is None:
+        return None
+    rows = rating_summary_rows(request, quiz_ids)
+    return version_etag(request, {
+        quiz_id: row['stats__updated_at'].isoformat() if row['stats__updated_at'] else ''
+        for quiz_id, row in rows.items()
+    })
+
+
+@extend_schema(
+    operation_id='public_quiz_rating_summary',
+    parameters=[
+        OpenApiParameter(
+            name='X-API-KEY',
+            type=str,
+            location=OpenApiParameter.HEADER,
+            description='API key for authentication',
+            required=True
+        ),
+        OpenApiParameter(
+            name='quiz_id',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Quiz ID, or comma-separated quiz IDs (the parameter may also be repeated)',
+            required=True
+        )
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=QuizRatingSummaryBatchSerializer,
+            description='Rating summary of every quiz that was found, plus the IDs that were not'
+        ),
+        400: OpenApiResponse(
+            response={'type': 'object', 'properties': {'error': {'type': 'string'}}},
+            description='Bad Request'
+        ),
+        401: OpenApiResponse(
+            response={'type': 'object', 'properties': {'error': {'type': 'string'}}},
+            description='API key is missing or invalid'
+        )
+    },
+    description=(
+        "Rating count, average rating and a histogram of the ratings from 0 to 5 of one or several quizzes, "
+        "up to the configured batch limit. The numbers are read from precomputed per-quiz statistics kept "
+        "current on every feedback write, so no feedback rows are read."
+    ),
+    examples=[
+        OpenApiExample(
+            'Success Response',
+            value={
+                'results': [{
+                    'quiz_id': 42,
+                    'rating_count': 8,
+                    'average_rating': 4.25,
+                    'histogram': {'0': 0, '1': 0, '2': 1, '3': 1, '4': 1, '5': 5}
+                }],
+                'not_found': [999]
+            },
+            response_only=True
+        )
+    ],
+    tags=['Quiz Feedback']
+)
+# ETag from the quizzes' QuizStats.updated_at, answers If-None-Match with 304 before serialization
+@condition(etag_func=rating_summary_etag)
+@api_view(['GET'])
+def get_quiz_rating_summary(request):
+    requested = [
+        value.strip()
+        for param in request.query_params.getlist('quiz_id')
+        for value in param.split(',')
+        if value.strip()
+    ]
+
+    if not requested:
+        return Response({'error': 'At least one quiz_id must be provided'}, status=status.HTTP_400_BAD_REQUEST)
+    if not all(value.isdigit() for value in requested):
+        return Response({'error': 'quiz_id values must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+    # Drop repeated IDs but keep the request order
+    quiz_ids = list(dict.fromkeys(int(value) for value in requested))
+    if len(quiz_ids) > settings.PUBLIC_API_QUIZ_RATING_BATCH_LIMIT:
+        return Response({'error': f'At most {settings.PUBLIC_API_QUIZ_RATING_BATCH_LIMIT} quiz IDs can be requested at once'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    rows = rating_summary_rows(request, quiz_ids)
+
+    serializer = QuizRatingSummaryBatchSerializer({
+        'results': [build_rating_summary(rows[quiz_id]) for quiz_id in quiz_ids if quiz_id in rows],
+        'not_found': [quiz_id for quiz_id in quiz_ids if quiz_id not in rows],
+    })
+    return Response(serializer.data, status=status.HTTP_200_OK)
@@ -1,11 +1,12 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Avg
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, OpenApiExample
 from django.contrib.auth import get_user_model
-from apps.contract.models import Quiz, QuizResultSnapshot, Flashcard, UserProfile
+from apps.contract.models import UserProfile
 from rest_framework import serializers
+from .conditional import condition, version_etag
+from .user_stats import get_cached_user_stats, get_profile_with_user_stats, get_user_versions
 
 
 class UserInfoSerializer(serializers.Serializer):
@@ -18,6 +19,51 @@ class UserInfoSerializer(serializers.Serializer):
     total_flashcards_owned = serializers.IntegerField()
 
 
+# Query parameters of get-user-info in their order of precedence, and the UserProfile lookup of each
+LOOKUPS = {'user_id': 'user__id', 'username': 'user__username', 'email': 'user__email'}
+
+
+def requested_user(params):
+    # (lookup, value) of the user a get-user-info request asks for, None when no identifier is given
+    for lookup in LOOKUPS:
+        if params.get(lookup):
+            return lookup, params[lookup]
+    return None
+
+
+def profile_queryset(lookup, value):
+    return UserProfile.objects.only('firstname', 'lastname', 'bio', 'user_id').filter(**{LOOKUPS[lookup]: value})
+
+
+def requested_profile(request):
+    # The profile a get-user-info request asks for by username or email, read once per request by the
+    # validator and the view
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, '_public_api_profile'):
+        http_request._public_api_profile = profile_queryset(*requested_user(http_request.GET)).first()
+    return http_request._public_api_profile
+
+
+def user_info_etag(request, *args, **kwargs):
+    # Version of the requested user's info, so a matching If-None-Match gets a 304 before the stats are
+    # read and serialized. A user_id needs no query; a username or email is resolved by the profile lookup
+    # the view reuses, and unknown ones get no validator.
+    requested = requested_user(request.GET)
+    if requested is None:
+        return None
+    lookup, value = requested
+    if lookup == 'user_id':
+        if not value.isdigit():
+            return None
+        user_pk = int(value)
+    else:
+        profile = requested_profile(request)
+        if profile is None:
+            return None
+        user_pk = profile.user_id
+    return version_etag(request, get_user_versions([user_pk]))
+
+
 User = get_user_model()
 @extend_schema(
     operation_id='public_user_dashboard_by_identifier',
@@ -88,54 +134,38 @@ User = get_user_model()
     ],
     tags=['User']
 )
+# ETag from the user's info version, answers If-None-Match with 304 before the stats are read
+@condition(etag_func=user_info_etag)
 @api_view(['GET'])
 def get_user_info(request):
-    user_id = request.query_params.get('user_id')
-    username = request.query_params.get('username')
-    email = request.query_params.get('email')
-
-    if user_id:
-        profile = UserProfile.objects.filter(user__id=user_id).first()
-    elif username:
-        profile = UserProfile.objects.filter(user__username=username).first()
-    elif email:
-        profile = UserProfile.objects.filter(user__email=email).first()
-    else:
+    if requested_user(request.query_params) is None:
         return Response({'error': 'One of user_id, username, or email query parameters must be provided'},
                         status=status.HTTP_400_BAD_REQUEST)
-    
+
+    # Stats come from the per-user cache, which is invalidated by apps.public_api.signals
+    lookup, value = requested_user(request.query_params)
+    if lookup == 'user_id' and value.isdigit():
+        # The pk is known before the lookup, so a stats cache miss is computed in the profile query
+        profile, stats = get_profile_with_user_stats(profile_queryset(lookup, value), int(value))
+    else:
+        # The pk comes from the profile, so a stats cache miss takes a second query
+        profile = requested_profile(request)
+        stats = profile and get_cached_user_stats(profile.user_id)
     if not profile:
         return Response({'error': 'User or user profile not found'}, status=status.HTTP_404_NOT_FOUND)
-    
-    target_user = profile.user
-    stats = get_user_stats(target_user)
-    dashboard_data = {
-        "firstname": profile.firstname,
-        "lastname": profile.lastname,
-        "bio": profile.bio or "",
-        **stats
-    }
 
-    serializer = UserInfoSerializer(dashboard_data)
+    serializer = UserInfoSerializer(build_user_info(profile, stats))
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-
-def get_user_stats(target_user):
-    total_quiz_taken = QuizResultSnapshot.objects.filter(candidate=target_user).count()
-
-    avg_result = QuizResultSnapshot.objects.filter(candidate=target_user).aggregate(avg_score=Avg('percentage_score'))
-    average_score = avg_result.get('avg_score') or 0
-
-    total_quizzes_owned = Quiz.objects.filter(user=target_user).count()
-
-    total_flashcards_owned = Flashcard.objects.filter(user=target_user).count()
-
+def build_user_info(profile, stats):
     return {
-        "total_quiz_taken": total_quiz_taken,
-        "average_score": average_score,
-        "total_quizzes_owned": total_quizzes_owned,
-        "total_flashcards_owned": total_flashcards_owned
+        "firstname": profile.firstname,
+        "lastname": profile.lastname,
+        "bio": profile.bio or "",
+        **stats
     }
 
 
+def get_user_stats(target_user):
+    return get_cached_user_stats(target_user.pk)
@@ -0,0 +1,174 @@
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, OpenApiExample
+from apps.contract.models import UserProfile
+from rest_framework import serializers
+from .GetUserInformation import UserInfoSerializer, build_user_info
+from .conditional import condition, version_etag
+from .user_stats import get_user_stats_many, get_user_versions
+
+LOOKUPS = ('user_id', 'username', 'email')
+
+
+class UserLookupSerializer(serializers.Serializer):
+    lookup = serializers.ChoiceField(choices=LOOKUPS)
+    value = serializers.CharField()
+
+
+class UserInfoBatchItemSerializer(UserInfoSerializer, UserLookupSerializer):
+    pass
+
+
+class UserInfoBatchSerializer(serializers.Serializer):
+    results = UserInfoBatchItemSerializer(many=True)
+    not_found = UserLookupSerializer(many=True)
+
+
+def requested_identifiers(params):
+    # (lookup, value) pairs of the request, repeated identifiers dropped but the request order kept
+    requested = [
+        (lookup, value.strip())
+        for lookup in LOOKUPS
+        for param in params.getlist(lookup)
+        for value in param.split(',')
+        if value.strip()
+    ]
+    return list(dict.fromkeys(requested))
+
+
+def identifier_key(lookup, value):
+    # user_id values are validated as digits first; '01' and '1' name the same user
+    return int(value) if lookup == 'user_id' else value
+
+
+def requested_profiles(request, requested):
+    # Profiles of the requested users, read once per request by the validator and the view
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, '_public_api_profiles'):
+        values = {lookup: [identifier_key(key, value) for key, value in requested if key == lookup] for lookup in LOOKUPS}
+        condition = Q(user__id__in=values['user_id']) | Q(user__username__in=values['username']) | Q(user__email__in=values['email'])
+        http_request._public_api_profiles = list(UserProfile.objects.filter(condition).select_related('user').only(
+            'firstname', 'lastname', 'bio', 'user__id', 'user__username', 'user__email'
+        ))
+    return http_request._public_api_profiles
+
+
+def user_info_batch_etag(request, *args, **kwargs):
+    # Versions of the found users' info, so a matching If-None-Match gets a 304 after the profile query
+    # the view reuses, before the stats are read and serialized. Invalid requests get no validator.
+    requested = requested_identifiers(request.GET)
+    if (not requested or len(requested) > settings.PUBLIC_API_USER_INFO_BATCH_LIMIT
+            or not all(value.isdigit() for lookup, value in requested if lookup == 'user_id')):
+        return None
+    profiles = requested_profiles(request, requested)
+    return version_etag(request, get_user_versions([profile.user_id for profile in profiles]))
+
+
+@extend_schema(
+    operation_id='public_user_dashboard_batch',
+    parameters=[
+        OpenApiParameter(
+            name='X-API-KEY',
+            type=str,
+            location=OpenApiParameter.HEADER,
+            description='API key for authentication',
+            required=True
+        ),
+        OpenApiParameter(
+            name='user_id',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Comma-separated user IDs (the parameter may also be repeated)'
+        ),
+        OpenApiParameter(
+            name='username',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Comma-separated usernames (the parameter may also be repeated)'
+        ),
+        OpenApiParameter(
+            name='email',
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description='Comma-separated emails (the parameter may also be repeated)'
+        )
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=UserInfoBatchSerializer,
+            description='Dashboard data for every identifier that was found, plus the identifiers that were not'
+        ),
+        400: OpenApiResponse(
+            response={'type': 'object', 'properties': {'error': {'type': 'string'}}},
+            description='Bad Request'
+        ),
+        401: OpenApiResponse(
+            response={'type': 'object', 'properties': {'error': {'type': 'string'}}},
+            description='API key is missing or invalid'
+        )
+    },
+    description=(
+        "Public endpoint to retrieve the information data of several users in one call. Identifiers can be any mix "
+        "of user_id, username and email, up to the configured batch limit. All users are resolved with a constant "
+        "number of database queries. Each result echoes the identifier it was requested with."
+    ),
+    examples=[
+        OpenApiExample(
+            'Success Response',
+            value={
+                'results': [{
+                    'firstname': 'John',
+                    'lastname': 'Doe',
+                    'bio': 'Passionate about learning',
+                    'total_quiz_taken': 15,
+                    'average_score': 78.5,
+                    'total_quizzes_owned': 4,
+                    'total_flashcards_owned': 2,
+                    'lookup': 'username',
+                    'value': 'jdoe'
+                }],
+                'not_found': [{'lookup': 'user_id', 'value': '999'}]
+            },
+            response_only=True
+        )
+    ],
+    tags=['User']
+)
+# ETag from the requested users' info versions, answers If-None-Match with 304 before the stats are read
+@condition(etag_func=user_info_batch_etag)
+@api_view(['GET'])
+def get_user_info_batch(request):
+    requested = requested_identifiers(request.query_params)
+
+    if not requested:
+        return Response({'error': 'At least one user_id, username, or email must be provided'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    if len(requested) > settings.PUBLIC_API_USER_INFO_BATCH_LIMIT:
+        return Response({'error': f'At most {settings.PUBLIC_API_USER_INFO_BATCH_LIMIT} identifiers can be requested at once'},
+                        status=status.HTTP_400_BAD_REQUEST)
+    if not all(value.isdigit() for lookup, value in requested if lookup == 'user_id'):
+        return Response({'error': 'user_id values must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+    profiles = requested_profiles(request, requested)
+    # Stats of every user come from the cache, all misses are computed in one more query
+    stats = get_user_stats_many([profile.user_id for profile in profiles])
+
+    by_identifier = {}
+    for profile in profiles:
+        by_identifier[('user_id', profile.user_id)] = profile
+        by_identifier[('username', profile.user.username)] = profile
+        by_identifier[('email', profile.user.email)] = profile
+
+    results, not_found = [], []
+    for lookup, value in requested:
+        profile = by_identifier.get((lookup, identifier_key(lookup, value)))
+        if profile is None:
+            not_found.append({'lookup': lookup, 'value': value})
+        else:
+            results.append({'lookup': lookup, 'value': value, **build_user_info(profile, stats[profile.user_id])})
+
+    serializer = UserInfoBatchSerializer({'results': results, 'not_found': not_found})
+    return Response(serializer.data, status=status.HTTP_200_OK)
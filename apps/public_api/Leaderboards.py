@@ -0,0 +1,204 @@
+from django.conf import settings
+from django.db.models import Q
+from django.views.decorators.http import conditional_page
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse, OpenApiExample
+from .models import CandidateScore, LeaderboardEntry, candidate_name
+from .pagination import CURSOR_PARAMETER
+from .conditional import list_condition, without_error_validators
+from .fieldsets import SparseFieldsMixin, fieldset_parameters, requested_fields
+from .serialization import serialize_page
+from rest_framework import serializers
+
+
+class LeaderboardEntrySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = LeaderboardEntry
+        fields = ('rank', 'candidate', 'candidate_name', 'average_score', 'attempts')
+
+
+class LeaderboardRankSerializer(serializers.Serializer):
+    candidate = serializers.IntegerField()
+    candidate_name = serializers.CharField(allow_blank=True)
+    category = serializers.CharField(allow_blank=True)
+    # None below PUBLIC_API_LEADERBOARD_MIN_ATTEMPTS quiz results or outside the top PUBLIC_API_LEADERBOARD_SIZE
+    rank = serializers.IntegerField(allow_null=True)
+    average_score = serializers.FloatField()
+    attempts = serializers.IntegerField()
+    # Whether rank comes from the materialized board, otherwise it is counted from the running totals
+    on_leaderboard = serializers.BooleanField()
+
+
+# Ranks are unique within a board, so they are the cursor key on their own
+ORDERING = ('rank',)
+
+CATEGORY_PARAMETER = OpenApiParameter(
+    name="category",
+    type=str,
+    location=OpenApiParameter.QUERY,
+    description="Board of one quiz category (exact match). Leave out for the overall board"
+)
+
+
+def filter_leaderboard(params):
+    return LeaderboardEntry.objects.filter(category=params.get('category', CandidateScore.OVERALL))
+
+
+@extend_schema(
+    methods=["GET"],
+    parameters=[
+        OpenApiParameter(
+            name='X-API-KEY',
+            type=str,
+            location=OpenApiParameter.HEADER,
+            description='API key for authentication',
+            required=True
+        ),
+        CATEGORY_PARAMETER,
+        OpenApiParameter(
+            name="page",
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description="Page number"
+        ),
+        OpenApiParameter(
+            name="page_size",
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description="Number of items per page"
+        ),
+        CURSOR_PARAMETER,
+        *fieldset_parameters(LeaderboardEntrySerializer),
+    ],
+    responses={
+        200: LeaderboardEntrySerializer(many=True),
+        400: {"description": "Bad Request"}
+    },
+    summary="List Leaderboard",
+    description=(
+        "Top candidates by average quiz score, overall or for one quiz category, best first. Candidates need a "
+        "minimum number of quiz results to be ranked; ties go to the candidate with more results. Boards are "
+        "precomputed periodically and hold a fixed number of candidates."
+    ),
+    tags=["Leaderboard"]
+)
+# built_at moves every time the board is rebuilt
+@list_condition(filter_leaderboard, modified_fields=('built_at',))
+@api_view(['GET'])
+def list_leaderboard(request):
+    fields = requested_fields(request.query_params, LeaderboardEntrySerializer)
+    entries = filter_leaderboard(request.query_params)
+
+    results, pagination = serialize_page(request, entries, LeaderboardEntrySerializer, fields, ORDERING, default_page_size=20)
+
+    return Response({
+        **pagination,
+        "results": results
+    }, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    operation_id='public_leaderboard_rank',
+    parameters=[
+        OpenApiParameter(
+            name='X-API-KEY',
+            type=str,
+            location=OpenApiParameter.HEADER,
+            description='API key for authentication',
+            required=True
+        ),
+        OpenApiParameter(
+            name='user_id',
+            type=int,
+            location=OpenApiParameter.QUERY,
+            description='The ID of the candidate',
+            required=True
+        ),
+        CATEGORY_PARAMETER,
+    ],
+    responses={
+        200: OpenApiResponse(
+            response=LeaderboardRankSerializer,
+            description='Rank, average score and number of quiz results of the candidate'
+        ),
+        400: OpenApiResponse(
+            response={'type': 'object', 'properties': {'error': {'type': 'string'}}},
+            description='Bad Request'
+        ),
+        401: OpenApiResponse(
+            response={'type': 'object', 'properties': {'error': {'type': 'string'}}},
+            description='API key is missing or invalid'
+        ),
+        404: OpenApiResponse(
+            response={'type': 'object', 'properties': {'error': {'type': 'string'}}},
+            description='The user has no quiz results in this category'
+        )
+    },
+    description=(
+        "Rank of one candidate, overall or in one quiz category. Candidates on the precomputed board get the rank "
+        "shown there; for the others it is counted from up-to-date score totals, up to the board size. The rank "
+        "is null below the minimum number of quiz results and for candidates ranked outside the board size."
+    ),
+    examples=[
+        OpenApiExample(
+            'Success Response',
+            value={
+                'candidate': 42,
+                'candidate_name': 'John Doe',
+                'category': 'physics',
+                'rank': 17,
+                'average_score': 91.5,
+                'attempts': 12,
+                'on_leaderboard': True
+            },
+            response_only=True
+        )
+    ],
+    tags=['Leaderboard']
+)
+# ETag/Last-Modified from the rendered body, answers If-None-Match with 304
+@without_error_validators
+@conditional_page
+@api_view(['GET'])
+def get_leaderboard_rank(request):
+    user_id = request.query_params.get('user_id')
+    category = request.query_params.get('category', CandidateScore.OVERALL)
+    if not user_id:
+        return Response({'error': 'The user_id query parameter must be provided'}, status=status.HTTP_400_BAD_REQUEST)
+    if not user_id.isdigit():
+        return Response({'error': 'user_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+    columns = ('candidate', 'candidate_name', 'category', 'rank', 'average_score', 'attempts')
+    entry = LeaderboardEntry.objects.filter(category=category, candidate_id=user_id).values(*columns).first()
+    if entry is not None:
+        return Response(LeaderboardRankSerializer({**entry, 'on_leaderboard': True}).data, status=status.HTTP_200_OK)
+
+    score = (
+        CandidateScore.objects.filter(category=category, candidate_id=user_id, attempts__gt=0)
+        .annotate(candidate_name=candidate_name())
+        .values('candidate', 'candidate_name', 'category', 'average_score', 'attempts')
+        .first()
+    )
+    if score is None:
+        return Response({'error': 'The user has no quiz results in this category'}, status=status.HTTP_404_NOT_FOUND)
+
+    rank = None
+    min_attempts = settings.PUBLIC_API_LEADERBOARD_MIN_ATTEMPTS
+    if score['attempts'] >= min_attempts:
+        # Candidates ahead in CandidateScore.RANKING, counted on its index. The count stops at the board
+        # size, so it reads at most that many index entries however far down the candidate is.
+        average, attempts = score['average_score'], score['attempts']
+        ahead = (
+            Q(average_score__gt=average)
+            | Q(average_score=average, attempts__gt=attempts)
+            | Q(average_score=average, attempts=attempts, candidate_id__lt=score['candidate'])
+        )
+        board_size = settings.PUBLIC_API_LEADERBOARD_SIZE
+        ahead_count = CandidateScore.objects.filter(ahead, category=category, attempts__gte=min_attempts)[:board_size].count()
+        rank = ahead_count + 1 if ahead_count < board_size else None
+
+    serializer = LeaderboardRankSerializer({**score, 'candidate_name': score['candidate_name'] or '',
+                                            'rank': rank, 'on_leaderboard': False})
+    return Response(serializer.data, status=status.HTTP_200_OK)
@@ -1,23 +1,55 @@
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger 
-from django.db.models import Q
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from apps.contract.models import QuizFeedback
+from .pagination import CURSOR_PARAMETER
+from .search import text_search
+from .conditional import list_condition
+from .fieldsets import SparseFieldsMixin, fieldset_parameters, requested_fields
+from .serialization import serialize_page
 from rest_framework import serializers
 
-class QuizFeedbackSerializer(serializers.ModelSerializer):
+class QuizFeedbackSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     full_name = serializers.SerializerMethodField()
 
     class Meta:
         model = QuizFeedback
         fields = ('title', 'message', 'rating', 'full_name', 'email', 'quiz','create_date')
+        field_sources = {'full_name': ('firstname', 'lastname')}
 
     def get_full_name(self, obj) -> str:
         return f"{obj.firstname} {obj.lastname}".strip()
 
 
+ORDERING = ('-create_date', '-id')
+
+
+def filter_quiz_feedback(params):
+    # Base queryset
+    feedbacks = QuizFeedback.objects.all()
+
+    # Extract filters
+    title     = params.get('title')
+    full_name = params.get('full_name')
+    email     = params.get('email')
+    quiz_id   = params.get('quiz')
+
+    # Apply filters
+    if title:
+        feedbacks = text_search(feedbacks, ['title'], title)
+
+    if full_name:
+        feedbacks = text_search(feedbacks, ['firstname', 'lastname'], full_name)
+
+    if email:
+        feedbacks = text_search(feedbacks, ['email'], email)
+
+    if quiz_id:
+        feedbacks = feedbacks.filter(quiz=quiz_id)
+    return feedbacks
+
+
 @extend_schema(
     methods=["GET"],
     parameters=[
@@ -64,6 +96,8 @@ class QuizFeedbackSerializer(serializers.ModelSerializer):
             location=OpenApiParameter.QUERY,
             description="Number of items per page"
         ),
+        CURSOR_PARAMETER,
+        *fieldset_parameters(QuizFeedbackSerializer),
     ],
     responses={
         200: QuizFeedbackSerializer(many=True),
@@ -78,48 +112,16 @@ class QuizFeedbackSerializer(serializers.ModelSerializer):
     ),
     tags=["Quiz Feedback"]
 )
+@list_condition(filter_quiz_feedback, modified_fields=('create_date',))
 @api_view(['GET'])
 def list_quiz_feedback(request):
-    # Base queryset, newest first
-    feedbacks = QuizFeedback.objects.all().order_by('-create_date')
-
-    # Extract filters
-    title     = request.query_params.get('title')
-    full_name = request.query_params.get('full_name')
-    email     = request.query_params.get('email')
-    quiz_id   = request.query_params.get('quiz')
-
-    # Apply filters
-    if title:
-        feedbacks = feedbacks.filter(title__icontains=title)
+    fields = requested_fields(request.query_params, QuizFeedbackSerializer)
+    feedbacks = filter_quiz_feedback(request.query_params)
 
-    if full_name:
-        feedbacks = feedbacks.filter(
-            Q(firstname__icontains=full_name) | Q(lastname__icontains=full_name)
-        )
-
-    if email:
-        feedbacks = feedbacks.filter(email__icontains=email)
-
-    if quiz_id:
-        print(quiz_id)
-        feedbacks = feedbacks.filter(quiz=quiz_id)
+    # Paginate, newest first
+    results, pagination = serialize_page(request, feedbacks, QuizFeedbackSerializer, fields, ORDERING, default_page_size=10)
 
-    # Paginate
-    page      = request.query_params.get('page', 1)
-    page_size = request.query_params.get('page_size', 10)
-    paginator = Paginator(feedbacks, page_size)
-    try:
-        page_obj = paginator.page(page)
-    except PageNotAnInteger:
-        page_obj = paginator.page(1)
-    except EmptyPage:
-        page_obj = paginator.page(paginator.num_pages)
-
-    serializer = QuizFeedbackSerializer(page_obj, many=True)
     return Response({
-        "count": paginator.count,
-        "num_pages": paginator.num_pages,
-        "current_page": page_obj.number,
-        "results": serializer.data
+        **pagination,
+        "results": results
     }, status=status.HTTP_200_OK)
@@ -1,28 +1,130 @@
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Count, Q, Avg
-from django.db.models import Count
+from django.db.models import FloatField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Concat, NullIf, Trim
+from django.utils import timezone
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework import status
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from apps.contract.models import Quiz
+from .models import QuizActivity
+from .pagination import CURSOR_PARAMETER
+from .search import text_search
+from .conditional import list_condition
+from .fieldsets import SparseFieldsMixin, fieldset_parameters, requested_fields
+from .serialization import serialize_page
 from rest_framework import serializers
 
-class QuizSerializer(serializers.ModelSerializer):
+class QuizSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     attempts = serializers.IntegerField(read_only=True)
     average_rating = serializers.FloatField(read_only=True)
-    creator_name = serializers.SerializerMethodField()
+    # Annotated by with_creator_name
+    creator_name = serializers.CharField(read_only=True)
 
     class Meta:
         model = Quiz
         fields = '__all__'
 
-    def get_creator_name(self, obj) -> str:
-        if obj.user and hasattr(obj.user, 'profile'):
-            profile = obj.user.profile
-            return f"{profile.firstname} {profile.lastname}".strip()
-        return ""
 
+class TrendingQuizSerializer(QuizSerializer):
+    # Submissions in the requested window, annotated by with_recent_attempts
+    recent_attempts = serializers.IntegerField(read_only=True)
+
+
+# Most attempted first, the id breaks ties so cursor pagination has a unique key
+ORDERING = ('-attempts', '-id')
+# ?sort=trending: most attempted within the window, then all time
+TRENDING_ORDERING = ('-recent_attempts', '-attempts', '-id')
+
+TRENDING = 'trending'
+SORTS = ('attempts', TRENDING)
+DEFAULT_WINDOW = '7d'
+
+
+def filter_global_quizzes(params):
+    # Retrieve only global quizzes. Quizzes written by other services may have no QuizStats row yet,
+    # so the stats are joined by with_quiz_stats with a LEFT join and never filter quizzes out.
+    quizzes = Quiz.objects.filter(is_global=True)
+
+    # Filtering based on query parameters
+    quiz_id = params.get('quiz_id')
+    title = params.get('title')
+    category = params.get('category')
+    creator = params.get('creator')  # New query parameter for filtering by creator name
+    
+    if quiz_id:
+        quizzes = quizzes.filter(id=quiz_id)
+    if title:
+        quizzes = text_search(quizzes, ['quiz_title'], title)
+    if category:
+        quizzes = text_search(quizzes, ['category'], category)
+    if creator:
+        # Filter quizzes based on the quiz creator's first or last name
+        quizzes = text_search(quizzes, ['user__profile__firstname', 'user__profile__lastname'], creator)
+    return quizzes
+
+
+def with_quiz_stats(quizzes):
+    # Attempts and ratings come from the denormalized QuizStats row (kept current by apps.public_api.signals),
+    # so sorting reads a stored column instead of aggregating QuizSubmission on every request.
+    # A quiz without a stats row yet counts as never attempted.
+    return quizzes.annotate(
+        attempts=Coalesce('stats__attempts', 0),
+        average_rating=Cast('stats__rating_sum', FloatField()) / NullIf('stats__rating_count', 0)
+    )
+
+
+def trending_since(params):
+    # Start of the ?sort=trending window, None for the default sort by all-time attempts
+    sort = params.get('sort', 'attempts')
+    if sort not in SORTS:
+        raise ValidationError({'sort': f"sort must be one of {', '.join(SORTS)}."})
+    if sort != TRENDING:
+        return None
+    window = params.get('window', DEFAULT_WINDOW)
+    if window not in QuizActivity.WINDOWS:
+        raise ValidationError({'window': f"window must be one of {', '.join(QuizActivity.WINDOWS)}."})
+    return timezone.now() - QuizActivity.WINDOWS[window]
+
+
+def trending_changed_at(params):
+    # Trending pages also change when an hour of submissions leaves the window
+    try:
+        since = trending_since(params)
+    except ValidationError:
+        return None
+    return since and QuizActivity.floor(since, QuizActivity.HOUR)
+
+
+def with_recent_attempts(quizzes, since):
+    # Sum of the few activity buckets of each quiz in the window, read through their unique index,
+    # instead of counting the quiz's QuizSubmission rows by completion_date
+    recent = (
+        QuizActivity.objects.filter(QuizActivity.window(since), quiz=OuterRef('pk'))
+        .values('quiz').annotate(total=Sum('submissions')).values('total')
+    )
+    return quizzes.annotate(recent_attempts=Coalesce(Subquery(recent, output_field=IntegerField()), 0))
+
+
+def hall_of_quiz_listing(params, quizzes):
+    # (queryset, serializer class, fields, ordering) of a Hall of Quiz page, shared with the async view
+    since = trending_since(params)
+    serializer_class, ordering = (QuizSerializer, ORDERING) if since is None else (TrendingQuizSerializer, TRENDING_ORDERING)
+    fields = requested_fields(params, serializer_class)
+    quizzes = with_quiz_stats(quizzes)
+    if since is not None:
+        quizzes = with_recent_attempts(quizzes, since)
+    if fields is None or 'creator_name' in fields:
+        quizzes = with_creator_name(quizzes)
+    return quizzes, serializer_class, fields, ordering
+
+
+def with_creator_name(quizzes):
+    # "firstname lastname" of the quiz owner's profile, computed in the list query itself.
+    # Missing profiles join as NULLs, which Concat treats as empty strings, so they give "".
+    return quizzes.annotate(
+        creator_name=Trim(Concat('user__profile__firstname', Value(' '), 'user__profile__lastname'))
+    )
 
 
 @extend_schema(
@@ -71,6 +173,25 @@ class QuizSerializer(serializers.ModelSerializer):
             location=OpenApiParameter.QUERY,
             description="Number of items per page"
         ),
+        OpenApiParameter(
+            name="sort",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            enum=SORTS,
+            description=(
+                "attempts (default) orders by all-time attempts. trending orders by the attempts within `window`, "
+                "then all-time attempts, and adds a recent_attempts field"
+            )
+        ),
+        OpenApiParameter(
+            name="window",
+            type=str,
+            location=OpenApiParameter.QUERY,
+            enum=list(QuizActivity.WINDOWS),
+            description=f"Time window of sort=trending (default {DEFAULT_WINDOW})"
+        ),
+        CURSOR_PARAMETER,
+        *fieldset_parameters(TrendingQuizSerializer),
     ],
     responses={
         200: QuizSerializer(many=True),
@@ -80,57 +201,24 @@ class QuizSerializer(serializers.ModelSerializer):
     description=(
         "Retrieves a paginated list of all global quizzes in the system (where is_global is True), ordered by the "
         "number of quiz attempts. Optional filters include quiz_id, title, category, and the quiz creator's name. "
-        "The number of attempts is computed using the QuizSubmission model, and the creator's full name is included "
-        "in the response."
+        "The number of attempts and the average rating are read from precomputed per-quiz statistics, and the "
+        "creator's full name is included in the response. sort=trending ranks by recent attempts instead, counted "
+        "from hourly and daily per-quiz buckets."
     ),
     tags=["Hall Of Quiz"]
 )
+# QuizStats.updated_at moves whenever attempts or ratings change
+@list_condition(filter_global_quizzes, modified_fields=('create_date', 'stats__updated_at'), changed_at=trending_changed_at)
 @api_view(['GET'])
 def list_quizzes_in_hallofquiz(request):
-    # Retrieve only global quizzes
-    quizzes = Quiz.objects.filter(is_global=True)
+    quizzes, serializer_class, fields, ordering = hall_of_quiz_listing(
+        request.query_params, filter_global_quizzes(request.query_params)
+    )
 
-    # Filtering based on query parameters
-    quiz_id = request.query_params.get('quiz_id')
-    title = request.query_params.get('title')
-    category = request.query_params.get('category')
-    creator = request.query_params.get('creator')  # New query parameter for filtering by creator name
-    
-    if quiz_id:
-        quizzes = quizzes.filter(id=quiz_id)
-    if title:
-        quizzes = quizzes.filter(quiz_title__icontains=title)
-    if category:
-        quizzes = quizzes.filter(category__icontains=category)
-    if creator:
-        # Filter quizzes based on the quiz creator's first or last name
-        quizzes = quizzes.filter(
-            Q(user__profile__firstname__icontains=creator) | Q(user__profile__lastname__icontains=creator)
-        )
-
-    # Annotate each quiz with "attempts" (i.e. number of related QuizSubmission records)
-    quizzes = quizzes.annotate(
-        attempts=Count('quizsubmission'),
-        average_rating=Avg('quizfeedback__rating')
-    ).order_by('-attempts')
-
-    # Pagination parameters with defaults
-    page = request.query_params.get('page', 1)
-    page_size = request.query_params.get('page_size', 12)
-
-    paginator = Paginator(quizzes, page_size)
-    try:
-        quizzes_page = paginator.page(page)
-    except PageNotAnInteger:
-        quizzes_page = paginator.page(1)
-    except EmptyPage:
-        quizzes_page = paginator.page(paginator.num_pages)
+    results, pagination = serialize_page(request, quizzes, serializer_class, fields, ordering, default_page_size=12)
 
-    serializer = QuizSerializer(quizzes_page, many=True)
     response_data = {
-        "count": paginator.count,
-        "num_pages": paginator.num_pages,
-        "current_page": quizzes_page.number,
-        "results": serializer.data
+        **pagination,
+        "results": results
     }
     return Response(response_data, status=status.HTTP_200_OK)
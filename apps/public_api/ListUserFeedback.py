@@ -1,27 +1,55 @@
 from rest_framework import serializers
 from apps.contract.models import UserFeedback
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Q
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated  # or use AllowAny if desired
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from apps.contract.models import UserFeedback
+from .pagination import CURSOR_PARAMETER
+from .search import text_search
+from .conditional import list_condition
+from .fieldsets import SparseFieldsMixin, fieldset_parameters, requested_fields
+from .serialization import serialize_page
 from rest_framework import serializers
 
-class UserFeedbackSerializer(serializers.ModelSerializer):
+class UserFeedbackSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     full_name = serializers.SerializerMethodField()
 
     class Meta:
         model = UserFeedback
         fields = ('title', 'message', 'rating', 'full_name', 'email')
+        field_sources = {'full_name': ('firstname', 'lastname')}
 
     def get_full_name(self, obj) -> str:
   
         return f"{obj.firstname} {obj.lastname}".strip()
 
 
+ORDERING = ('-create_date', '-id')
+
+
+def filter_user_feedback(params):
+    feedbacks = UserFeedback.objects.filter(issue_type='FB')
+
+    show_all_param = params.get('show_all')
+
+    if not (show_all_param and show_all_param.lower() == 'true'):
+        feedbacks = feedbacks.filter(public_display=True)
+
+    # Optional filtering parameters
+    title = params.get('title')
+    full_name = params.get('full_name')
+    email = params.get('email')
+
+    if title:
+        feedbacks = text_search(feedbacks, ['title'], title)
+    if full_name:
+        feedbacks = text_search(feedbacks, ['firstname', 'lastname'], full_name)
+    if email:
+        feedbacks = text_search(feedbacks, ['email'], email)
+    return feedbacks
+
 
 @extend_schema(
     methods=["GET"],
@@ -69,6 +97,8 @@ class UserFeedbackSerializer(serializers.ModelSerializer):
             location=OpenApiParameter.QUERY,
             description="Number of items per page"
         ),
+        CURSOR_PARAMETER,
+        *fieldset_parameters(UserFeedbackSerializer),
     ],
     responses={
         200: UserFeedbackSerializer(many=True),
@@ -83,45 +113,17 @@ class UserFeedbackSerializer(serializers.ModelSerializer):
     ),
     tags=["User Feedback"]
 )
+@list_condition(filter_user_feedback, modified_fields=('create_date',))
 @api_view(['GET'])
 def list_user_feedback(request):
-    feedbacks = UserFeedback.objects.filter(issue_type='FB').order_by('-create_date')
-
-    show_all_param = request.query_params.get('show_all')
-
-    if not (show_all_param and show_all_param.lower() == 'true'):
-        feedbacks = feedbacks.filter(public_display=True)
-
-    # Optional filtering parameters
-    title = request.query_params.get('title')
-    full_name = request.query_params.get('full_name')
-    email = request.query_params.get('email')
-
-    if title:
-        feedbacks = feedbacks.filter(title__icontains=title)
-    if full_name:
-        feedbacks = feedbacks.filter(
-            Q(firstname__icontains=full_name) | Q(lastname__icontains=full_name)
-        )
-    if email:
-        feedbacks = feedbacks.filter(email__icontains=email)
+    fields = requested_fields(request.query_params, UserFeedbackSerializer)
+    feedbacks = filter_user_feedback(request.query_params)
 
-    # Apply pagination with default values
-    page = request.query_params.get('page', 1)
-    page_size = request.query_params.get('page_size', 10)
-    paginator = Paginator(feedbacks, page_size)
-    try:
-        feedbacks_page = paginator.page(page)
-    except PageNotAnInteger:
-        feedbacks_page = paginator.page(1)
-    except EmptyPage:
-        feedbacks_page = paginator.page(paginator.num_pages)
+    # Apply pagination, newest first
+    results, pagination = serialize_page(request, feedbacks, UserFeedbackSerializer, fields, ORDERING, default_page_size=10)
 
-    serializer = UserFeedbackSerializer(feedbacks_page, many=True)
     response_data = {
-        "count": paginator.count,
-        "num_pages": paginator.num_pages,
-        "current_page": feedbacks_page.number,
-        "results": serializer.data
+        **pagination,
+        "results": results
     }
     return Response(response_data, status=status.HTTP_200_OK)
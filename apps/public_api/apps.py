@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class PublicApiConfig(AppConfig):
+    name = 'apps.public_api'
+    label = 'public_api'
+    default_auto_field = 'django.db.models.BigAutoField'
+
+    def ready(self):
+        # Register the receivers that keep the denormalized tables current, and the deploy checks
+        from . import checks, signals  # noqa: F401
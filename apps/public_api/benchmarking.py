@@ -0,0 +1,401 @@
+import datetime
+import random
+import statistics
+import time
+from itertools import islice
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import Count
+from django.db.models.functions import Mod
+from django.utils import timezone
+from django.test import Client
+from apps.contract.models import (
+    User, UserFeedback, UserProfile, Quiz, Question, AnswerOption, QuizFeedback, QuizSubmission, QuizResultSnapshot,
+    Flashcard,
+)
+from .models import CandidateScore, LeaderboardEntry, QuizActivity, QuizStats
+
+# Helpers shared by the benchmark management commands. They write synthetic rows,
+# so only point them at a local or disposable database.
+
+# Row counts of the largest tables for each --scale
+SCALES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+# Page parameter values resolved at run time: LAST_PAGE asks for the last page of the filtered list
+LAST_PAGE = 'last'
+# (case, url name, query parameters). `{user_id}`, `{username}`, `{email}`, `{user_ids}`, `{quiz_id}`,
+# `{quiz_ids}`, `{candidate_id}`, `{content_quiz_id}` and `{content_quiz_ids}` are filled from the seeded data,
+# and a `cursor_depth` of N measures the page reached after following N next cursors.
+CASES = (
+    ('user-info-by-id', 'get-user-info', {'user_id': '{user_id}'}),
+    ('user-info-by-username', 'get-user-info', {'username': '{username}'}),
+    ('user-info-by-email', 'get-user-info', {'email': '{email}'}),
+    ('user-info-batch-50', 'get-user-info-batch', {'user_id': '{user_ids}'}),
+    ('user-info-batch-mixed', 'get-user-info-batch', {'user_id': '{user_id}', 'username': '{username}', 'email': '{email}'}),
+
+    ('hall-default', 'list-quizzes-in-hallofquiz', {}),
+    # Same query budget for both page sizes: the number of queries must not grow with the page
+    ('hall-page-size-10', 'list-quizzes-in-hallofquiz', {'page_size': '10'}),
+    ('hall-page-size-100', 'list-quizzes-in-hallofquiz', {'page_size': '100'}),
+    ('hall-title', 'list-quizzes-in-hallofquiz', {'title': 'quantum'}),
+    ('hall-category', 'list-quizzes-in-hallofquiz', {'category': 'physics'}),
+    ('hall-creator', 'list-quizzes-in-hallofquiz', {'creator': 'Lovelace'}),
+    ('hall-title-category-creator', 'list-quizzes-in-hallofquiz', {'title': 'music', 'category': 'poetry', 'creator': 'Ada'}),
+    ('hall-quiz-id', 'list-quizzes-in-hallofquiz', {'quiz_id': '{quiz_id}'}),
+    ('hall-sparse-fields', 'list-quizzes-in-hallofquiz', {'fields': 'quiz_title,attempts,average_rating'}),
+    ('hall-last-page', 'list-quizzes-in-hallofquiz', {'page': LAST_PAGE}),
+    ('hall-cursor-first', 'list-quizzes-in-hallofquiz', {'cursor': ''}),
+    ('hall-cursor-deep', 'list-quizzes-in-hallofquiz', {'cursor_depth': 50}),
+    ('hall-trending-24h', 'list-quizzes-in-hallofquiz', {'sort': 'trending', 'window': '24h'}),
+    ('hall-trending-30d', 'list-quizzes-in-hallofquiz', {'sort': 'trending', 'window': '30d'}),
+    ('hall-trending-cursor-deep', 'list-quizzes-in-hallofquiz', {'sort': 'trending', 'cursor_depth': 50}),
+
+    ('user-feedback-default', 'list-user-feedback', {}),
+    ('user-feedback-show-all', 'list-user-feedback', {'show_all': 'true'}),
+    ('user-feedback-title', 'list-user-feedback', {'title': 'quantum algebra'}),
+    ('user-feedback-full-name', 'list-user-feedback', {'full_name': 'Grace'}),
+    ('user-feedback-email', 'list-user-feedback', {'email': '{email}'}),
+    ('user-feedback-title-full-name', 'list-user-feedback', {'title': 'poetry', 'full_name': 'Hopper', 'show_all': 'true'}),
+    ('user-feedback-sparse-fields', 'list-user-feedback', {'fields': 'title,rating'}),
+    ('user-feedback-last-page', 'list-user-feedback', {'page': LAST_PAGE}),
+    ('user-feedback-cursor-deep', 'list-user-feedback', {'cursor_depth': 50}),
+
+    ('quiz-feedback-default', 'list-quiz-feedback', {}),
+    ('quiz-feedback-quiz', 'list-quiz-feedback', {'quiz': '{quiz_id}'}),
+    ('quiz-feedback-title', 'list-quiz-feedback', {'title': 'history'}),
+    ('quiz-feedback-full-name-quiz', 'list-quiz-feedback', {'full_name': 'Turing', 'quiz': '{quiz_id}'}),
+    ('quiz-feedback-last-page', 'list-quiz-feedback', {'page': LAST_PAGE, 'page_size': '50'}),
+    ('quiz-feedback-cursor-deep', 'list-quiz-feedback', {'cursor_depth': 50}),
+
+    ('rating-summary-quiz', 'get-quiz-rating-summary', {'quiz_id': '{quiz_id}'}),
+    ('rating-summary-batch-50', 'get-quiz-rating-summary', {'quiz_id': '{quiz_ids}'}),
+
+    ('quiz-detail-50-questions', 'get-quiz-detail', {'quiz_id': '{content_quiz_id}'}),
+    ('quiz-detail-hide-answers', 'get-quiz-detail', {'quiz_id': '{content_quiz_id}', 'hide_answers': 'true'}),
+    ('quiz-detail-batch-20', 'get-quiz-detail', {'quiz_id': '{content_quiz_ids}'}),
+
+    ('leaderboard-overall', 'list-leaderboard', {}),
+    ('leaderboard-category', 'list-leaderboard', {'category': 'physics'}),
+    ('leaderboard-cursor-deep', 'list-leaderboard', {'cursor_depth': 20}),
+    ('leaderboard-rank', 'get-leaderboard-rank', {'user_id': '{candidate_id}'}),
+
+    ('export-user-feedback-email', 'export-user-feedback', {'email': '{email}'}),
+    ('export-quiz-feedback-quiz', 'export-quiz-feedback', {'quiz': '{quiz_id}'}),
+    ('export-quiz-feedback-quiz-csv', 'export-quiz-feedback', {'quiz': '{quiz_id}', 'output': 'csv'}),
+    ('export-quizzes-category-creator', 'export-quizzes', {'category': 'physics', 'creator': 'Ada'}),
+)
+
+WORDS = (
+    'algebra', 'biology', 'chemistry', 'history', 'geography', 'physics', 'literature', 'music',
+    'quantum', 'economics', 'grammar', 'poetry', 'statistics', 'astronomy', 'coding', 'anatomy',
+)
+FIRSTNAMES = ('Ada', 'Grace', 'Alan', 'Linus', 'Barbara', 'Ken', 'Margaret', 'Dennis', 'Edsger', 'Frances')
+LASTNAMES = ('Lovelace', 'Hopper', 'Turing', 'Torvalds', 'Liskov', 'Thompson', 'Hamilton', 'Ritchie', 'Dijkstra', 'Allen')
+
+
+def ensure_benchmark_database(force=False):
+    if not (settings.DEBUG or force):
+        raise CommandError(
+            "Benchmarks insert synthetic rows. Run them with DEBUG=True against a local database, "
+            "or pass --force if this database is disposable."
+        )
+
+
+def sentence(rng, words=4):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def seed_users(count, rng, batch_size=5000, prefix='bench'):
+    start = User.objects.count()
+    users = [
+        User(username=f'{prefix}-user-{start + i}', email=f'{prefix}-user-{start + i}@example.com')
+        for i in range(count)
+    ]
+    return User.objects.bulk_create(users, batch_size=batch_size)
+
+
+def seed_profiles(users, rng, share=0.9, batch_size=5000):
+    # Some users are left without a profile, as in production
+    profiles = [
+        UserProfile(user=user, firstname=rng.choice(FIRSTNAMES), lastname=rng.choice(LASTNAMES), bio=sentence(rng, 8))
+        for user in users if rng.random() < share
+    ]
+    return UserProfile.objects.bulk_create(profiles, batch_size=batch_size)
+
+
+def seed_quizzes(count, users, rng, batch_size=5000):
+    quizzes = [
+        Quiz(
+            user=rng.choice(users),
+            quiz_title=sentence(rng, 3).title(),
+            description=sentence(rng, 120) if rng.random() < 0.7 else None,
+            category=rng.choice(WORDS),
+            difficulty_level=rng.choice(('Easy', 'Medium', 'Hard')),
+            number_of_questions=rng.randint(5, 50),
+            is_timed=rng.random() < 0.3,
+            time_limit=rng.choice((None, 10.0, 15.5, 30.0)),
+            is_global=rng.random() < 0.8,
+        )
+        for _ in range(count)
+    ]
+    return Quiz.objects.bulk_create(quizzes, batch_size=batch_size)
+
+
+def seed_quiz_feedback(count, users, quizzes, rng, batch_size=5000):
+    def rows():
+        for _ in range(count):
+            user = rng.choice(users)
+            yield QuizFeedback(
+                user=user,
+                quiz=rng.choice(quizzes),
+                title=sentence(rng, 3).capitalize(),
+                message=sentence(rng, 40),
+                rating=rng.randint(1, 5),
+                firstname=rng.choice(FIRSTNAMES),
+                lastname=rng.choice(LASTNAMES),
+                email=user.email,
+            )
+    return bulk_insert(QuizFeedback, rows(), batch_size)
+
+
+def seed_user_feedback(count, users, rng, batch_size=5000):
+    def rows():
+        for _ in range(count):
+            user = rng.choice(users)
+            yield UserFeedback(
+                user=user,
+                issue_type=rng.choice((UserFeedback.FEEDBACK, UserFeedback.COMPLAINT)),
+                public_display=rng.random() < 0.8,
+                title=sentence(rng, 3).capitalize(),
+                rating=rng.randint(0, 5),
+                message=sentence(rng, 40),
+                firstname=rng.choice(FIRSTNAMES),
+                lastname=rng.choice(LASTNAMES),
+                email=user.email,
+            )
+    return bulk_insert(UserFeedback, rows(), batch_size)
+
+
+def seed_submissions(count, users, quizzes, rng, batch_size=5000):
+    # Each submission gets the matching QuizResultSnapshot of the candidate, as the quiz service writes them
+    def rows():
+        for _ in range(count):
+            quiz, candidate = rng.choice(quizzes), rng.choice(users)
+            correct = rng.randint(0, quiz.number_of_questions)
+            results = dict(
+                percentage_score=correct * 100 // quiz.number_of_questions,
+                number_of_correct=correct,
+                total_number_of_questions=quiz.number_of_questions,
+            )
+            submission = QuizSubmission(
+                author=quiz.user, quiz=quiz, quiz_title=quiz.quiz_title,
+                candidate_name=candidate.username, candidate_id=candidate.pk, **results,
+            )
+            snapshot = QuizResultSnapshot(
+                candidate=candidate, quiz_id=quiz.pk, quiz_title=quiz.quiz_title, quiz_category=quiz.category,
+                quiz_creator_name=quiz.user.username, quiz_creator_id=quiz.user_id, **results,
+            )
+            yield submission, snapshot
+
+    inserted = 0
+    pairs = rows()
+    while batch := list(islice(pairs, batch_size)):
+        submissions = QuizSubmission.objects.bulk_create([submission for submission, _ in batch])
+        for submission, snapshot in batch:
+            snapshot.quiz_submission_id = submission.pk
+        QuizResultSnapshot.objects.bulk_create([snapshot for _, snapshot in batch])
+        inserted += len(submissions)
+    return inserted
+
+
+def seed_questions(count, quizzes, rng, options=4, batch_size=5000):
+    # Questions and answer options of `count` Hall of Quiz quizzes, one of them with the most questions seeded
+    hall = [quiz for quiz in quizzes if quiz.is_global]
+    longest = max(hall, key=lambda quiz: quiz.number_of_questions)
+    chosen = [longest] + rng.sample([quiz for quiz in hall if quiz is not longest], min(count, len(hall)) - 1)
+    questions = Question.objects.bulk_create([
+        Question(quiz=quiz, text=sentence(rng, 12).capitalize() + '?')
+        for quiz in chosen for _ in range(quiz.number_of_questions)
+    ], batch_size=batch_size)
+    correct = {question.pk: rng.randrange(options) for question in questions}
+    return bulk_insert(AnswerOption, (
+        AnswerOption(question=question, label=chr(ord('A') + i), text=sentence(rng, 5).capitalize(),
+                     is_correct=i == correct[question.pk])
+        for question in questions for i in range(options)
+    ), batch_size)
+
+
+def seed_flashcards(count, users, quizzes, rng, batch_size=5000):
+    # Flashcard.quiz is one-to-one, so each deck belongs to a different quiz
+    decks = [
+        Flashcard(
+            title=sentence(rng, 3).title(),
+            description=sentence(rng, 20),
+            number_of_flashcards=rng.randint(5, 40),
+            user=quiz.user if rng.random() < 0.7 else rng.choice(users),
+            quiz=quiz,
+        )
+        for quiz in rng.sample(quizzes, min(count, len(quizzes)))
+    ]
+    return bulk_insert(Flashcard, decks, batch_size)
+
+
+def seed_dataset(rows, rng):
+    """
+    Seeds every table the public endpoints read, sized so the largest tables (submissions,
+    result snapshots and both feedback tables) get `rows` rows each. bulk_create skips the
+    QuizStats, QuizActivity and CandidateScore signals, so they are rebuilt at the end, and the
+    leaderboards built from them.
+    """
+    users = seed_users(max(rows // 10, 100), rng)
+    seed_profiles(users, rng)
+    quizzes = seed_quizzes(max(rows // 5, 50), users, rng)
+    first_submission = QuizSubmission.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    seed_submissions(rows, users, quizzes, rng)
+    spread_completion_dates(QuizSubmission.objects.filter(id__gt=first_submission))
+    seed_quiz_feedback(rows, users, quizzes, rng)
+    seed_user_feedback(rows, users, rng)
+    seed_flashcards(len(quizzes) // 4, users, quizzes, rng)
+    seed_questions(max(rows // 100, 20), quizzes, rng)
+    rebuild_quiz_stats([quiz.pk for quiz in quizzes])
+    QuizActivity.rebuild()
+    CandidateScore.rebuild()
+    LeaderboardEntry.build_all(settings.PUBLIC_API_LEADERBOARD_SIZE, settings.PUBLIC_API_LEADERBOARD_MIN_ATTEMPTS)
+    # Fresh planner statistics, as a long-lived database would have
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return users, quizzes
+
+
+def spread_completion_dates(submissions, days=30):
+    # auto_now_add dates every seeded submission now. Spread them over the last `days` days, at a
+    # different hour each day, so the trending windows rank several hours and days of activity.
+    now = timezone.now()
+    for day in range(days):
+        submissions.annotate(day=Mod('id', days)).filter(day=day).update(
+            completion_date=now - datetime.timedelta(days=day, hours=day * 7 % 24)
+        )
+
+
+def rebuild_quiz_stats(quiz_ids, batch_size=1000):
+    for start in range(0, len(quiz_ids), batch_size):
+        QuizStats.rebuild(quiz_ids[start:start + batch_size])
+
+
+def bulk_insert(model, objects, batch_size):
+    # Inserts an iterable of unsaved instances without holding more than one batch in memory
+    inserted = 0
+    objects = iter(objects)
+    while batch := list(islice(objects, batch_size)):
+        inserted += len(model.objects.bulk_create(batch))
+    return inserted
+
+
+def measure(func, repeat, warmup=1, setup=None):
+    # Wall-clock latency of `func` in milliseconds, summarized as percentiles. `setup` runs untimed before each call.
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return summarize(samples)
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    return {
+        'runs': len(ordered),
+        'p50_ms': round(percentile(0.50), 3),
+        'p95_ms': round(percentile(0.95), 3),
+        'p99_ms': round(percentile(0.99), 3),
+        'mean_ms': round(statistics.fmean(ordered), 3),
+        'max_ms': round(ordered[-1], 3),
+    }
+
+
+def new_rng(seed):
+    return random.Random(seed)
+
+
+def parse_scale(scale):
+    if scale in SCALES:
+        return SCALES[scale]
+    try:
+        return int(scale)
+    except ValueError:
+        raise CommandError(f"--scale must be one of {', '.join(SCALES)} or a number of rows")
+
+
+def select_cases(names):
+    if not names:
+        return list(CASES)
+    unknown = set(names) - {case[0] for case in CASES}
+    if unknown:
+        raise CommandError(f"Unknown case(s): {', '.join(sorted(unknown))}")
+    return [case for case in CASES if case[0] in names]
+
+
+def sample_identifiers(rng):
+    # Identifiers of existing rows that the user-info and quiz filters of CASES look up
+    profiles = list(UserProfile.objects.order_by('-id').values_list('user_id', 'user__username', 'user__email')[:1000])
+    quiz_ids = list(QuizFeedback.objects.order_by('-id').values_list('quiz_id', flat=True)[:1000])
+    candidate_ids = list(QuizResultSnapshot.objects.order_by('-id').values_list('candidate_id', flat=True)[:1000])
+    # Hall of Quiz quizzes with questions, the one with the most questions first
+    content_quiz_ids = list(
+        Question.objects.filter(quiz__is_global=True).values('quiz_id').annotate(questions=Count('id'))
+        .order_by('-questions', 'quiz_id').values_list('quiz_id', flat=True)[:1000]
+    )
+    if not profiles or not quiz_ids or not candidate_ids or not content_quiz_ids:
+        raise CommandError("The database has no users with profiles, quiz feedback, results or questions to request, "
+                           "seed it first")
+    user_id, username, email = rng.choice(profiles)
+    return {
+        'user_id': user_id,
+        'username': username,
+        'email': email,
+        'user_ids': ','.join(str(row[0]) for row in rng.sample(profiles, min(50, len(profiles)))),
+        'quiz_id': rng.choice(quiz_ids),
+        'candidate_id': rng.choice(candidate_ids),
+        'content_quiz_id': content_quiz_ids[0],
+        'content_quiz_ids': ','.join(str(quiz_id) for quiz_id in rng.sample(content_quiz_ids, min(20, len(content_quiz_ids)))),
+        'quiz_ids': ','.join(str(quiz_id) for quiz_id in rng.sample(sorted(set(quiz_ids)), min(50, len(set(quiz_ids))))),
+    }
+
+
+def api_client():
+    # Full middleware stack, with the response cache skipped so every request reaches the view
+    return Client(HTTP_X_API_KEY=settings.API_KEY, HTTP_X_CACHE_BYPASS='1', HTTP_ACCEPT_ENCODING='gzip')
+
+
+def resolve_params(client, path, params, sample):
+    # The pages read here are parsed, so they are asked for uncompressed
+    params = {key: value.format(**sample) if isinstance(value, str) else value for key, value in params.items()}
+    if params.get('page') == LAST_PAGE:
+        first_page = client.get(path, {**params, 'page': '1'}, HTTP_ACCEPT_ENCODING='identity').json()
+        params['page'] = str(first_page['num_pages'])
+    depth = params.pop('cursor_depth', None)
+    if depth is not None:
+        params['cursor'] = ''
+        for _ in range(depth):
+            next_cursor = client.get(path, params, HTTP_ACCEPT_ENCODING='identity').json()['next']
+            if next_cursor is None:
+                break
+            params['cursor'] = next_cursor
+    return params
+
+
+def request_case(client, path, params):
+    response = client.get(path, params)
+    if response.streaming:
+        # Exports are only done once the whole body has been produced
+        b''.join(response.streaming_content)
+    return response
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Backends whose entries are private to each process
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    # The user info and quiz content versions behind the ETags, and the caches they validate, live in the
+    # default cache. Per process, each worker issues its own ETags and only sees its own invalidations.
+    if settings.CACHES['default']['BACKEND'] in PROCESS_LOCAL_CACHES:
+        return [Warning(
+            'The default cache is local to each process.',
+            hint='Set CACHE_BACKEND and CACHE_LOCATION to a shared cache such as Redis or Memcached, so every '
+                 'worker serves the same ETags and sees the invalidations of the others.',
+            id='public_api.W001',
+        )]
+    return []
@@ -0,0 +1,140 @@
+import datetime
+import hashlib
+from functools import wraps
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition as django_condition
+from .pagination import request_count, arequest_count, CURSOR_PARAM
+
+# Bump when the response format changes so clients drop validators issued by older releases
+VALIDATOR_VERSION = 1
+
+
+def list_condition(build_queryset, modified_fields, changed_at=None):
+    """
+    Conditional GET for a list view. `build_queryset(query_params)` must return the filtered
+    queryset the view paginates. Its row count (from the endpoint's count strategy, reused by
+    the pagination afterwards), highest pk and latest value of `modified_fields` are turned into
+    the ETag and Last-Modified headers, so a matching If-None-Match/If-Modified-Since gets a 304
+    before the page query or serialization.
+
+    Inserts change the validator right away, deletes once the count is recomputed; in-place
+    edits of columns that are not in `modified_fields` do not change it. Cursor mode requests get
+    no validator, since computing one would bring back the count that mode skips.
+
+    Lists that also change as time passes give `changed_at(query_params)`, the last time the
+    result changed without a write (or None), which counts as one more modification time.
+    """
+    def validator(request):
+        if not hasattr(request, '_public_api_validator'):
+            queryset = build_queryset(request.GET).order_by()
+            count, _ = request_count(request, queryset)
+            row = queryset.aggregate(**_validator_aggregates(modified_fields))
+            request._public_api_validator = _validator_values(count, row, modified_fields, changed_at and changed_at(request.GET))
+        return request._public_api_validator
+
+    def etag_func(request, *args, **kwargs):
+        if CURSOR_PARAM in request.GET:
+            return None
+        return _etag(request, validator(request))
+
+    def last_modified_func(request, *args, **kwargs):
+        if CURSOR_PARAM in request.GET:
+            return None
+        return validator(request)[2]
+
+    return condition(etag_func=etag_func, last_modified_func=last_modified_func)
+
+
+def condition(etag_func=None, last_modified_func=None):
+    """
+    django.views.decorators.http.condition, except that the validators are only sent with
+    successful responses: an error response is not a representation of the resource, so a
+    400 or 404 gets no ETag or Last-Modified a client could revalidate with later.
+    """
+    def decorator(view):
+        return without_error_validators(django_condition(etag_func=etag_func, last_modified_func=last_modified_func)(view))
+    return decorator
+
+
+def without_error_validators(view):
+    # Strips ETag and Last-Modified from the error responses of a sync view
+    @wraps(view)
+    def inner(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if not has_validators(response):
+            del response['ETag']
+            del response['Last-Modified']
+        return response
+    return inner
+
+
+def has_validators(response):
+    # 2xx responses and the 304s answering them carry validators
+    return 200 <= response.status_code < 300 or response.status_code == 304
+
+
+def alist_condition(build_queryset, modified_fields, changed_at=None):
+    # list_condition for the async views: same validators, computed with the async ORM.
+    # `build_queryset` is awaited, it must be a coroutine function.
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or CURSOR_PARAM in request.GET:
+                return await view(request, *args, **kwargs)
+
+            queryset = (await build_queryset(request.GET)).order_by()
+            count, _ = await arequest_count(request, queryset)
+            row = await queryset.aaggregate(**_validator_aggregates(modified_fields))
+            validator = _validator_values(count, row, modified_fields, changed_at and changed_at(request.GET))
+            etag = quote_etag(_etag(request, validator))
+            last_modified = _timestamp(validator[2])
+
+            response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+                if has_validators(response):
+                    if last_modified and not response.has_header('Last-Modified'):
+                        response.headers['Last-Modified'] = http_date(last_modified)
+                    response.headers.setdefault('ETag', etag)
+            return response
+        return inner
+    return decorator
+
+
+def version_etag(request, versions):
+    # ETag of a response fully determined by the request and the {key: version} values it reads
+    key = f"{VALIDATOR_VERSION}|{request.get_full_path()}|" + ','.join(
+        f"{name}:{version}" for name, version in sorted(versions.items())
+    )
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _validator_aggregates(modified_fields):
+    aggregates = {'last_pk': Max('pk')}
+    aggregates.update({f'modified_{i}': Max(field) for i, field in enumerate(modified_fields)})
+    return aggregates
+
+
+def _validator_values(count, row, modified_fields, changed_at=None):
+    timestamps = [row[f'modified_{i}'] for i in range(len(modified_fields)) if row[f'modified_{i}']]
+    if changed_at is not None:
+        timestamps.append(changed_at)
+    return count, row['last_pk'], max(timestamps, default=None)
+
+
+def _etag(request, validator):
+    count, last_pk, modified = validator
+    key = f"{VALIDATOR_VERSION}|{request.get_full_path()}|{count}|{last_pk}|{modified.isoformat() if modified else ''}"
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def _timestamp(modified):
+    # Same conversion as django.views.decorators.http.condition
+    if modified is None:
+        return None
+    if timezone.is_naive(modified):
+        modified = timezone.make_aware(modified, datetime.timezone.utc)
+    return int(modified.timestamp())
@@ -0,0 +1,107 @@
+import hashlib
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+EXACT = 'exact'
+CACHED = 'cached'
+ESTIMATE = 'estimate'
+COUNT_STRATEGIES = (EXACT, CACHED, ESTIMATE)
+
+
+def count_queryset(queryset, strategy=EXACT):
+    """
+    Returns (count, is_exact) for a list queryset using one of the strategies:
+
+    - exact: a plain COUNT(*) on every call.
+    - cached: a COUNT(*) kept in the cache for PUBLIC_API_COUNT_CACHE_TTL seconds. The key is
+      derived from the compiled WHERE clause, so the same filters in any parameter order share it.
+    - estimate: the planner's row estimate for the table. Only used for unfiltered querysets;
+      filtered ones fall back to the cached strategy.
+    """
+    _check_strategy(strategy)
+    queryset = queryset.order_by()
+    if strategy == ESTIMATE:
+        if _can_estimate(queryset):
+            estimate = estimate_table_rows(queryset.model, queryset.db)
+            if _use_estimate(estimate):
+                return estimate, False
+            return queryset.count(), True
+        strategy = CACHED
+
+    if strategy == CACHED:
+        key = _count_cache_key(queryset)
+        count = cache.get(key)
+        if count is not None:
+            return count, False
+        count = queryset.count()
+        cache.set(key, count, settings.PUBLIC_API_COUNT_CACHE_TTL)
+        return count, True
+
+    return queryset.count(), True
+
+
+async def acount_queryset(queryset, strategy=EXACT):
+    # Async counterpart of count_queryset, same strategies and cache keys
+    _check_strategy(strategy)
+    queryset = queryset.order_by()
+    if strategy == ESTIMATE:
+        if _can_estimate(queryset):
+            estimate = await sync_to_async(estimate_table_rows)(queryset.model, queryset.db)
+            if _use_estimate(estimate):
+                return estimate, False
+            return await queryset.acount(), True
+        strategy = CACHED
+
+    if strategy == CACHED:
+        key = _count_cache_key(queryset)
+        count = await cache.aget(key)
+        if count is not None:
+            return count, False
+        count = await queryset.acount()
+        await cache.aset(key, count, settings.PUBLIC_API_COUNT_CACHE_TTL)
+        return count, True
+
+    return await queryset.acount(), True
+
+
+def estimate_table_rows(model, using='default'):
+    # Row estimate from the database statistics, or None when the backend has none
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # reltuples is maintained by VACUUM/ANALYZE, -1 means the table was never analyzed
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [connection.ops.quote_name(table)])
+            row = cursor.fetchone()
+            return row[0] if row and row[0] >= 0 else None
+        if connection.vendor == 'sqlite':
+            # sqlite_stat1 only exists after ANALYZE; the first number of each entry is the table's row count
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone() is None:
+                return None
+            cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+            row = cursor.fetchone()
+            return int(row[0].split()[0]) if row else None
+    return None
+
+
+def _count_cache_key(queryset):
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.sha1(f"{sql}|{params!r}".encode()).hexdigest()
+    return f"public_api:count:{queryset.model._meta.label_lower}:{digest}"
+
+
+def _check_strategy(strategy):
+    if strategy not in COUNT_STRATEGIES:
+        raise ValueError(f"Unknown count strategy '{strategy}', expected one of {', '.join(COUNT_STRATEGIES)}")
+
+
+def _can_estimate(queryset):
+    return not queryset.query.where and not queryset.query.distinct
+
+
+def _use_estimate(estimate):
+    # Small tables are cheap to count and their statistics are the least reliable
+    return estimate is not None and estimate >= settings.PUBLIC_API_COUNT_ESTIMATE_THRESHOLD
@@ -0,0 +1,95 @@
+from functools import lru_cache
+from django.core.exceptions import FieldDoesNotExist
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+
+FIELDS_PARAM = 'fields'
+EXCLUDE_PARAM = 'exclude'
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin taking a `fields` keyword argument with the names to keep, None keeps all.
+    Columns read by SerializerMethodFields are declared in `Meta.field_sources`
+    (e.g. {'full_name': ('firstname', 'lastname')}) so sparse_queryset can load just those.
+    """
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def fieldset_parameters(serializer_class):
+    # OpenAPI description of the fields/exclude query parameters of a list endpoint
+    names = ', '.join(available_fields(serializer_class))
+    return [
+        OpenApiParameter(
+            name=FIELDS_PARAM,
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description=f"Comma-separated fields to return instead of all of them. Available: {names}"
+        ),
+        OpenApiParameter(
+            name=EXCLUDE_PARAM,
+            type=str,
+            location=OpenApiParameter.QUERY,
+            description="Comma-separated fields to leave out of the response"
+        ),
+    ]
+
+
+def requested_fields(params, serializer_class):
+    """
+    Reads the `fields` and `exclude` query parameters (comma-separated, or repeated) for a list
+    serialized with `serializer_class`. Returns the field names to serialize in declaration
+    order, or None when neither parameter is given. Unknown names are a validation error.
+    """
+    available = available_fields(serializer_class)
+    selected = {}
+    for param in (FIELDS_PARAM, EXCLUDE_PARAM):
+        names = [name.strip() for value in params.getlist(param) for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError({
+                param: f"Unknown field(s): {', '.join(unknown)}. Available fields: {', '.join(available)}"
+            })
+        selected[param] = names
+
+    if not selected[FIELDS_PARAM] and not selected[EXCLUDE_PARAM]:
+        return None
+    return [
+        name for name in available
+        if (not selected[FIELDS_PARAM] or name in selected[FIELDS_PARAM]) and name not in selected[EXCLUDE_PARAM]
+    ]
+
+
+def sparse_queryset(queryset, serializer_class, fields, ordering=()):
+    """
+    Defers the model columns that none of `fields` reads, so they are not fetched at all.
+    The `ordering` columns are always loaded since cursor pagination reads them from each row.
+    Annotations are not affected.
+    """
+    if fields is None:
+        return queryset
+
+    declared = serializer_class().fields
+    field_sources = getattr(serializer_class.Meta, 'field_sources', {})
+    columns = {field.lstrip('-') for field in ordering}
+    for name in fields:
+        columns.update(field_sources.get(name, (declared[name].source,)))
+    return queryset.only(*sorted(column for column in columns if _is_column(queryset.model, column)))
+
+
+@lru_cache(maxsize=None)
+def available_fields(serializer_class):
+    return tuple(serializer_class().fields)
+
+
+def _is_column(model, name):
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        # Annotations such as attempts
+        return False
+    return field.concrete and not field.many_to_many
@@ -0,0 +1,104 @@
+import time
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+# Metrics of the request being handled, set by the metrics and timing middleware. Context variables
+# follow the request into sync_to_async threads, so async views record into the same object.
+current_metrics = ContextVar('public_api_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """
+    SQL statements and named phase durations of one request. Instances are installed as an
+    execute wrapper on every database connection (see install_wrappers), so each statement
+    the request runs is timed.
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        # (sql, milliseconds) in execution order
+        self.queries = []
+        # Statement counts by database alias
+        self.aliases = {}
+        self.phases = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, (time.perf_counter() - started) * 1000))
+            alias = context['connection'].alias
+            self.aliases[alias] = self.aliases.get(alias, 0) + 1
+
+    def add(self, phase, milliseconds):
+        self.phases[phase] = self.phases.get(phase, 0) + milliseconds
+
+    @property
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    @property
+    def db_ms(self):
+        return sum(milliseconds for _, milliseconds in self.queries)
+
+    @property
+    def slowest(self):
+        return max(self.queries, key=lambda query: query[1], default=(None, 0))
+
+
+def install_wrappers(metrics):
+    # Returns an ExitStack that removes the wrappers again. Connections are per thread, so
+    # this has to run in the thread that executes the request's queries.
+    stack = ExitStack()
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(metrics))
+    return stack
+
+
+@contextmanager
+def measuring():
+    # Yields the RequestMetrics of the current request, starting them if no outer middleware has
+    metrics = current_metrics.get()
+    if metrics is not None:
+        yield metrics
+        return
+    metrics = RequestMetrics()
+    token = current_metrics.set(metrics)
+    try:
+        with install_wrappers(metrics):
+            yield metrics
+    finally:
+        current_metrics.reset(token)
+
+
+@asynccontextmanager
+async def ameasuring():
+    metrics = current_metrics.get()
+    if metrics is not None:
+        yield metrics
+        return
+    metrics = RequestMetrics()
+    token = current_metrics.set(metrics)
+    # The wrappers go on the connections of the thread that runs the request's queries
+    wrappers = await sync_to_async(install_wrappers)(metrics)
+    try:
+        yield metrics
+    finally:
+        await sync_to_async(wrappers.close)()
+        current_metrics.reset(token)
+
+
+@contextmanager
+def timed(phase):
+    # Adds the time spent in the block to `phase` of the current request, when one is being measured
+    metrics = current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(phase, (time.perf_counter() - started) * 1000)
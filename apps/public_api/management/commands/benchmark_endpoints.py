@@ -0,0 +1,138 @@
+import json
+import math
+from pathlib import Path
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apps.public_api.benchmarking import (
+    SCALES, api_client, ensure_benchmark_database, measure, new_rng, parse_scale, request_case, resolve_params,
+    sample_identifiers, seed_dataset, select_cases,
+)
+
+BUDGET_FILE = Path(__file__).resolve().parents[2] / 'benchmark_budgets.json'
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed every table the public API reads, then measure latency percentiles and SQL query counts of each "
+        "endpoint across filter combinations and deep pages, and compare them with the budget file. Exits "
+        "with an error when a case goes over its budget. Requests go through the full middleware stack with "
+        "the response cache bypassed and Django's cache cleared before each one, so counts and user stats "
+        "are computed every time. Seeded rows are rolled back unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', default='10k',
+                            help=f"Rows in the largest tables: {', '.join(SCALES)} or a number")
+        parser.add_argument('--case', action='append', dest='cases', help='Only run the given case (can be repeated)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed requests per case')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic data')
+        parser.add_argument('--keep', action='store_true', help='Commit the seeded rows instead of rolling them back')
+        parser.add_argument('--skip-seed', action='store_true', help='Measure the rows already in the database')
+        parser.add_argument('--budget', default=str(BUDGET_FILE), help='Budget file to check the results against')
+        parser.add_argument('--write-budget', action='store_true',
+                            help='Store the measured query counts, and twice the p95 latencies, as the budget of this scale')
+        parser.add_argument('--skip-latency', action='store_true',
+                            help='Only enforce the query budgets, for machines with noisy timings')
+        parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+        parser.add_argument('--output', help='Also write the machine-readable results to this file')
+        parser.add_argument('--force', action='store_true', help='Run even when DEBUG is off')
+
+    def handle(self, *args, **options):
+        ensure_benchmark_database(options['force'])
+        scale = options['scale'].lower()
+        rows = parse_scale(scale)
+        cases = select_cases(options['cases'])
+        rng = new_rng(options['seed'])
+
+        with transaction.atomic():
+            if not options['skip_seed']:
+                seed_dataset(rows, rng)
+            sample = sample_identifiers(rng)
+            results = [self.run_case(case, sample, options['repeat']) for case in cases]
+            transaction.set_rollback(not options['keep'])
+
+        budget_path = Path(options['budget'])
+        budgets = json.loads(budget_path.read_text()) if budget_path.exists() else {}
+        if options['write_budget']:
+            budgets.setdefault(scale, {}).update({
+                row['case']: {'queries': row['queries'], 'p95_ms': math.ceil(row['p95_ms'] * 2)} for row in results
+            })
+            budget_path.write_text(self.dump_budgets(budgets))
+        violations = self.over_budget(results, budgets.get(scale), options['skip_latency'])
+
+        report = {
+            'scale': scale,
+            'rows': rows,
+            'database': connection.vendor,
+            'async_views': settings.PUBLIC_API_ASYNC_VIEWS,
+            'results': results,
+            'violations': violations,
+        }
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2) + '\n')
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.print_table(results, violations, scale in budgets)
+        if violations:
+            raise CommandError(f"{len(violations)} budget violation(s) at scale {scale}")
+
+    def run_case(self, case, sample, repeat):
+        name, url_name, params = case
+        client = api_client()
+        path = reverse(url_name)
+        params = resolve_params(client, path, params, sample)
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = request_case(client, path, params)
+        # Read now: the captured queries are a slice of the connection's log, which every request resets
+        query_count = len(queries)
+        if response.status_code != 200:
+            raise CommandError(f"{name}: {path} answered {response.status_code} for {params}")
+        timing = measure(lambda: request_case(client, path, params), repeat, setup=cache.clear)
+        return {'case': name, 'endpoint': url_name, 'params': params, 'queries': query_count, **timing}
+
+    @staticmethod
+    def dump_budgets(budgets):
+        # One line per case, so budget changes read well in a diff
+        scales = []
+        for scale, cases in budgets.items():
+            lines = ',\n'.join(f'    {json.dumps(case)}: {json.dumps(limits)}' for case, limits in cases.items())
+            scales.append(f'  {json.dumps(scale)}: {{\n{lines}\n  }}')
+        return '{\n' + ',\n'.join(scales) + '\n}\n'
+
+    @staticmethod
+    def over_budget(results, budget, skip_latency):
+        if budget is None:
+            return []
+        violations = []
+        for row in results:
+            limits = budget.get(row['case'])
+            if limits is None:
+                continue
+            if row['queries'] > limits['queries']:
+                violations.append({'case': row['case'], 'metric': 'queries', 'budget': limits['queries'], 'actual': row['queries']})
+            if not skip_latency and row['p95_ms'] > limits['p95_ms']:
+                violations.append({'case': row['case'], 'metric': 'p95_ms', 'budget': limits['p95_ms'], 'actual': row['p95_ms']})
+        return violations
+
+    def print_table(self, results, violations, has_budget):
+        failed = {violation['case'] for violation in violations}
+        self.stdout.write(f"{'case':<34} {'queries':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for row in results:
+            line = (f"{row['case']:<34} {row['queries']:>7} {row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} "
+                    f"{row['p99_ms']:>9.2f} {row['max_ms']:>9.2f}")
+            self.stdout.write(self.style.ERROR(line) if row['case'] in failed else line)
+        for violation in violations:
+            self.stdout.write(self.style.ERROR(
+                f"{violation['case']}: {violation['metric']} {violation['actual']} is over the budget of {violation['budget']}"
+            ))
+        if not has_budget:
+            self.stdout.write(self.style.WARNING("No budget for this scale, run with --write-budget to record one"))
+        elif not violations:
+            self.stdout.write(self.style.SUCCESS('All cases are within budget'))
@@ -0,0 +1,65 @@
+import json
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from apps.contract.models import UserFeedback
+from apps.public_api.benchmarking import ensure_benchmark_database, measure, new_rng, seed_users, seed_user_feedback
+from apps.public_api.search import text_search
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure list-user-feedback text filter latency against table size, comparing the configured "
+        "search backend with plain icontains. Synthetic rows are inserted in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000,10000,100000',
+                            help='Comma-separated UserFeedback table sizes to measure')
+        parser.add_argument('--term', default='quantum alg', help='Search term used for the title filter')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per measurement')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic data')
+        parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+        parser.add_argument('--force', action='store_true', help='Run even when DEBUG is off')
+
+    def handle(self, *args, **options):
+        ensure_benchmark_database(options['force'])
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        term = options['term']
+        rng = new_rng(options['seed'])
+
+        results = []
+        with transaction.atomic():
+            users = seed_users(500, rng)
+            rows = UserFeedback.objects.count()
+            for size in sizes:
+                if size > rows:
+                    seed_user_feedback(size - rows, users, rng)
+                    rows = size
+                    # Fresh planner statistics, as a long-lived database would have
+                    with connection.cursor() as cursor:
+                        cursor.execute('ANALYZE')
+
+                base = UserFeedback.objects.filter(issue_type='FB', public_display=True)
+                variants = {
+                    'icontains': lambda: base.filter(title__icontains=term),
+                    'search_backend': lambda: text_search(base, ['title'], term),
+                }
+                for name, build in variants.items():
+                    # One page request: the filtered count plus the first page of rows
+                    timing = measure(
+                        lambda: (build().count(), list(build().order_by('-create_date', '-id')[:10])),
+                        options['repeat'],
+                    )
+                    results.append({'rows': rows, 'variant': name, 'matches': build().count(), **timing})
+
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'rows':>10} {'variant':<16} {'matches':>8} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+        for row in results:
+            self.stdout.write(
+                f"{row['rows']:>10} {row['variant']:<16} {row['matches']:>8} "
+                f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['max_ms']:>9.2f}"
+            )
@@ -0,0 +1,99 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from apps.public_api.benchmarking import (
+    ensure_benchmark_database, measure, new_rng, seed_users, seed_profiles, seed_quizzes, seed_quiz_feedback,
+    seed_user_feedback,
+)
+from apps.public_api import ListUserFeedback, ListQuizFeedback, ListQuizzesInHallOfQuiz
+from apps.public_api.serialization import ValuesSerializer
+from apps.public_api.renderers import FastJSONRenderer
+
+# (name, serializer, queryset builder, ordering, sparse fieldsets checked for parity besides all fields)
+ENDPOINTS = (
+    ('list-user-feedback', ListUserFeedback.UserFeedbackSerializer,
+     lambda: ListUserFeedback.filter_user_feedback({}), ListUserFeedback.ORDERING,
+     (['full_name'], ['title', 'rating'])),
+    ('list-quiz-feedback', ListQuizFeedback.QuizFeedbackSerializer,
+     lambda: ListQuizFeedback.filter_quiz_feedback({}), ListQuizFeedback.ORDERING,
+     (['quiz', 'create_date'], ['full_name', 'email'])),
+    ('list-quizzes-in-hallofquiz', ListQuizzesInHallOfQuiz.QuizSerializer,
+     lambda: ListQuizzesInHallOfQuiz.with_creator_name(
+         ListQuizzesInHallOfQuiz.with_quiz_stats(ListQuizzesInHallOfQuiz.filter_global_quizzes({}))),
+     ListQuizzesInHallOfQuiz.ORDERING,
+     (['quiz_title', 'attempts', 'creator_name'], ['id', 'create_date', 'time_limit', 'average_rating'])),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Check that the values() serialization path and FastJSONRenderer produce byte-identical JSON to the DRF "
+        "serializers and JSONRenderer of the list endpoints, then time each of them. Synthetic rows are inserted "
+        "in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', default='10,100,1000', help='Comma-separated page sizes to measure')
+        parser.add_argument('--repeat', type=int, default=30, help='Timed runs per measurement')
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic data')
+        parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+        parser.add_argument('--force', action='store_true', help='Run even when DEBUG is off')
+
+    def handle(self, *args, **options):
+        ensure_benchmark_database(options['force'])
+        sizes = sorted(int(size) for size in options['rows'].split(','))
+        rng = new_rng(options['seed'])
+        renderer = JSONRenderer()
+        fast_renderer = FastJSONRenderer()
+
+        results = []
+        with transaction.atomic():
+            users = seed_users(300, rng)
+            seed_profiles(users, rng)
+            quizzes = seed_quizzes(max(sizes) * 2, users, rng)
+            seed_quiz_feedback(max(sizes) * 2, users, quizzes, rng)
+            seed_user_feedback(max(sizes) * 2, users, rng)
+
+            for name, serializer_class, build, ordering, fieldsets in ENDPOINTS:
+                for size in sizes:
+                    for fields in (None, *fieldsets):
+                        expected = renderer.render(serializer_class(self.instances(build, ordering, size), many=True, fields=fields).data)
+                        values = ValuesSerializer(serializer_class, fields)
+                        actual = renderer.render(values.serialize(values.values(build(), ordering).order_by(*ordering)[:size]))
+                        if actual != expected:
+                            raise CommandError(f"{name}: values() output differs from {serializer_class.__name__} "
+                                               f"for {size} rows, fields={fields}")
+                        if fast_renderer.render(serializer_class(self.instances(build, ordering, size), many=True, fields=fields).data) != expected:
+                            raise CommandError(f"{name}: FastJSONRenderer output differs from JSONRenderer "
+                                               f"for {size} rows, fields={fields}")
+
+                    instances = self.instances(build, ordering, size)
+                    values = ValuesSerializer(serializer_class)
+                    rows = list(values.values(build(), ordering).order_by(*ordering)[:size])
+                    data = values.serialize(rows)
+                    timings = {
+                        'serializer': measure(lambda: serializer_class(instances, many=True).data, options['repeat']),
+                        'values': measure(lambda: ValuesSerializer(serializer_class).serialize(rows), options['repeat']),
+                        'render': measure(lambda: renderer.render(data), options['repeat']),
+                        'fast-render': measure(lambda: fast_renderer.render(data), options['repeat']),
+                    }
+                    for path, timing in timings.items():
+                        results.append({'endpoint': name, 'rows': size, 'path': path, **timing})
+
+            transaction.set_rollback(True)
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(self.style.SUCCESS('values() and FastJSONRenderer output is identical to the serializers and JSONRenderer'))
+        self.stdout.write(f"{'endpoint':<28} {'rows':>6} {'path':<12} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+        for row in results:
+            self.stdout.write(
+                f"{row['endpoint']:<28} {row['rows']:>6} {row['path']:<12} "
+                f"{row['p50_ms']:>9.3f} {row['p95_ms']:>9.3f} {row['max_ms']:>9.3f}"
+            )
+
+    @staticmethod
+    def instances(build, ordering, size):
+        return list(build().order_by(*ordering)[:size])
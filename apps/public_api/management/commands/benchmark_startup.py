@@ -0,0 +1,104 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter per measurement, so nothing is imported before the clock starts.
+# Requests are plain WSGI calls through the whole middleware stack, without a test client.
+PROBE = r'''
+import io, json, sys, time
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+application = get_wsgi_application()
+booted = time.perf_counter()
+from django.conf import settings
+
+def call(path, query, bypass_cache):
+    environ = {
+        'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query, 'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1', 'wsgi.input': io.BytesIO(), 'wsgi.url_scheme': 'http',
+        'HTTP_X_API_KEY': settings.API_KEY, 'HTTP_X_CACHE_BYPASS': '1' if bypass_cache else '0',
+    }
+    statuses = []
+    b''.join(application(environ, lambda status, headers: statuses.append(status)))
+    return statuses[0]
+
+paths, requests = json.loads(sys.argv[1]), int(sys.argv[2])
+call(*paths[0])
+result = {'boot_ms': (booted - started) * 1000, 'first_request_ms': (time.perf_counter() - booted) * 1000, 'requests': {}}
+for path, query, bypass_cache in paths:
+    status = call(path, query, bypass_cache)
+    timings = []
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        call(path, query, bypass_cache)
+        timings.append((time.perf_counter() - request_started) * 1_000_000)
+    label = f"{path}?{query}" + (' (cache bypassed)' if bypass_cache else '')
+    result['requests'][label] = {'status': status, 'median_us': sorted(timings)[len(timings) // 2]}
+print(json.dumps(result))
+'''
+
+# (path, query string, bypass the response cache). The first two run no SQL: a response cache hit
+# measures the middleware alone, the 400 of get-user-info adds DRF and a view. The last is a full list request.
+REQUESTS = (
+    ('/api/public/list-quiz-feedback/', 'page_size=1', False),
+    ('/api/public/get-user-info/', '', True),
+    ('/api/public/list-quiz-feedback/', 'page_size=1', True),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure worker cold start (importing Django and building the WSGI application), the first request "
+        "(URLconf and view imports) and the median time of repeated requests, once per fresh interpreter, for "
+        "each settings module given. Compares the default settings with the API-only profile by default."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--settings-module', action='append', dest='modules',
+                            help='Settings module to measure (can be repeated). Default: the current one and '
+                                 'PublicDataAPI.settings_api')
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per settings module')
+        parser.add_argument('--requests', type=int, default=500, help='Timed requests per path and run')
+        parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+
+    def handle(self, *args, **options):
+        modules = options['modules'] or [os.environ.get('DJANGO_SETTINGS_MODULE', 'PublicDataAPI.settings'),
+                                         'PublicDataAPI.settings_api']
+        results = {module: self.measure(module, options['runs'], options['requests']) for module in modules}
+
+        if options['json']:
+            self.stdout.write(json.dumps(results, indent=2))
+            return
+        self.stdout.write(f"{'settings':<32} {'boot ms':>9} {'first ms':>9}   then median per request")
+        for module, row in results.items():
+            self.stdout.write(f"{module:<32} {row['boot_ms']:>9.1f} {row['first_request_ms']:>9.1f}")
+            for label, timing in row['requests'].items():
+                self.stdout.write(f"    {label:<60} {timing['status'][:3]} {timing['median_us']:>9.0f} us")
+
+    def measure(self, module, runs, requests):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': module}
+        samples = []
+        for _ in range(runs):
+            process = subprocess.run(
+                [sys.executable, '-c', PROBE, json.dumps(REQUESTS), str(requests)],
+                env=env, cwd=settings.BASE_DIR, capture_output=True, text=True,
+            )
+            if process.returncode != 0:
+                raise CommandError(f"{module}: the probe failed\n{process.stderr}")
+            samples.append(json.loads(process.stdout.splitlines()[-1]))
+        # Medians across runs, each run being a cold worker
+        return {
+            'boot_ms': statistics.median(sample['boot_ms'] for sample in samples),
+            'first_request_ms': statistics.median(sample['first_request_ms'] for sample in samples),
+            'requests': {
+                path: {
+                    'status': samples[0]['requests'][path]['status'],
+                    'median_us': statistics.median(sample['requests'][path]['median_us'] for sample in samples),
+                }
+                for path in samples[0]['requests']
+            },
+        }
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from apps.public_api.models import CandidateScore, LeaderboardEntry
+
+
+class Command(BaseCommand):
+    help = (
+        "Materialize the leaderboards (overall and per quiz category) from the CandidateScore running totals. "
+        "Run it on a schedule; boards are served as of their last build. With --rebuild-scores the totals are "
+        "first recounted from QuizResultSnapshot, once after deploying and to pick up writes made elsewhere."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild-scores', action='store_true',
+                            help='Recount CandidateScore from QuizResultSnapshot first (a full GROUP BY)')
+        parser.add_argument('--category', action='append', dest='categories',
+                            help='Only build the board of this quiz category, "" for the overall one (can be repeated)')
+        parser.add_argument('--size', type=int, default=settings.PUBLIC_API_LEADERBOARD_SIZE,
+                            help='Candidates kept per board')
+        parser.add_argument('--min-attempts', type=int, default=settings.PUBLIC_API_LEADERBOARD_MIN_ATTEMPTS,
+                            help='Quiz results a candidate needs to be ranked')
+
+    def handle(self, *args, **options):
+        if options['rebuild_scores']:
+            rows = CandidateScore.rebuild()
+            self.stdout.write(f"Recounted {rows} CandidateScore rows from QuizResultSnapshot")
+
+        size, min_attempts = options['size'], options['min_attempts']
+        if options['categories'] is not None:
+            built = {category: len(LeaderboardEntry.build(category, size, min_attempts))
+                     for category in options['categories']}
+        else:
+            built = LeaderboardEntry.build_all(size, min_attempts)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Built {len(built)} leaderboards with {sum(built.values())} entries "
+            f"(top {size}, at least {min_attempts} results)"
+        ))
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from PublicDataAPI.schema import write_schema_files
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the OpenAPI schema once, as YAML and JSON files in PUBLIC_API_SCHEMA_DIR, for "
+        "/api/public/schema/ to serve. Run it at deploy, with the production settings, since the "
+        "schema lists PRODUCTION_URL among its servers."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Directory to write to instead of PUBLIC_API_SCHEMA_DIR')
+
+    def handle(self, *args, **options):
+        for path in write_schema_files(options['output'] or settings.PUBLIC_API_SCHEMA_DIR):
+            self.stdout.write(f"Wrote {path}")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from apps.public_api.models import QuizActivity
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll the hourly QuizActivity buckets older than PUBLIC_API_TRENDING_HOURLY_RETENTION into daily buckets "
+        "and drop the buckets no trending window reaches. Run it hourly or daily. With --rebuild, recount every "
+        "bucket from QuizSubmission instead, once after deploying and to pick up writes made outside this service."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true',
+                            help='Replace all buckets with counts from QuizSubmission')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Rows written or deleted per round trip')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            buckets = QuizActivity.rebuild(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {buckets} QuizActivity buckets from QuizSubmission"))
+            return
+
+        hours, days, dropped = QuizActivity.compact(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rolled {hours} hourly buckets into {days} daily buckets and dropped {dropped} expired buckets"
+        ))
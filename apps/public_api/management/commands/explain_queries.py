@@ -0,0 +1,100 @@
+import json
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from apps.public_api.benchmarking import (
+    SCALES, api_client, ensure_benchmark_database, new_rng, parse_scale, request_case, resolve_params,
+    sample_identifiers, seed_dataset, select_cases,
+)
+from apps.public_api.query_plans import QUERY_INDEXES, explain
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay the benchmark cases of every public endpoint, EXPLAIN each SELECT they run and report "
+        "sequential scans, sorts no index serves, estimated costs (PostgreSQL) and which of the indexes in "
+        "apps.public_api.query_plans.QUERY_INDEXES each case uses. Requests bypass the response cache and "
+        "run with Django's cache cleared, so the user stats queries are included. With --check, exits with "
+        "an error when one of those indexes is used by no case."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--case', action='append', dest='cases', help='Only replay the given case (can be repeated)')
+        parser.add_argument('--scale',
+                            help=f"Seed {', '.join(SCALES)} or a number of rows first, in a transaction that is rolled "
+                                 f"back. Without it the rows already in the database are used.")
+        parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic data')
+        parser.add_argument('--check', action='store_true',
+                            help='Fail when an index of QUERY_INDEXES is used by none of the replayed cases')
+        parser.add_argument('--json', action='store_true', help='Print machine-readable results')
+        parser.add_argument('--force', action='store_true', help='Seed even when DEBUG is off')
+
+    def handle(self, *args, **options):
+        cases = select_cases(options['cases'])
+        rng = new_rng(options['seed'])
+
+        with transaction.atomic():
+            if options['scale']:
+                ensure_benchmark_database(options['force'])
+                seed_dataset(parse_scale(options['scale'].lower()), rng)
+            sample = sample_identifiers(rng)
+            results = [self.explain_case(case, sample) for case in cases]
+            transaction.set_rollback(True)
+
+        usage = {name: sorted({row['case'] for row in results if name in row['indexes']}) for name in QUERY_INDEXES}
+        unused = [name for name, used_by in usage.items() if not used_by]
+
+        if options['json']:
+            self.stdout.write(json.dumps({'database': connection.vendor, 'results': results, 'index_usage': usage}, indent=2))
+        else:
+            self.print_report(results, usage)
+        if options['check'] and unused:
+            raise CommandError(f"Index(es) used by no case: {', '.join(unused)}")
+
+    def explain_case(self, case, sample):
+        name, url_name, params = case
+        client = api_client()
+        path = reverse(url_name)
+        params = resolve_params(client, path, params, sample)
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = request_case(client, path, params)
+        # Copied now: the captured queries are a slice of the connection's log, which every request resets
+        statements = list(dict.fromkeys(query['sql'] for query in queries))
+        if response.status_code != 200:
+            raise CommandError(f"{name}: {path} answered {response.status_code} for {params}")
+
+        plans = [
+            {'sql': sql, **explain(connection, sql)}
+            for sql in statements if sql.lstrip().upper().startswith(('SELECT', 'WITH'))
+        ]
+        return {
+            'case': name,
+            'params': params,
+            'statements': plans,
+            'indexes': sorted({index for plan in plans for index in plan['indexes']}),
+        }
+
+    def print_report(self, results, usage):
+        for row in results:
+            self.stdout.write(self.style.MIGRATE_HEADING(row['case']))
+            for plan in row['statements']:
+                cost = '' if plan['cost'] is None else f"cost {plan['cost']:.2f}  "
+                line = f"  {cost}{plan['sql'][:110]}"
+                self.stdout.write(self.style.WARNING(line) if plan['seq_scans'] or plan['sorts'] else line)
+                for table in plan['seq_scans']:
+                    self.stdout.write(f"    sequential scan of {table}")
+                for sort in plan['sorts']:
+                    self.stdout.write(f"    sort: {sort}")
+                if plan['indexes']:
+                    self.stdout.write(f"    indexes: {', '.join(dict.fromkeys(plan['indexes']))}")
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Index usage'))
+        for name, used_by in usage.items():
+            if used_by:
+                self.stdout.write(f"  {name}: {', '.join(used_by)}")
+            else:
+                self.stdout.write(self.style.ERROR(f"  {name}: unused"))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from apps.contract.models import Quiz
+from apps.public_api.models import QuizStats
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill and reconcile the denormalized QuizStats table (attempts, rating totals and rating histograms) "
+        "against QuizSubmission and QuizFeedback. "
+        "Run it once after deploying and on a schedule to pick up writes made outside this service."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quiz', type=int, action='append', dest='quiz_ids',
+                            help='Only reconcile the given quiz id (can be repeated)')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Number of quizzes aggregated per round trip')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report drifted rows without writing them')
+
+    def handle(self, *args, **options):
+        quizzes = Quiz.objects.order_by('id')
+        if options['quiz_ids']:
+            quizzes = quizzes.filter(id__in=options['quiz_ids'])
+        quiz_ids = list(quizzes.values_list('id', flat=True))
+
+        batch_size = options['batch_size']
+        missing = drifted = 0
+        for start in range(0, len(quiz_ids), batch_size):
+            batch = quiz_ids[start:start + batch_size]
+            expected = QuizStats.compute(batch)
+            stored = {
+                row[0]: tuple(row[1:])
+                for row in QuizStats.objects.filter(quiz_id__in=batch)
+                .values_list('quiz_id', *QuizStats.COUNTERS)
+            }
+            stale = [quiz_id for quiz_id, values in expected.items() if stored.get(quiz_id) != values]
+            missing += sum(1 for quiz_id in stale if quiz_id not in stored)
+            drifted += sum(1 for quiz_id in stale if quiz_id in stored)
+            if stale and not options['dry_run']:
+                QuizStats.store({quiz_id: expected[quiz_id] for quiz_id in stale})
+
+        action = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(
+            f"{action} {missing} missing and {drifted} drifted QuizStats rows across {len(quiz_ids)} quizzes"
+        ))
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.19 on 2026-10-18 00:34
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contract', '__first__'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizStats',
+            fields=[
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='contract.quiz')),
+                ('attempts', models.IntegerField(default=0)),
+                ('rating_sum', models.BigIntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Quiz Stats',
+                'verbose_name_plural': 'Quiz Stats',
+                'db_table': 'quiz_stats',
+                'indexes': [models.Index(fields=['-attempts', '-quiz'], name='quiz_stats_attempts_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import migrations
+
+# Frozen copy of apps.public_api.search.SEARCH_COLUMNS at the time of this migration
+SEARCH_COLUMNS = {
+    'UserFeedback': ('title', 'firstname', 'lastname', 'email'),
+    'QuizFeedback': ('title', 'firstname', 'lastname', 'email'),
+    'Quiz': ('quiz_title', 'category'),
+    'UserProfile': ('firstname', 'lastname'),
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for table, columns in SEARCH_COLUMNS.items():
+            for column in columns:
+                # CONCURRENTLY keeps the shared tables writable while the index builds
+                schema_editor.execute(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{table}_{column}_trgm" '
+                    f'ON "{table}" USING gin (UPPER("{column}") gin_trgm_ops)'
+                )
+    elif vendor == 'sqlite':
+        for table, columns in SEARCH_COLUMNS.items():
+            for statement in _sqlite_shadow_table(table, columns):
+                schema_editor.execute(statement)
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for table, columns in SEARCH_COLUMNS.items():
+            for column in columns:
+                schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{table}_{column}_trgm"')
+    elif vendor == 'sqlite':
+        for table in SEARCH_COLUMNS:
+            for suffix in ('ai', 'ad', 'au'):
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS "{table}_search_{suffix}"')
+            schema_editor.execute(f'DROP TABLE IF EXISTS "{table}_search"')
+
+
+def _sqlite_shadow_table(table, columns):
+    # External content FTS5 table over the source table, kept in sync by triggers
+    shadow = f'{table}_search'
+    names = ', '.join(f'"{column}"' for column in columns)
+    new_values = ', '.join(f'new."{column}"' for column in columns)
+    old_values = ', '.join(f'old."{column}"' for column in columns)
+    return [
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS "{shadow}" USING fts5({names}, '
+        f"content='{table}', content_rowid='id', tokenize='trigram')",
+        f'CREATE TRIGGER IF NOT EXISTS "{shadow}_ai" AFTER INSERT ON "{table}" BEGIN '
+        f'INSERT INTO "{shadow}"(rowid, {names}) VALUES (new.id, {new_values}); END',
+        f'CREATE TRIGGER IF NOT EXISTS "{shadow}_ad" AFTER DELETE ON "{table}" BEGIN '
+        f'INSERT INTO "{shadow}"("{shadow}", rowid, {names}) VALUES (\'delete\', old.id, {old_values}); END',
+        f'CREATE TRIGGER IF NOT EXISTS "{shadow}_au" AFTER UPDATE ON "{table}" BEGIN '
+        f'INSERT INTO "{shadow}"("{shadow}", rowid, {names}) VALUES (\'delete\', old.id, {old_values}); '
+        f'INSERT INTO "{shadow}"(rowid, {names}) VALUES (new.id, {new_values}); END',
+        f'INSERT INTO "{shadow}"("{shadow}") VALUES (\'rebuild\')',
+    ]
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('public_api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
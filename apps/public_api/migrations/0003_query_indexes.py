@@ -0,0 +1,47 @@
+from django.db import migrations
+
+# Frozen copy of apps.public_api.query_plans.QUERY_INDEXES at the time of this migration.
+# The contract tables are shared with the main backend and have no migrations here, so the
+# indexes are created with raw SQL, like the search indexes of 0002.
+QUERY_INDEXES = {
+    'UserFeedback_public_list_idx': ('UserFeedback', ('issue_type', 'public_display', '-create_date', '-id')),
+    'QuizFeedback_quiz_list_idx': ('QuizFeedback', ('quiz_id', '-create_date', '-id')),
+    'QuizFeedback_list_idx': ('QuizFeedback', ('-create_date', '-id')),
+    'Quiz_global_idx': ('Quiz', ('is_global', 'id')),
+    'quiz_result_snapshot_candidate_score_idx': ('quiz_result_snapshot', ('candidate_id', 'percentage_score')),
+}
+
+
+def create_query_indexes(apps, schema_editor):
+    # CONCURRENTLY keeps the shared tables writable while the index builds
+    concurrently = ' CONCURRENTLY' if schema_editor.connection.vendor == 'postgresql' else ''
+    for name, (table, columns) in QUERY_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX{concurrently} IF NOT EXISTS "{name}" ON "{table}" ({_column_list(columns)})'
+        )
+
+
+def drop_query_indexes(apps, schema_editor):
+    concurrently = ' CONCURRENTLY' if schema_editor.connection.vendor == 'postgresql' else ''
+    for name in QUERY_INDEXES:
+        schema_editor.execute(f'DROP INDEX{concurrently} IF EXISTS "{name}"')
+
+
+def _column_list(columns):
+    # ('quiz_id', '-create_date') -> "quiz_id", "create_date" DESC
+    return ', '.join(
+        f'"{column[1:]}" DESC' if column.startswith('-') else f'"{column}"' for column in columns
+    )
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('public_api', '0002_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_query_indexes, drop_query_indexes),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.19 on 2026-10-18 01:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contract', '__first__'),
+        ('public_api', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket_start', models.DateTimeField()),
+                ('submissions', models.IntegerField(default=0)),
+                ('quiz', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='activity', to='contract.quiz')),
+            ],
+            options={
+                'verbose_name': 'Quiz Activity',
+                'verbose_name_plural': 'Quiz Activity',
+                'db_table': 'quiz_activity',
+                'indexes': [models.Index(fields=['granularity', 'bucket_start'], name='quiz_activity_compact_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='quizactivity',
+            constraint=models.UniqueConstraint(fields=('quiz', 'granularity', 'bucket_start'), name='quiz_activity_bucket_uniq'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.19 on 2026-10-18 01:34
+
+from collections import defaultdict
+from django.db import migrations, models
+
+HISTOGRAM_FIELDS = tuple(f'ratings_{rating}' for rating in range(6))
+
+
+def fill_histograms(apps, schema_editor):
+    # Histograms of the existing stats rows, from one grouped pass over QuizFeedback. The contract
+    # tables have no migrations here, so their historical models lack the foreign keys: raw SQL.
+    QuizStats = apps.get_model('public_api', 'QuizStats')
+    histograms = defaultdict(dict)
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT "quiz_id", "rating", COUNT(*) FROM "QuizFeedback" '
+            'WHERE "rating" BETWEEN 0 AND 5 GROUP BY "quiz_id", "rating"'
+        )
+        for quiz_id, rating, total in cursor.fetchall():
+            histograms[quiz_id][f'ratings_{rating}'] = total
+
+    rows = []
+    for stats in QuizStats.objects.filter(rating_count__gt=0).iterator():
+        for field, total in histograms.get(stats.quiz_id, {}).items():
+            setattr(stats, field, total)
+        rows.append(stats)
+    QuizStats.objects.bulk_update(rows, HISTOGRAM_FIELDS, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('public_api', '0004_quiz_activity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizstats',
+            name='ratings_0',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quizstats',
+            name='ratings_1',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quizstats',
+            name='ratings_2',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quizstats',
+            name='ratings_3',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quizstats',
+            name='ratings_4',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quizstats',
+            name='ratings_5',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(fill_histograms, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.19 on 2026-10-18 01:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contract', '__first__'),
+        ('public_api', '0005_quiz_rating_histogram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, max_length=255)),
+                ('rank', models.IntegerField()),
+                ('candidate_name', models.CharField(blank=True, max_length=201)),
+                ('average_score', models.FloatField()),
+                ('attempts', models.IntegerField()),
+                ('built_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('candidate', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contract.user')),
+            ],
+            options={
+                'verbose_name': 'Leaderboard Entry',
+                'verbose_name_plural': 'Leaderboard Entries',
+                'db_table': 'leaderboard_entry',
+            },
+        ),
+        migrations.CreateModel(
+            name='CandidateScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, max_length=255)),
+                ('score_sum', models.BigIntegerField(default=0)),
+                ('attempts', models.IntegerField(default=0)),
+                ('average_score', models.FloatField(null=True)),
+                ('candidate', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contract.user')),
+            ],
+            options={
+                'verbose_name': 'Candidate Score',
+                'verbose_name_plural': 'Candidate Scores',
+                'db_table': 'candidate_score',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('category', 'rank'), name='leaderboard_entry_rank_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('category', 'candidate'), name='leaderboard_entry_candidate_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='candidatescore',
+            index=models.Index(fields=['category', '-average_score', '-attempts', 'candidate'], name='candidate_score_rank_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='candidatescore',
+            constraint=models.UniqueConstraint(fields=('candidate', 'category'), name='candidate_score_uniq'),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Creates the QuizStats rows of quizzes written before the receivers existed, with their real counts,
+# so their attempts and ratings are right without waiting for reconcile_quiz_stats. The contract tables
+# have no migrations here, so their historical models lack the foreign keys: raw SQL, like 0002 and 0003.
+#
+# Each batch of quizzes is inserted and committed on its own (atomic = False), so a large Quiz table is
+# never locked for the whole backfill and an interrupted run resumes where it stopped.
+#
+# Not reversed: the rows hold the same values reconcile_quiz_stats would store, the Hall of Quiz lists a
+# quiz the same way with or without one, and deleting them on the way back could not tell them apart
+# from rows the receivers created since.
+
+from django.db import migrations, transaction
+from django.utils import timezone
+
+HISTOGRAM_FIELDS = tuple(f'ratings_{rating}' for rating in range(6))
+BATCH_SIZE = 1000
+
+
+def create_missing_stats(apps, schema_editor):
+    connection = schema_editor.connection
+    histogram = ', '.join(
+        f'(SELECT COUNT(*) FROM "QuizFeedback" f WHERE f."quiz_id" = q."id" AND f."rating" = {rating})'
+        for rating in range(6)
+    )
+    columns = ', '.join(f'"{field}"' for field in HISTOGRAM_FIELDS)
+    last_id = 0
+    while True:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT q."id" FROM "Quiz" q WHERE q."id" > %s '
+                'AND NOT EXISTS (SELECT 1 FROM "quiz_stats" st WHERE st."quiz_id" = q."id") '
+                'ORDER BY q."id" LIMIT %s',
+                [last_id, BATCH_SIZE],
+            )
+            quiz_ids = [row[0] for row in cursor.fetchall()]
+            if not quiz_ids:
+                return
+            cursor.execute(
+                f'INSERT INTO "quiz_stats" ("quiz_id", "attempts", "rating_sum", "rating_count", {columns}, "updated_at") '
+                f'SELECT q."id", '
+                f'(SELECT COUNT(*) FROM "quiz_submission" s WHERE s."quiz_id" = q."id"), '
+                f'(SELECT COALESCE(SUM(f."rating"), 0) FROM "QuizFeedback" f WHERE f."quiz_id" = q."id"), '
+                f'(SELECT COUNT(*) FROM "QuizFeedback" f WHERE f."quiz_id" = q."id"), '
+                f'{histogram}, %s '
+                f'FROM "Quiz" q WHERE q."id" IN ({", ".join(["%s"] * len(quiz_ids))})',
+                [timezone.now(), *quiz_ids],
+            )
+        last_id = quiz_ids[-1]
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('public_api', '0006_leaderboards'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,376 @@
+import datetime
+from collections import Counter
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, FloatField, Q, Sum, Value
+from django.db.models.functions import Cast, Concat, NullIf, Trim, TruncHour
+from django.utils import timezone
+from apps.contract.models import User, Quiz, QuizSubmission, QuizFeedback, QuizResultSnapshot
+
+
+# Denormalized per-quiz counters used by the Hall of Quiz. Rows are kept current by the
+# receivers in apps.public_api.signals and can be rebuilt with `manage.py reconcile_quiz_stats`.
+class QuizStats(models.Model):
+    # Rating values with a histogram column; other values only count in rating_sum and rating_count
+    RATING_VALUES = range(6)
+    HISTOGRAM_FIELDS = tuple(f'ratings_{rating}' for rating in RATING_VALUES)
+    # Counter columns in the order of the tuples of compute() and store()
+    COUNTERS = ('attempts', 'rating_sum', 'rating_count') + HISTOGRAM_FIELDS
+
+    quiz = models.OneToOneField(Quiz, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    # Number of QuizSubmission rows pointing at the quiz
+    attempts = models.IntegerField(default=0)
+    # Sum and count of QuizFeedback ratings, the average is rating_sum / rating_count
+    rating_sum = models.BigIntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+    # Number of QuizFeedback rows with each rating, for the rating summary endpoint
+    ratings_0 = models.IntegerField(default=0)
+    ratings_1 = models.IntegerField(default=0)
+    ratings_2 = models.IntegerField(default=0)
+    ratings_3 = models.IntegerField(default=0)
+    ratings_4 = models.IntegerField(default=0)
+    ratings_5 = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Stats for quiz {self.quiz_id}: {self.attempts} attempts"
+
+    @property
+    def average_rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum / self.rating_count
+
+    @classmethod
+    def histogram_field(cls, rating):
+        return f'ratings_{rating}' if rating in cls.RATING_VALUES else None
+
+    @classmethod
+    def compute(cls, quiz_ids):
+        # Aggregate each source table on its own so submissions and feedback never get cross-joined
+        attempts = dict(
+            QuizSubmission.objects.filter(quiz_id__in=quiz_ids)
+            .values('quiz_id').annotate(total=Count('id')).values_list('quiz_id', 'total')
+        )
+        histogram = {field: Count('id', filter=Q(rating=rating))
+                     for field, rating in zip(cls.HISTOGRAM_FIELDS, cls.RATING_VALUES)}
+        ratings = {
+            row['quiz_id']: (row['rating_sum'] or 0, row['rating_count'], *(row[field] for field in cls.HISTOGRAM_FIELDS))
+            for row in QuizFeedback.objects.filter(quiz_id__in=quiz_ids)
+            .values('quiz_id').annotate(rating_sum=Sum('rating'), rating_count=Count('id'), **histogram)
+        }
+        no_ratings = (0,) * (len(cls.COUNTERS) - 1)
+        return {
+            quiz_id: (attempts.get(quiz_id, 0), *ratings.get(quiz_id, no_ratings))
+            for quiz_id in quiz_ids
+        }
+
+    @classmethod
+    def rebuild(cls, quiz_ids):
+        return cls.store(cls.compute(quiz_ids))
+
+    @classmethod
+    def store(cls, values):
+        # values maps quiz_id -> a tuple of the COUNTERS columns, as returned by compute()
+        now = timezone.now()
+        rows = [
+            cls(quiz_id=quiz_id, updated_at=now, **dict(zip(cls.COUNTERS, counters)))
+            for quiz_id, counters in values.items()
+        ]
+        cls.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['quiz'],
+            update_fields=[*cls.COUNTERS, 'updated_at'],
+        )
+        return rows
+
+    class Meta:
+        db_table = 'quiz_stats'
+        verbose_name = 'Quiz Stats'
+        verbose_name_plural = 'Quiz Stats'
+        indexes = [
+            models.Index(fields=['-attempts', '-quiz'], name='quiz_stats_attempts_idx'),
+        ]
+
+
+# Submissions per quiz in hourly and daily buckets, summed by the trending sort of the Hall of Quiz.
+# New submissions are counted into hourly buckets by apps.public_api.signals; `manage.py compact_quiz_activity`
+# rolls hours older than PUBLIC_API_TRENDING_HOURLY_RETENTION into days and drops days no window reaches.
+class QuizActivity(models.Model):
+    HOUR = 'hour'
+    DAY = 'day'
+    # Windows of ?sort=trending
+    WINDOWS = {
+        '24h': datetime.timedelta(hours=24),
+        '7d': datetime.timedelta(days=7),
+        '30d': datetime.timedelta(days=30),
+    }
+
+    # Indexed by quiz_activity_bucket_uniq, which starts with the quiz
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='activity', db_index=False)
+    granularity = models.CharField(max_length=4, choices=[(HOUR, 'Hour'), (DAY, 'Day')])
+    # Start of the bucket, in UTC
+    bucket_start = models.DateTimeField()
+    submissions = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.submissions} submissions of quiz {self.quiz_id} in the {self.granularity} of {self.bucket_start}"
+
+    @classmethod
+    def floor(cls, when, granularity):
+        when = when.astimezone(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+        return when.replace(hour=0) if granularity == cls.DAY else when
+
+    @classmethod
+    def window(cls, since):
+        # Buckets of a window starting at `since`. Daily buckets count whole, so once a window starts
+        # in the compacted range it includes up to a day of older submissions.
+        return (Q(granularity=cls.HOUR, bucket_start__gte=cls.floor(since, cls.HOUR))
+                | Q(granularity=cls.DAY, bucket_start__gte=cls.floor(since, cls.DAY)))
+
+    @classmethod
+    def bump(cls, quiz_id, completed, delta):
+        if quiz_id is None or completed is None or not delta:
+            return
+        # The hour of the submission, or its day once compaction has rolled the hour up
+        for granularity in (cls.HOUR, cls.DAY):
+            if cls._add(quiz_id, granularity, cls.floor(completed, granularity), delta):
+                return
+        # Removals from buckets that were already dropped have nothing left to correct
+        if delta < 0:
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(quiz_id=quiz_id, granularity=cls.HOUR,
+                                   bucket_start=cls.floor(completed, cls.HOUR), submissions=delta)
+        except IntegrityError:
+            # Another submission created the bucket first
+            cls._add(quiz_id, cls.HOUR, cls.floor(completed, cls.HOUR), delta)
+
+    @classmethod
+    def _add(cls, quiz_id, granularity, bucket_start, delta):
+        return cls.objects.filter(quiz_id=quiz_id, granularity=granularity, bucket_start=bucket_start).update(
+            submissions=F('submissions') + delta
+        )
+
+    @classmethod
+    def retention(cls, now=None):
+        # (start of the hourly buckets kept, start of the daily buckets kept)
+        now = now or timezone.now()
+        hours_since = cls.floor(now - datetime.timedelta(hours=settings.PUBLIC_API_TRENDING_HOURLY_RETENTION), cls.DAY)
+        days_since = cls.floor(now - max(cls.WINDOWS.values()), cls.DAY)
+        return hours_since, days_since
+
+    @classmethod
+    def compact(cls, now=None, batch_size=1000):
+        """
+        Rolls the hourly buckets of the days before the hourly retention into daily buckets and
+        deletes buckets older than the longest window. Returns (hours rolled up, days written,
+        buckets dropped).
+        """
+        hours_since, days_since = cls.retention(now)
+        with transaction.atomic():
+            # Locked, so a concurrent bump of one of these hours waits, then finds it gone and bumps the day
+            hours = list(
+                cls.objects.select_for_update()
+                .filter(granularity=cls.HOUR, bucket_start__lt=hours_since)
+                .values_list('pk', 'quiz_id', 'bucket_start', 'submissions')
+            )
+            days = Counter()
+            for _, quiz_id, bucket_start, submissions in hours:
+                if bucket_start >= days_since:
+                    days[quiz_id, cls.floor(bucket_start, cls.DAY)] += submissions
+            pks = [pk for pk, *_ in hours]
+            for start in range(0, len(pks), batch_size):
+                cls.objects.filter(pk__in=pks[start:start + batch_size]).delete()
+
+            existing = {
+                (bucket.quiz_id, bucket.bucket_start): bucket
+                for bucket in cls.objects.select_for_update().filter(
+                    granularity=cls.DAY, bucket_start__gte=days_since, bucket_start__lt=hours_since,
+                    quiz_id__in={quiz_id for quiz_id, _ in days},
+                )
+            }
+            for key, bucket in existing.items():
+                bucket.submissions += days[key]
+            cls.objects.bulk_update(list(existing.values()), ['submissions'], batch_size=batch_size)
+            cls.objects.bulk_create([
+                cls(quiz_id=quiz_id, granularity=cls.DAY, bucket_start=bucket_start, submissions=submissions)
+                for (quiz_id, bucket_start), submissions in days.items() if (quiz_id, bucket_start) not in existing
+            ], batch_size=batch_size)
+
+            dropped, _ = cls.objects.filter(bucket_start__lt=days_since).delete()
+        return len(hours), len(days), dropped
+
+    @classmethod
+    def rebuild(cls, now=None, batch_size=1000):
+        # Recounts every bucket from QuizSubmission, as hours within the hourly retention and days before
+        hours_since, days_since = cls.retention(now)
+        counts = (
+            QuizSubmission.objects.filter(quiz__isnull=False, completion_date__gte=days_since)
+            .annotate(hour=TruncHour('completion_date', tzinfo=datetime.timezone.utc))
+            .values('quiz_id', 'hour').annotate(total=Count('id')).values_list('quiz_id', 'hour', 'total')
+        )
+        buckets = Counter()
+        for quiz_id, hour, total in counts:
+            granularity = cls.HOUR if hour >= hours_since else cls.DAY
+            buckets[quiz_id, granularity, cls.floor(hour, granularity)] += total
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create([
+                cls(quiz_id=quiz_id, granularity=granularity, bucket_start=bucket_start, submissions=submissions)
+                for (quiz_id, granularity, bucket_start), submissions in buckets.items()
+            ], batch_size=batch_size)
+        return len(buckets)
+
+    class Meta:
+        db_table = 'quiz_activity'
+        verbose_name = 'Quiz Activity'
+        verbose_name_plural = 'Quiz Activity'
+        constraints = [
+            # Also the index the per-quiz window sums read
+            models.UniqueConstraint(fields=['quiz', 'granularity', 'bucket_start'], name='quiz_activity_bucket_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start'], name='quiz_activity_compact_idx'),
+        ]
+
+
+def candidate_name():
+    # "firstname lastname" of the profile of a CandidateScore's candidate, "" without a profile
+    return Trim(Concat('candidate__profile__firstname', Value(' '), 'candidate__profile__lastname'))
+
+
+# Running totals of QuizResultSnapshot.percentage_score per candidate, overall (category OVERALL) and per
+# quiz_category, kept current by the receivers in apps.public_api.signals. The leaderboards are built from
+# these rows instead of grouping the snapshot table; `manage.py build_leaderboards --rebuild-scores` recounts them.
+class CandidateScore(models.Model):
+    OVERALL = ''
+    # Best first: highest average, then most attempts, then the lowest user id
+    RANKING = ('-average_score', '-attempts', 'candidate_id')
+
+    candidate = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', db_index=False)
+    category = models.CharField(max_length=255, blank=True)
+    score_sum = models.BigIntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    # score_sum / attempts, stored so boards and ranks read it from an index
+    average_score = models.FloatField(null=True)
+
+    def __str__(self):
+        return f"{self.candidate_id} in {self.category or 'all categories'}: {self.average_score} over {self.attempts}"
+
+    @classmethod
+    def boards(cls, category):
+        # A snapshot counts on the overall board and on the board of its category, if it has one
+        return (cls.OVERALL, category) if category else (cls.OVERALL,)
+
+    @classmethod
+    def bump(cls, candidate_id, category, score, sign):
+        # Adds (sign=1) or removes (sign=-1) one snapshot scoring `score`
+        for board in cls.boards(category):
+            if cls._add(candidate_id, board, score, sign) or sign < 0:
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(candidate_id=candidate_id, category=board, score_sum=score, attempts=1,
+                                       average_score=float(score))
+            except IntegrityError:
+                # Another snapshot of the candidate created the row first
+                cls._add(candidate_id, board, score, sign)
+
+    @classmethod
+    def _add(cls, candidate_id, category, score, sign):
+        # The new average is computed from the old column values, in the same UPDATE
+        return cls.objects.filter(candidate_id=candidate_id, category=category).update(
+            score_sum=F('score_sum') + sign * score,
+            attempts=F('attempts') + sign,
+            average_score=Cast(F('score_sum') + sign * score, FloatField()) / NullIf(F('attempts') + sign, 0),
+        )
+
+    @classmethod
+    def rebuild(cls, batch_size=5000):
+        # Recounts every row from QuizResultSnapshot, a full GROUP BY: run it rarely
+        totals = {}
+        for candidate_id, category, score_sum, attempts in (
+            QuizResultSnapshot.objects.values('candidate_id', 'quiz_category')
+            .annotate(score_sum=Sum('percentage_score'), attempts=Count('id'))
+            .values_list('candidate_id', 'quiz_category', 'score_sum', 'attempts').iterator()
+        ):
+            for board in cls.boards(category):
+                previous = totals.get((candidate_id, board), (0, 0))
+                totals[candidate_id, board] = (previous[0] + score_sum, previous[1] + attempts)
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create([
+                cls(candidate_id=candidate_id, category=category, score_sum=score_sum, attempts=attempts,
+                    average_score=score_sum / attempts)
+                for (candidate_id, category), (score_sum, attempts) in totals.items()
+            ], batch_size=batch_size)
+        return len(totals)
+
+    class Meta:
+        db_table = 'candidate_score'
+        verbose_name = 'Candidate Score'
+        verbose_name_plural = 'Candidate Scores'
+        constraints = [
+            models.UniqueConstraint(fields=['candidate', 'category'], name='candidate_score_uniq'),
+        ]
+        indexes = [
+            # Board order, for building the boards and counting the candidates ahead of one
+            models.Index(fields=['category', '-average_score', '-attempts', 'candidate'], name='candidate_score_rank_idx'),
+        ]
+
+
+# Materialized top PUBLIC_API_LEADERBOARD_SIZE of each board, written by `manage.py build_leaderboards`.
+# Pages are read by rank, so their cost does not depend on the number of snapshots or candidates.
+class LeaderboardEntry(models.Model):
+    category = models.CharField(max_length=255, blank=True)
+    rank = models.IntegerField()
+    candidate = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', db_index=False)
+    # "firstname lastname" of the candidate's profile when the board was built
+    candidate_name = models.CharField(max_length=201, blank=True)
+    average_score = models.FloatField()
+    attempts = models.IntegerField()
+    built_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"#{self.rank} of {self.category or 'all categories'}: {self.candidate_id}"
+
+    @classmethod
+    def build(cls, category, size, min_attempts):
+        # Replaces one board with the current top `size` candidates of at least `min_attempts` snapshots
+        top = (
+            CandidateScore.objects.filter(category=category, attempts__gte=min_attempts)
+            .order_by(*CandidateScore.RANKING)
+            .annotate(candidate_name=candidate_name())
+            .values_list('candidate_id', 'candidate_name', 'average_score', 'attempts')[:size]
+        )
+        now = timezone.now()
+        entries = [
+            cls(category=category, rank=rank, candidate_id=candidate_id, candidate_name=candidate_name or '',
+                average_score=average_score, attempts=attempts, built_at=now)
+            for rank, (candidate_id, candidate_name, average_score, attempts) in enumerate(top, start=1)
+        ]
+        with transaction.atomic():
+            cls.objects.filter(category=category).delete()
+            cls.objects.bulk_create(entries)
+        return entries
+
+    @classmethod
+    def build_all(cls, size, min_attempts):
+        # Rebuilds every board, and drops the boards of categories without candidates left. Returns {category: entries}
+        categories = list(CandidateScore.objects.order_by('category').values_list('category', flat=True).distinct())
+        built = {category: len(cls.build(category, size, min_attempts)) for category in categories}
+        cls.objects.exclude(category__in=categories).delete()
+        return built
+
+    class Meta:
+        db_table = 'leaderboard_entry'
+        verbose_name = 'Leaderboard Entry'
+        verbose_name_plural = 'Leaderboard Entries'
+        constraints = [
+            # Also the index pages are read from
+            models.UniqueConstraint(fields=['category', 'rank'], name='leaderboard_entry_rank_uniq'),
+            models.UniqueConstraint(fields=['category', 'candidate'], name='leaderboard_entry_candidate_uniq'),
+        ]
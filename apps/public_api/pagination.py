@@ -0,0 +1,205 @@
+import base64
+import binascii
+import json
+from contextlib import contextmanager
+from datetime import date, datetime
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.conf import settings
+from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import Q
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+from .counting import count_queryset, acount_queryset, EXACT
+
+CURSOR_PARAM = 'cursor'
+
+# Shared OpenAPI description of the cursor query parameter for the list endpoints
+CURSOR_PARAMETER = OpenApiParameter(
+    name=CURSOR_PARAM,
+    type=str,
+    location=OpenApiParameter.QUERY,
+    description=(
+        "Opt-in keyset pagination. Send an empty cursor for the first page, then the 'next' or 'prev' value "
+        "from a previous response. In cursor mode page is ignored and no total count is returned."
+    )
+)
+
+
+def paginate_queryset(request, queryset, ordering, default_page_size):
+    """
+    Paginates a list view queryset. Returns the items of the requested page and the
+    pagination keys to merge into the response body.
+
+    By default the classic page-number mode is used. When the `cursor` query parameter is
+    present the keyset mode is used instead: rows are located with a WHERE clause on the
+    ordering columns rather than an OFFSET scan, and the total count is skipped.
+    `ordering` must end with a unique column (usually '-id') so every row has a distinct key.
+
+    In page-number mode the total is computed with the count strategy configured for the
+    endpoint in PUBLIC_API_COUNT_STRATEGIES, and `count_is_exact` tells clients whether it
+    may be cached or estimated. page_size is capped at PUBLIC_API_MAX_PAGE_SIZE in both modes.
+    """
+    params = request.query_params
+    page_size = _parse_page_size(params.get('page_size', default_page_size))
+    queryset = queryset.order_by(*ordering)
+
+    if CURSOR_PARAM in params:
+        token = params[CURSOR_PARAM]
+        with _invalid_cursor():
+            window, backwards = _cursor_window(queryset, ordering, token, page_size)
+            items = list(window)
+        return _cursor_page(items, ordering, token, backwards, page_size)
+
+    count, count_is_exact = request_count(request, queryset)
+    window, meta = _page_window(queryset, page_size, count, count_is_exact, params.get('page', 1))
+    return list(window), meta
+
+
+async def apaginate_queryset(request, queryset, ordering, default_page_size):
+    # Async counterpart of paginate_queryset for the async views, same modes and response keys
+    params = request.GET
+    page_size = _parse_page_size(params.get('page_size', default_page_size))
+    queryset = queryset.order_by(*ordering)
+
+    if CURSOR_PARAM in params:
+        token = params[CURSOR_PARAM]
+        with _invalid_cursor():
+            window, backwards = _cursor_window(queryset, ordering, token, page_size)
+            items = [item async for item in window]
+        return _cursor_page(items, ordering, token, backwards, page_size)
+
+    count, count_is_exact = await arequest_count(request, queryset)
+    window, meta = _page_window(queryset, page_size, count, count_is_exact, params.get('page', 1))
+    return [item async for item in window], meta
+
+
+def request_count(request, queryset):
+    # Total of the request's filtered queryset, computed once per request with the endpoint's
+    # count strategy so the conditional GET validator and the paginator share it
+    http_request = getattr(request, '_request', request)
+    if not hasattr(http_request, '_public_api_count'):
+        http_request._public_api_count = count_queryset(queryset, _count_strategy(http_request))
+    return http_request._public_api_count
+
+
+async def arequest_count(request, queryset):
+    if not hasattr(request, '_public_api_count'):
+        request._public_api_count = await acount_queryset(queryset, _count_strategy(request))
+    return request._public_api_count
+
+
+def _count_strategy(request):
+    resolver_match = getattr(request, 'resolver_match', None)
+    url_name = resolver_match.url_name if resolver_match else None
+    return settings.PUBLIC_API_COUNT_STRATEGIES.get(url_name, EXACT)
+
+
+def _parse_page_size(page_size):
+    try:
+        page_size = int(page_size)
+    except (TypeError, ValueError):
+        raise ValidationError({'page_size': 'page_size must be a positive integer.'})
+    if page_size < 1:
+        raise ValidationError({'page_size': 'page_size must be a positive integer.'})
+    return min(page_size, settings.PUBLIC_API_MAX_PAGE_SIZE)
+
+
+def _page_window(queryset, page_size, count, count_is_exact, page):
+    # Slice of the requested page and the page-number pagination keys, without running a query
+    paginator = Paginator(queryset, page_size)
+    paginator.count = count
+    try:
+        number = paginator.validate_number(page)
+    except PageNotAnInteger:
+        number = 1
+    except EmptyPage:
+        # An approximate total must not hide the real last pages, so read the page anyway
+        number = paginator.num_pages if count_is_exact or int(page) < 1 else int(page)
+
+    offset = (number - 1) * paginator.per_page
+    return queryset[offset:offset + paginator.per_page], {
+        "count": paginator.count,
+        "count_is_exact": count_is_exact,
+        "num_pages": paginator.num_pages,
+        "current_page": number,
+    }
+
+
+@contextmanager
+def _invalid_cursor():
+    try:
+        yield
+    except (DjangoValidationError, TypeError, ValueError):
+        # Keys that decode but do not fit the ordering columns
+        raise ValidationError({CURSOR_PARAM: 'Invalid cursor.'})
+
+
+def _cursor_window(queryset, ordering, token, page_size):
+    backwards = False
+    if token:
+        backwards, keys = _decode_cursor(token, len(ordering))
+        queryset = queryset.filter(_keyset_filter(ordering, keys, backwards))
+    if backwards:
+        queryset = queryset.reverse()
+    # Fetch one extra row to find out whether another page exists in this direction
+    return queryset[:page_size + 1], backwards
+
+
+def _cursor_page(items, ordering, token, backwards, page_size):
+    has_more = len(items) > page_size
+    items = items[:page_size]
+    if backwards:
+        items.reverse()
+
+    next_cursor = prev_cursor = None
+    if items:
+        if has_more or backwards:
+            next_cursor = _encode_cursor(False, _row_keys(items[-1], ordering))
+        if (has_more and backwards) or (token and not backwards):
+            prev_cursor = _encode_cursor(True, _row_keys(items[0], ordering))
+
+    return items, {
+        "next": next_cursor,
+        "prev": prev_cursor,
+    }
+
+
+def _keyset_filter(ordering, keys, backwards):
+    # (a, b) after (x, y) in the ordering is: a past x, or a == x and b past y
+    condition = Q()
+    for position, field in enumerate(ordering):
+        name = field.lstrip('-')
+        descending = field.startswith('-') != backwards
+        equal_prefix = {ordering[i].lstrip('-'): keys[i] for i in range(position)}
+        condition |= Q(**equal_prefix, **{f"{name}__{'lt' if descending else 'gt'}": keys[position]})
+    return condition
+
+
+def _row_keys(item, ordering):
+    keys = []
+    for field in ordering:
+        # Model instances, or values() rows on the fast serialization path
+        value = item[field.lstrip('-')] if isinstance(item, dict) else getattr(item, field.lstrip('-'))
+        if isinstance(value, (datetime, date)):
+            # isoformat keeps microseconds, so no row is skipped or repeated on a boundary
+            value = value.isoformat()
+        keys.append(value)
+    return keys
+
+
+def _encode_cursor(backwards, keys):
+    payload = json.dumps({'d': 'prev' if backwards else 'next', 'k': keys}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def _decode_cursor(token, key_count):
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        direction, keys = payload['d'], payload['k']
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValidationError({CURSOR_PARAM: 'Invalid cursor.'})
+    if (direction not in ('next', 'prev') or not isinstance(keys, list) or len(keys) != key_count
+            or not all(isinstance(key, (str, int, float)) for key in keys)):
+        raise ValidationError({CURSOR_PARAM: 'Invalid cursor.'})
+    return direction == 'prev', keys
@@ -0,0 +1,86 @@
+import json
+import re
+
+# Secondary indexes the public endpoints rely on, by name: (table, columns), with '-' marking a
+# descending column. Created by migration 0003_query_indexes; `manage.py explain_queries --check`
+# fails when one of them is no longer used by any benchmark case, so remove entries the views
+# stop needing rather than letting them cost every write to the shared tables.
+QUERY_INDEXES = {
+    # list-user-feedback: issue_type='FB' AND public_display ORDER BY -create_date, -id
+    'UserFeedback_public_list_idx': ('UserFeedback', ('issue_type', 'public_display', '-create_date', '-id')),
+    # list-quiz-feedback and the export filtered by quiz, already in page order
+    'QuizFeedback_quiz_list_idx': ('QuizFeedback', ('quiz_id', '-create_date', '-id')),
+    # Unfiltered list-quiz-feedback pages and cursors
+    'QuizFeedback_list_idx': ('QuizFeedback', ('-create_date', '-id')),
+    # Hall of quiz: is_global=True. The ORDER BY on the LEFT JOINed QuizStats row still needs a sort.
+    'Quiz_global_idx': ('Quiz', ('is_global', 'id')),
+    # total_quiz_taken and average_score of the user stats, answered from the index alone
+    'quiz_result_snapshot_candidate_score_idx': ('quiz_result_snapshot', ('candidate_id', 'percentage_score')),
+}
+
+
+def explain(connection, sql):
+    """
+    Plan of one statement as {'cost', 'seq_scans', 'sorts', 'indexes'}: the estimated total cost
+    (None where the database gives none), the tables read in full, the sorts no index serves
+    and the names of the indexes used.
+    """
+    return PLAN_READERS[connection.vendor]().explain(connection, sql)
+
+
+class SQLitePlanReader:
+    # EXPLAIN QUERY PLAN rows read e.g. "SCAN UserFeedback", "SEARCH Quiz USING INDEX Quiz_global_idx (is_global=?)"
+    # or "USE TEMP B-TREE FOR ORDER BY". SQLite has no cost estimate.
+    scan = re.compile(r'^SCAN (\S+)')
+    index = re.compile(r'USING (?:AUTOMATIC )?(?:COVERING )?INDEX (\S+)')
+    sort = re.compile(r'^USE TEMP B-TREE FOR (.+)')
+
+    def explain(self, connection, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            details = [row[-1] for row in cursor.fetchall()]
+            tables = set(connection.introspection.table_names(cursor))
+
+        plan = {'cost': None, 'seq_scans': [], 'sorts': [], 'indexes': []}
+        for detail in details:
+            scan = self.scan.match(detail)
+            index = self.index.search(detail)
+            sort = self.sort.match(detail)
+            # Full scans of virtual tables (the FTS5 shadow tables), subquery results and SQLite's own
+            # catalog are not scans of the API's tables
+            if scan and not index and scan.group(1) in tables and not scan.group(1).startswith('sqlite_') \
+                    and 'VIRTUAL TABLE' not in detail:
+                plan['seq_scans'].append(scan.group(1))
+            if index:
+                plan['indexes'].append(index.group(1))
+            if sort:
+                plan['sorts'].append(sort.group(1))
+        return plan
+
+
+class PostgreSQLPlanReader:
+    def explain(self, connection, sql):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}')
+            result = cursor.fetchone()[0]
+        # psycopg decodes the json column, other drivers may hand back the text
+        root = (json.loads(result) if isinstance(result, str) else result)[0]['Plan']
+
+        plan = {'cost': root['Total Cost'], 'seq_scans': [], 'sorts': [], 'indexes': []}
+        nodes = [root]
+        while nodes:
+            node = nodes.pop()
+            nodes.extend(node.get('Plans', ()))
+            if node['Node Type'] == 'Seq Scan':
+                plan['seq_scans'].append(node['Relation Name'])
+            elif node['Node Type'] in ('Sort', 'Incremental Sort'):
+                plan['sorts'].append(', '.join(node['Sort Key']))
+            if 'Index Name' in node:
+                plan['indexes'].append(node['Index Name'])
+        return plan
+
+
+PLAN_READERS = {
+    'postgresql': PostgreSQLPlanReader,
+    'sqlite': SQLitePlanReader,
+}
@@ -0,0 +1,104 @@
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from apps.contract.models import Quiz, Question, AnswerOption
+
+QUIZ_CONTENT_FIELDS = (
+    'id', 'quiz_title', 'description', 'category', 'difficulty_level', 'number_of_questions', 'is_timed', 'time_limit',
+)
+
+
+def quiz_content_queryset():
+    # Quizzes, their questions and the questions' options in three queries, however many of each there are
+    return Quiz.objects.filter(is_global=True).only(*QUIZ_CONTENT_FIELDS).prefetch_related(
+        Prefetch('questions', queryset=Question.objects.only('id', 'quiz_id', 'text').order_by('id')),
+        Prefetch('questions__options', queryset=AnswerOption.objects.order_by('label', 'id')),
+    )
+
+
+def build_quiz_content(quiz):
+    return {
+        **{field: getattr(quiz, field) for field in QUIZ_CONTENT_FIELDS},
+        'questions': [
+            {
+                'id': question.id,
+                'text': question.text,
+                'options': [
+                    {'id': option.id, 'label': option.label, 'text': option.text, 'is_correct': option.is_correct}
+                    for option in question.options.all()
+                ],
+            }
+            for question in quiz.questions.all()
+        ],
+    }
+
+
+def get_quiz_content_many(quiz_ids):
+    """
+    Read-through cache of the content of Hall of Quiz quizzes, keyed by quiz id. Returns
+    {quiz_id: content} for the quizzes that exist; all cache misses are loaded together.
+    """
+    keys = {quiz_id: _cache_key(quiz_id) for quiz_id in quiz_ids}
+    cached = cache.get_many(list(keys.values()))
+    contents = {quiz_id: cached[key] for quiz_id, key in keys.items() if key in cached}
+    missing = [quiz_id for quiz_id in keys if quiz_id not in contents]
+
+    if missing:
+        computed = {quiz.id: build_quiz_content(quiz) for quiz in quiz_content_queryset().filter(id__in=missing)}
+        cache.set_many({keys[quiz_id]: content for quiz_id, content in computed.items()},
+                       settings.PUBLIC_API_QUIZ_CONTENT_CACHE_TTL)
+        contents.update(computed)
+    return contents
+
+
+def get_quiz_content_versions(quiz_ids):
+    """
+    Opaque version of the content of each quiz, {quiz_id: version}. It is replaced whenever the
+    quiz content is invalidated and at the latest after PUBLIC_API_QUIZ_CONTENT_CACHE_TTL, so it
+    validates get-quiz-detail responses without a query. Unknown versions start as new random ones.
+    """
+    keys = {quiz_id: _version_key(quiz_id) for quiz_id in quiz_ids}
+    cached = cache.get_many(list(keys.values()))
+    versions = {quiz_id: cached[key] for quiz_id, key in keys.items() if key in cached}
+    missing = {quiz_id: uuid.uuid4().hex for quiz_id in keys if quiz_id not in versions}
+    if missing:
+        cache.set_many({keys[quiz_id]: version for quiz_id, version in missing.items()},
+                       settings.PUBLIC_API_QUIZ_CONTENT_CACHE_TTL)
+        versions.update(missing)
+    return versions
+
+
+def without_answers(content):
+    # Copy of the content without is_correct on the options
+    return {
+        **content,
+        'questions': [
+            {
+                **question,
+                'options': [
+                    {key: value for key, value in option.items() if key != 'is_correct'}
+                    for option in question['options']
+                ],
+            }
+            for question in content['questions']
+        ],
+    }
+
+
+def invalidate_quiz_content(*quiz_ids):
+    # Delete once the write is committed so a concurrent reader cannot cache the old content again.
+    # The content version goes with it, so validators issued before the write stop matching.
+    quiz_ids = set(quiz_ids) - {None}
+    keys = [_cache_key(quiz_id) for quiz_id in quiz_ids] + [_version_key(quiz_id) for quiz_id in quiz_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def _cache_key(quiz_id):
+    return f"public_api:quiz_content:{quiz_id}"
+
+
+def _version_key(quiz_id):
+    return f"public_api:quiz_content_version:{quiz_id}"
@@ -0,0 +1,159 @@
+import itertools
+import logging
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from apps.health import metrics
+
+logger = logging.getLogger(__name__)
+
+# Replica aliases are the ones settings.py adds for PUBLIC_API_REPLICA_URLS
+REPLICA_PREFIX = 'replica_'
+
+# Replication lag in seconds, by vendor. A replica that is fully replayed is not behind, however
+# old its last transaction. Vendors without a query here are only checked for being reachable.
+LAG_QUERIES = {
+    'postgresql': (
+        "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+        "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    ),
+}
+
+# Read routing of the request being handled, set by ReplicaRoutingMiddleware
+current_scope = ContextVar('public_api_read_scope', default=None)
+
+
+def replica_aliases():
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX)]
+
+
+class ReadScope:
+    # The replica a request reads from, chosen on its first query and kept for the rest of the
+    # request, so its count, page and stats queries all see the same snapshot
+    def __init__(self):
+        self.alias = None
+
+
+class ReplicaPool:
+    """
+    Health and load of the replicas, per process. Each replica is checked at most every
+    PUBLIC_API_REPLICA_CHECK_INTERVAL seconds, on the connection of the request that needs the
+    answer. Replicas that cannot be queried, or are more than PUBLIC_API_REPLICA_MAX_LAG seconds
+    behind, are skipped until a later check passes; with none usable, reads go to the primary.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked = {}
+        self._healthy = {}
+        self._in_flight = {}
+        self._turns = itertools.count()
+
+    def acquire(self):
+        usable = [alias for alias in replica_aliases() if self.is_usable(alias)]
+        if not usable:
+            return DEFAULT_DB_ALIAS
+        with self._lock:
+            if settings.PUBLIC_API_REPLICA_STRATEGY == 'least_loaded':
+                # Fewest requests of this process reading from it, ties go round-robin
+                turn = next(self._turns) % len(usable)
+                alias = min(usable[turn:] + usable[:turn], key=lambda name: self._in_flight.get(name, 0))
+            else:
+                alias = usable[next(self._turns) % len(usable)]
+            self._in_flight[alias] = self._in_flight.get(alias, 0) + 1
+        return alias
+
+    def release(self, alias):
+        if alias == DEFAULT_DB_ALIAS:
+            return
+        with self._lock:
+            self._in_flight[alias] -= 1
+
+    def is_usable(self, alias):
+        now = time.monotonic()
+        if now - self._checked.get(alias, float('-inf')) >= settings.PUBLIC_API_REPLICA_CHECK_INTERVAL:
+            self._checked[alias] = now
+            self._healthy[alias] = self.check(alias)
+        return self._healthy[alias]
+
+    def check(self, alias):
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(LAG_QUERIES.get(connection.vendor, 'SELECT 0'))
+                lag = float(cursor.fetchone()[0] or 0)
+        except DatabaseError as exc:
+            logger.warning("Replica %s is unreachable, taking it out of rotation: %s", alias, exc)
+            metrics.REPLICA_FALLBACKS.labels(alias, 'unreachable').inc()
+            # Do not keep a broken connection around until the next check
+            connection.close()
+            return False
+        metrics.REPLICA_LAG.labels(alias).set(lag)
+        if lag > settings.PUBLIC_API_REPLICA_MAX_LAG:
+            logger.warning("Replica %s is %.1fs behind, taking it out of rotation", alias, lag)
+            metrics.REPLICA_FALLBACKS.labels(alias, 'lagging').inc()
+            return False
+        return True
+
+
+pool = ReplicaPool()
+
+
+@contextmanager
+def reading_from_replicas():
+    # Routes the reads of the block to a replica, chosen lazily so requests without queries pick none
+    scope = ReadScope()
+    token = current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        current_scope.reset(token)
+        if scope.alias is not None:
+            pool.release(scope.alias)
+
+
+@asynccontextmanager
+async def areading_from_replicas():
+    # The replica is chosen up front: a due health check queries the database, which cannot
+    # happen on the event loop where async views resolve queryset.db
+    scope = ReadScope()
+    scope.alias = await sync_to_async(pool.acquire)()
+    token = current_scope.set(scope)
+    try:
+        yield scope
+    finally:
+        current_scope.reset(token)
+        pool.release(scope.alias)
+
+
+class ReplicaRouter:
+    """
+    Sends reads made inside reading_from_replicas() (the public API's GET requests, see
+    ReplicaRoutingMiddleware) to a replica, and everything else, writes included, to the
+    primary. Management commands and signal handlers therefore keep reading their own writes.
+    """
+    def db_for_read(self, model, **hints):
+        scope = current_scope.get()
+        if scope is None:
+            return None
+        # Related objects are read from the database their instance came from
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if scope.alias is None:
+            scope.alias = pool.acquire()
+        return scope.alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication
+        return not db.startswith(REPLICA_PREFIX)
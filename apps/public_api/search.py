@@ -0,0 +1,85 @@
+from functools import reduce
+from operator import or_
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+# Text columns with a search index, by table. On PostgreSQL they get pg_trgm GIN indexes,
+# on SQLite an FTS5 shadow table named "<table>_search" (see migration 0002_search_indexes).
+SEARCH_COLUMNS = {
+    'UserFeedback': ('title', 'firstname', 'lastname', 'email'),
+    'QuizFeedback': ('title', 'firstname', 'lastname', 'email'),
+    'Quiz': ('quiz_title', 'category'),
+    'UserProfile': ('firstname', 'lastname'),
+}
+
+# The trigram tokenizer cannot match anything shorter than one trigram
+MIN_FTS_TERM_LENGTH = 3
+
+
+def text_search(queryset, fields, term):
+    """
+    Filters `queryset` to the rows where any of `fields` contains `term`, case-insensitively,
+    i.e. the same rows as OR-ed `icontains` lookups. Fields may span relations
+    (e.g. 'user__profile__firstname'). The backend is picked from the database vendor.
+    """
+    backend = SEARCH_BACKENDS.get(connections[queryset.db].vendor, IContainsSearchBackend)
+    return backend().filter(queryset, fields, term)
+
+
+class IContainsSearchBackend:
+    def filter(self, queryset, fields, term):
+        return queryset.filter(reduce(or_, (Q(**{f'{field}__icontains': term}) for field in fields)))
+
+
+class TrigramSearchBackend(IContainsSearchBackend):
+    # PostgreSQL compiles icontains to UPPER(column) LIKE UPPER(%term%), which the
+    # GIN (UPPER(column) gin_trgm_ops) indexes serve directly, so the query is unchanged.
+    pass
+
+
+class SQLiteFTSSearchBackend(IContainsSearchBackend):
+    # Looks terms up in the FTS5 trigram shadow tables and falls back to icontains
+    # for short terms and for columns without a shadow table.
+    _available_tables = {}
+
+    def filter(self, queryset, fields, term):
+        if len(term) < MIN_FTS_TERM_LENGTH:
+            return super().filter(queryset, fields, term)
+
+        grouped, plain = {}, []
+        for field in fields:
+            prefix, table, column = self._resolve(queryset.model, field)
+            if column in SEARCH_COLUMNS.get(table, ()) and self._has_shadow_table(queryset.db, table):
+                grouped.setdefault((prefix, table), []).append(column)
+            else:
+                plain.append(field)
+
+        conditions = [Q(**{f'{field}__icontains': term}) for field in plain]
+        for (prefix, table), columns in grouped.items():
+            match = f'{{{" ".join(columns)}}} : "{term.replace(chr(34), chr(34) * 2)}"'
+            rowids = RawSQL(f'SELECT rowid FROM "{table}_search" WHERE "{table}_search" MATCH %s', [match])
+            conditions.append(Q(**{f'{prefix}pk__in': rowids}))
+        return queryset.filter(reduce(or_, conditions))
+
+    def _resolve(self, model, field):
+        # 'user__profile__firstname' on Quiz -> ('user__profile__', 'UserProfile', 'firstname')
+        *relations, name = field.split('__')
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        column = model._meta.get_field(name).column
+        prefix = ''.join(f'{relation}__' for relation in relations)
+        return prefix, model._meta.db_table, column
+
+    def _has_shadow_table(self, using, table):
+        key = (using, table)
+        if key not in self._available_tables:
+            with connections[using].cursor() as cursor:
+                self._available_tables[key] = f'{table}_search' in connections[using].introspection.table_names(cursor)
+        return self._available_tables[key]
+
+
+SEARCH_BACKENDS = {
+    'postgresql': TrigramSearchBackend,
+    'sqlite': SQLiteFTSSearchBackend,
+}
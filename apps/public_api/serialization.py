@@ -0,0 +1,139 @@
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from .fieldsets import sparse_queryset
+from .instrumentation import timed
+from .pagination import paginate_queryset, apaginate_queryset
+
+
+class ValuesSerializer:
+    """
+    Produces the output of a list ModelSerializer from QuerySet.values() rows, without creating
+    a model instance and a field traversal per row. Each field gets a converter compiled once
+    that mirrors its to_representation; fields without a known fast converter call the DRF
+    field itself, so the output stays identical (see the benchmark_serialization command).
+
+    SerializerMethodFields are called with the row wrapped in an object exposing its columns,
+    which must be declared in the serializer's Meta.field_sources.
+    """
+    def __init__(self, serializer_class, fields=None):
+        self.serializer = serializer_class(fields=fields)
+        field_sources = getattr(serializer_class.Meta, 'field_sources', {})
+        self.columns = []
+        self.plan = []
+        for name, field in self.serializer.fields.items():
+            if isinstance(field, serializers.SerializerMethodField):
+                self.columns.extend(field_sources[name])
+                self.plan.append((name, None, getattr(self.serializer, field.method_name)))
+            else:
+                self.columns.append(field.source)
+                self.plan.append((name, field.source, _converter(field)))
+
+    def values(self, queryset, ordering=()):
+        # The columns the fields read plus the ordering ones, which cursor pagination reads back
+        columns = self.columns + [field.lstrip('-') for field in ordering]
+        return queryset.values(*dict.fromkeys(columns))
+
+    def serialize(self, rows):
+        return [self.serialize_row(row) for row in rows]
+
+    def serialize_row(self, row):
+        data = {}
+        for name, source, convert in self.plan:
+            if source is None:
+                data[name] = convert(_Row(row))
+            else:
+                value = row[source]
+                data[name] = None if value is None else convert(value)
+        return data
+
+
+class _Row:
+    # Attribute access to a values() row, for SerializerMethodField methods
+    __slots__ = ('_values',)
+
+    def __init__(self, values):
+        self._values = values
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+def _converter(field):
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.ChoiceField):
+        if all(isinstance(key, str) for key in field.choices):
+            return str
+    elif isinstance(field, serializers.CharField):
+        return str
+    elif isinstance(field, serializers.BooleanField):
+        return bool
+    elif isinstance(field, serializers.IntegerField):
+        return int
+    elif isinstance(field, serializers.FloatField):
+        return float
+    elif isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        # values() already returns the related pk
+        return _identity
+    return field.to_representation
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != 'iso-8601':
+        return field.to_representation
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+
+    def convert(value):
+        # DateTimeField.to_representation for aware values in ISO 8601, the common case
+        if isinstance(value, str):
+            return value
+        if field_timezone is not None and value.utcoffset() is not None:
+            value = value.astimezone(field_timezone)
+        else:
+            value = field.enforce_timezone(value)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+
+    return convert
+
+
+def _identity(value):
+    return value
+
+
+def serialize_page(request, queryset, serializer_class, fields, ordering, default_page_size):
+    """
+    Paginates `queryset` and serializes the page with `serializer_class` limited to `fields`,
+    through ValuesSerializer when PUBLIC_API_FAST_SERIALIZATION is on. Returns the results and
+    the pagination keys.
+    """
+    if settings.PUBLIC_API_FAST_SERIALIZATION:
+        serializer = ValuesSerializer(serializer_class, fields)
+        page, pagination = paginate_queryset(request, serializer.values(queryset, ordering), ordering, default_page_size)
+        with timed('serialize'):
+            return serializer.serialize(page), pagination
+
+    queryset = sparse_queryset(queryset, serializer_class, fields, ordering)
+    page, pagination = paginate_queryset(request, queryset, ordering, default_page_size)
+    with timed('serialize'):
+        return serializer_class(page, many=True, fields=fields).data, pagination
+
+
+async def aserialize_page(request, queryset, serializer_class, fields, ordering, default_page_size):
+    if settings.PUBLIC_API_FAST_SERIALIZATION:
+        serializer = ValuesSerializer(serializer_class, fields)
+        page, pagination = await apaginate_queryset(request, serializer.values(queryset, ordering), ordering, default_page_size)
+        with timed('serialize'):
+            return serializer.serialize(page), pagination
+
+    queryset = sparse_queryset(queryset, serializer_class, fields, ordering)
+    page, pagination = await apaginate_queryset(request, queryset, ordering, default_page_size)
+    with timed('serialize'):
+        return serializer_class(page, many=True, fields=fields).data, pagination
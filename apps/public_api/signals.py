@@ -0,0 +1,159 @@
+from collections import Counter
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from apps.contract.models import (
+    Quiz, Question, AnswerOption, QuizSubmission, QuizFeedback, QuizResultSnapshot, Flashcard, UserProfile,
+)
+from .models import CandidateScore, QuizActivity, QuizStats
+from .quiz_content import invalidate_quiz_content
+from .user_stats import invalidate_user_stats
+
+
+def bump_quiz_stats(quiz_id, create=True, **deltas):
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if quiz_id is None or not deltas:
+        return
+
+    updated = QuizStats.objects.filter(quiz_id=quiz_id).update(
+        updated_at=timezone.now(),
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    # First write for a quiz without a stats row: build it from the source tables,
+    # which already include the row being saved. Deletes never create rows because
+    # the quiz itself may be going away in the same cascade.
+    if not updated and create:
+        QuizStats.rebuild([quiz_id])
+
+
+@receiver(post_save, sender=Quiz)
+def create_quiz_stats(sender, instance, created, **kwargs):
+    if created:
+        QuizStats.objects.get_or_create(quiz=instance)
+
+
+# Columns the counters and cached quiz content depend on, by model
+TRACKED_FIELDS = {
+    QuizSubmission: ('quiz_id',),
+    QuizFeedback: ('quiz_id', 'rating'),
+    QuizResultSnapshot: ('candidate_id', 'quiz_category', 'percentage_score'),
+    Question: ('quiz_id',),
+    AnswerOption: ('question_id',),
+}
+
+
+@receiver(pre_save, sender=QuizSubmission)
+@receiver(pre_save, sender=QuizFeedback)
+@receiver(pre_save, sender=QuizResultSnapshot)
+@receiver(pre_save, sender=Question)
+@receiver(pre_save, sender=AnswerOption)
+def remember_previous_values(sender, instance, **kwargs):
+    # Updates can move a row to another quiz or change its rating, so keep the stored values around
+    instance._stats_previous = None
+    if instance.pk is not None:
+        instance._stats_previous = sender.objects.filter(pk=instance.pk).values(*TRACKED_FIELDS[sender]).first()
+
+
+@receiver(post_save, sender=QuizSubmission)
+def count_submission(sender, instance, **kwargs):
+    previous = getattr(instance, '_stats_previous', None)
+    if previous is None:
+        bump_quiz_stats(instance.quiz_id, attempts=1)
+        QuizActivity.bump(instance.quiz_id, instance.completion_date, 1)
+    elif previous['quiz_id'] != instance.quiz_id:
+        bump_quiz_stats(previous['quiz_id'], create=False, attempts=-1)
+        bump_quiz_stats(instance.quiz_id, attempts=1)
+        QuizActivity.bump(previous['quiz_id'], instance.completion_date, -1)
+        QuizActivity.bump(instance.quiz_id, instance.completion_date, 1)
+
+
+@receiver(post_delete, sender=QuizSubmission)
+def uncount_submission(sender, instance, **kwargs):
+    bump_quiz_stats(instance.quiz_id, create=False, attempts=-1)
+    QuizActivity.bump(instance.quiz_id, instance.completion_date, -1)
+
+
+def rating_deltas(rating, sign=1):
+    # Counter changes of adding (sign=1) or removing (sign=-1) one rating
+    deltas = Counter(rating_sum=sign * rating, rating_count=sign)
+    field = QuizStats.histogram_field(rating)
+    if field is not None:
+        deltas[field] += sign
+    return deltas
+
+
+@receiver(post_save, sender=QuizFeedback)
+def count_feedback(sender, instance, **kwargs):
+    previous = getattr(instance, '_stats_previous', None)
+    if previous is None:
+        bump_quiz_stats(instance.quiz_id, **rating_deltas(instance.rating))
+    elif previous['quiz_id'] != instance.quiz_id:
+        bump_quiz_stats(previous['quiz_id'], create=False, **rating_deltas(previous['rating'], -1))
+        bump_quiz_stats(instance.quiz_id, **rating_deltas(instance.rating))
+    else:
+        # Counter.update adds, so an unchanged rating nets out to no change
+        deltas = rating_deltas(instance.rating)
+        deltas.update(rating_deltas(previous['rating'], -1))
+        bump_quiz_stats(instance.quiz_id, **deltas)
+
+
+@receiver(post_delete, sender=QuizFeedback)
+def uncount_feedback(sender, instance, **kwargs):
+    bump_quiz_stats(instance.quiz_id, create=False, **rating_deltas(instance.rating, -1))
+
+
+@receiver(post_save, sender=QuizResultSnapshot)
+def count_result(sender, instance, **kwargs):
+    previous = getattr(instance, '_stats_previous', None)
+    current = {field: getattr(instance, field) for field in TRACKED_FIELDS[sender]}
+    if previous != current:
+        if previous is not None:
+            CandidateScore.bump(previous['candidate_id'], previous['quiz_category'], previous['percentage_score'], -1)
+            invalidate_user_stats(previous['candidate_id'])
+        CandidateScore.bump(instance.candidate_id, instance.quiz_category, instance.percentage_score, 1)
+    invalidate_user_stats(instance.candidate_id)
+
+
+@receiver(post_delete, sender=QuizResultSnapshot)
+def uncount_result(sender, instance, **kwargs):
+    CandidateScore.bump(instance.candidate_id, instance.quiz_category, instance.percentage_score, -1)
+    invalidate_user_stats(instance.candidate_id)
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+@receiver(post_save, sender=Flashcard)
+@receiver(post_delete, sender=Flashcard)
+def invalidate_owner_stats(sender, instance, **kwargs):
+    # An owner change only invalidates the new owner, the previous one ages out with the TTL
+    invalidate_user_stats(instance.user_id)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def invalidate_profile(sender, instance, **kwargs):
+    # The profile is part of the user info responses, whose version is dropped with the stats
+    invalidate_user_stats(instance.user_id)
+
+
+@receiver(post_save, sender=Quiz)
+@receiver(post_delete, sender=Quiz)
+def invalidate_quiz(sender, instance, **kwargs):
+    invalidate_quiz_content(instance.pk)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def invalidate_question(sender, instance, **kwargs):
+    # A question moved to another quiz changes both
+    previous = getattr(instance, '_stats_previous', None) or {}
+    invalidate_quiz_content(instance.quiz_id, previous.get('quiz_id'))
+
+
+@receiver(post_save, sender=AnswerOption)
+@receiver(post_delete, sender=AnswerOption)
+def invalidate_answer_option(sender, instance, **kwargs):
+    previous = getattr(instance, '_stats_previous', None) or {}
+    question_ids = {instance.question_id, previous.get('question_id')} - {None}
+    invalidate_quiz_content(*Question.objects.filter(pk__in=question_ids).values_list('quiz_id', flat=True))
@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from apps.contract.models import User, UserProfile, Quiz, QuizFeedback
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='ann', email='ann@example.com')
+        UserProfile.objects.create(user=cls.user, firstname='Ann', lastname='Lee')
+        cls.quiz = Quiz.objects.create(user=cls.user, quiz_title='Quiz', category='science', is_global=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client.defaults.update(HTTP_X_API_KEY=settings.API_KEY, HTTP_X_CACHE_BYPASS='1')
+        # (URL name, parameters of a successful request, parameters of a 400)
+        self.endpoints = [
+            ('list-quizzes-in-hallofquiz', {}, {'sort': 'nope'}),
+            ('list-quiz-feedback', {}, {'fields': 'nope'}),
+            ('list-user-feedback', {}, {'page_size': '0'}),
+            ('list-leaderboard', {}, {'fields': 'nope'}),
+            ('get-user-info', {'user_id': self.user.pk}, {}),
+            ('get-user-info-batch', {'username': 'ann'}, {'user_id': 'x'}),
+            ('get-quiz-rating-summary', {'quiz_id': self.quiz.pk}, {'quiz_id': 'x'}),
+            ('get-quiz-detail', {'quiz_id': self.quiz.pk}, {'quiz_id': 'x'}),
+        ]
+
+    def test_matching_etag_gets_304(self):
+        for url_name, params, _ in self.endpoints:
+            with self.subTest(url_name):
+                response = self.client.get(reverse(url_name), params)
+                self.assertEqual(response.status_code, 200)
+                response = self.client.get(reverse(url_name), params, HTTP_IF_NONE_MATCH=response['ETag'])
+                self.assertEqual(response.status_code, 304)
+
+    def test_error_responses_carry_no_validators(self):
+        for url_name, _, params in self.endpoints:
+            with self.subTest(url_name):
+                response = self.client.get(reverse(url_name), params)
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.has_header('ETag'))
+                self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_write_changes_the_etag(self):
+        cases = [
+            ('list-quiz-feedback', {}),
+            ('get-quiz-rating-summary', {'quiz_id': self.quiz.pk}),
+        ]
+        etags = {url_name: self.client.get(reverse(url_name), params)['ETag'] for url_name, params in cases}
+        with self.captureOnCommitCallbacks(execute=True):
+            QuizFeedback.objects.create(user=self.user, quiz=self.quiz, title='Nice', message='Nice', rating=5,
+                                        firstname='Ann', lastname='Lee', email='ann@example.com')
+        for url_name, params in cases:
+            with self.subTest(url_name):
+                response = self.client.get(reverse(url_name), params, HTTP_IF_NONE_MATCH=etags[url_name])
+                self.assertEqual(response.status_code, 200)
+
+        etag = self.client.get(reverse('get-user-info'), {'user_id': self.user.pk})['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            UserProfile.objects.filter(user=self.user).get().save()
+        response = self.client.get(reverse('get-user-info'), {'user_id': self.user.pk}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from apps.contract.models import User, Quiz
+from apps.public_api.counting import count_queryset, CACHED, ESTIMATE, EXACT
+
+
+class CountStrategyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='ann', email='ann@example.com')
+        for i in range(4):
+            Quiz.objects.create(user=cls.user, quiz_title=f'Quiz {i}', category='science', is_global=i % 2 == 0)
+
+    def setUp(self):
+        cache.clear()
+
+    def add_quiz(self):
+        Quiz.objects.create(user=self.user, quiz_title='Another', category='science', is_global=True)
+
+    def test_exact_counts_every_time(self):
+        self.assertEqual(count_queryset(Quiz.objects.filter(is_global=True), EXACT), (2, True))
+        self.add_quiz()
+        self.assertEqual(count_queryset(Quiz.objects.filter(is_global=True), EXACT), (3, True))
+
+    def test_cached_count_is_reused_for_the_same_filters(self):
+        self.assertEqual(count_queryset(Quiz.objects.filter(is_global=True, category='science'), CACHED), (2, True))
+        self.add_quiz()
+        # Same WHERE clause in another order: the cached total, flagged as not exact
+        with self.assertNumQueries(0):
+            self.assertEqual(count_queryset(Quiz.objects.filter(category='science').filter(is_global=True), CACHED),
+                             (2, False))
+        self.assertEqual(count_queryset(Quiz.objects.filter(is_global=False), CACHED), (2, True))
+
+    def test_estimate_needs_statistics_and_an_unfiltered_queryset(self):
+        # No statistics yet: an exact count
+        self.assertEqual(count_queryset(Quiz.objects.all(), ESTIMATE), (4, True))
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        with override_settings(PUBLIC_API_COUNT_ESTIMATE_THRESHOLD=1):
+            self.assertEqual(count_queryset(Quiz.objects.all(), ESTIMATE), (4, False))
+        # Below the threshold the table is small enough to count
+        self.assertEqual(count_queryset(Quiz.objects.all(), ESTIMATE), (4, True))
+        # Filtered querysets use the cached strategy
+        self.assertEqual(count_queryset(Quiz.objects.filter(is_global=True), ESTIMATE), (2, True))
+        self.assertEqual(count_queryset(Quiz.objects.filter(is_global=True), ESTIMATE), (2, False))
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            count_queryset(Quiz.objects.all(), 'guess')
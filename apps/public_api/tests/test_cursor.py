@@ -0,0 +1,64 @@
+import datetime
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from apps.contract.models import User, Quiz, QuizFeedback
+from apps.public_api.models import QuizStats
+
+
+class CursorPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username='ann', email='ann@example.com')
+        # Repeated attempts and create dates, so pages break inside runs of equal leading keys
+        created = timezone.now() - datetime.timedelta(days=1)
+        for i in range(11):
+            quiz = Quiz.objects.create(user=user, quiz_title=f'Quiz {i}', category='science', is_global=True)
+            QuizStats.objects.filter(quiz=quiz).update(attempts=i % 3)
+            feedback = QuizFeedback.objects.create(user=user, quiz=quiz, title=f'Feedback {i}', message='Nice',
+                                                   rating=3, firstname='Ann', lastname='Lee', email='ann@example.com')
+            QuizFeedback.objects.filter(pk=feedback.pk).update(
+                create_date=created + datetime.timedelta(microseconds=i // 4)
+            )
+
+    def setUp(self):
+        self.client.defaults.update(HTTP_X_API_KEY=settings.API_KEY, HTTP_X_CACHE_BYPASS='1')
+
+    def get(self, url_name, cursor):
+        response = self.client.get(reverse(url_name), {'cursor': cursor, 'page_size': 3})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def keys(self, url_name, body):
+        # Quiz feedback has no id in its output, its titles are unique here
+        key = 'id' if url_name == 'list-quizzes-in-hallofquiz' else 'title'
+        return [row[key] for row in body['results']]
+
+    def test_cursors_walk_every_row_once_in_both_directions(self):
+        for url_name in ('list-quizzes-in-hallofquiz', 'list-quiz-feedback'):
+            with self.subTest(url_name):
+                expected = self.keys(url_name, self.client.get(reverse(url_name), {'page_size': 100}).json())
+                self.assertEqual(len(expected), 11)
+
+                pages, cursor = [], ''
+                while cursor is not None:
+                    body = self.get(url_name, cursor)
+                    pages.append((cursor, self.keys(url_name, body)))
+                    cursor = body['next']
+                self.assertEqual([key for _, keys in pages for key in keys], expected)
+                self.assertIsNone(self.get(url_name, '')['prev'])
+
+                # Going back from the last page returns the same pages in reverse
+                body = self.get(url_name, pages[-1][0])
+                for _, keys in reversed(pages[:-1]):
+                    body = self.get(url_name, body['prev'])
+                    self.assertEqual(self.keys(url_name, body), keys)
+                self.assertIsNone(body['prev'])
+
+    def test_invalid_cursor_is_rejected(self):
+        for cursor in ('nope', 'eyJkIjoibmV4dCJ9', 'eyJkIjoibmV4dCIsImsiOlsieCIsInkiXX0'):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(reverse('list-quizzes-in-hallofquiz'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('cursor', response.json())
@@ -0,0 +1,38 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from apps.contract.models import User, UserFeedback
+
+HEADERS = {'X-API-KEY': settings.API_KEY, 'X-Cache-Bypass': '1'}
+
+
+class ExportStreamingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username='author', email='author@example.com')
+        for i in range(5):
+            UserFeedback.objects.create(
+                user=user, issue_type=UserFeedback.FEEDBACK, public_display=True, title=f'Feedback {i}',
+                message='Nice', rating=i, firstname='First', lastname='Last', email='author@example.com',
+            )
+
+    async def test_asgi_streams_the_same_rows_from_an_async_iterator(self):
+        url = reverse('export-user-feedback')
+        for output in ('ndjson', 'csv'):
+            with self.subTest(output=output):
+                response = await self.async_client.get(url, {'output': output}, headers=HEADERS)
+                # A sync iterator would be read to the end before the first byte is sent
+                self.assertTrue(response.is_async)
+                body = b''.join([chunk async for chunk in response.streaming_content])
+
+                expected = await self.sync_export(url, output)
+                self.assertEqual(body, expected)
+                self.assertEqual(len(body.splitlines()), 6 if output == 'csv' else 5)
+
+    async def sync_export(self, url, output):
+        def get():
+            response = self.client.get(url, {'output': output}, headers=HEADERS)
+            self.assertFalse(response.is_async)
+            return b''.join(response.streaming_content)
+        return await sync_to_async(get)()
@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from apps.contract.models import User, UserProfile, Quiz, QuizFeedback
+from apps.public_api.ListQuizFeedback import QuizFeedbackSerializer
+from apps.public_api.fieldsets import sparse_queryset
+
+
+class SparseFieldsetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username='ann', email='ann@example.com')
+        UserProfile.objects.create(user=user, firstname='Ann', lastname='Lee')
+        quiz = Quiz.objects.create(user=user, quiz_title='Quiz', category='science', is_global=True)
+        QuizFeedback.objects.create(user=user, quiz=quiz, title='Nice', message='Nice quiz', rating=4,
+                                    firstname='Ann', lastname='Lee', email='ann@example.com')
+
+    def setUp(self):
+        self.client.defaults.update(HTTP_X_API_KEY=settings.API_KEY, HTTP_X_CACHE_BYPASS='1')
+
+    def results(self, url_name, params):
+        response = self.client.get(reverse(url_name), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_fields_and_exclude_pick_the_output_keys(self):
+        url_name = 'list-quiz-feedback'
+        every = list(self.results(url_name, {})[0])
+        self.assertEqual(list(self.results(url_name, {'fields': 'rating,full_name'})[0]),
+                         [name for name in every if name in ('rating', 'full_name')])
+        self.assertEqual(list(self.results(url_name, {'fields': ['rating', 'title']})[0]),
+                         [name for name in every if name in ('rating', 'title')])
+        self.assertEqual(list(self.results(url_name, {'exclude': 'message,email'})[0]),
+                         [name for name in every if name not in ('message', 'email')])
+        self.assertEqual(list(self.results(url_name, {'fields': 'rating,title', 'exclude': 'title'})[0]), ['rating'])
+        self.assertEqual(self.results(url_name, {'fields': 'full_name'})[0], {'full_name': 'Ann Lee'})
+
+    def test_hall_of_quiz_annotations_can_be_selected(self):
+        results = self.results('list-quizzes-in-hallofquiz', {'fields': 'quiz_title,attempts,creator_name'})
+        self.assertEqual(results, [{'quiz_title': 'Quiz', 'attempts': 0, 'creator_name': 'Ann Lee'}])
+
+    def test_unknown_fields_are_rejected(self):
+        for params in ({'fields': 'rating,nope'}, {'exclude': 'nope'}):
+            with self.subTest(**params):
+                response = self.client.get(reverse('list-quiz-feedback'), params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('nope', str(response.json()))
+
+    def test_unselected_columns_are_not_fetched(self):
+        feedback = sparse_queryset(QuizFeedback.objects.all(), QuizFeedbackSerializer, ['full_name'], ('-id',)).get()
+        self.assertEqual(feedback.get_deferred_fields() & {'firstname', 'lastname', 'id'}, set())
+        self.assertIn('message', feedback.get_deferred_fields())
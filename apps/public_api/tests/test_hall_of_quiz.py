@@ -0,0 +1,51 @@
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from apps.contract.models import User, UserProfile, Quiz, QuizSubmission
+from apps.public_api.models import QuizStats
+
+
+class HallOfQuizQueryCountTests(TestCase):
+    # Validator (count + aggregates) and page query; the page size must not add queries
+    QUERIES = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(30):
+            user = User.objects.create(username=f'creator{i}', email=f'creator{i}@example.com')
+            # Every other creator has no profile
+            if i % 2:
+                UserProfile.objects.create(user=user, firstname=f'First{i}', lastname=f'Last{i}')
+            quiz = Quiz.objects.create(user=user, quiz_title=f'Quiz {i}', category='science', is_global=True)
+            for _ in range(i % 4):
+                QuizSubmission.objects.create(
+                    quiz=quiz, quiz_title=quiz.quiz_title, candidate_name='Candidate', candidate_id=user.pk,
+                    percentage_score=50, number_of_correct=5, total_number_of_questions=10,
+                )
+
+    def setUp(self):
+        self.client.defaults.update(HTTP_X_API_KEY=settings.API_KEY, HTTP_X_CACHE_BYPASS='1')
+        self.url = reverse('list-quizzes-in-hallofquiz')
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        for page_size in (1, 100):
+            with self.subTest(page_size=page_size), self.assertNumQueries(self.QUERIES):
+                response = self.client.get(self.url, {'page_size': page_size})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.json()['results']), min(page_size, 30))
+
+    def test_creator_without_profile_has_empty_name(self):
+        response = self.client.get(self.url, {'page_size': 100})
+        names = {quiz['quiz_title']: quiz['creator_name'] for quiz in response.json()['results']}
+        self.assertEqual(names['Quiz 0'], '')
+        self.assertEqual(names['Quiz 1'], 'First1 Last1')
+
+    def test_quiz_without_stats_row_is_listed(self):
+        # Quizzes written by other services have no QuizStats row until it is reconciled
+        quiz = Quiz.objects.get(quiz_title='Quiz 3')
+        QuizStats.objects.filter(quiz=quiz).delete()
+        response = self.client.get(self.url, {'page_size': 100})
+        results = {row['quiz_title']: row for row in response.json()['results']}
+        self.assertEqual(len(results), 30)
+        self.assertEqual(results['Quiz 3']['attempts'], 0)
+        self.assertIsNone(results['Quiz 3']['average_rating'])
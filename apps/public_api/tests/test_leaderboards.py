@@ -0,0 +1,145 @@
+from io import StringIO
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from apps.contract.models import User, UserProfile, QuizResultSnapshot
+from apps.public_api.models import CandidateScore, LeaderboardEntry
+
+
+def snapshot(candidate, category, score):
+    return QuizResultSnapshot.objects.create(
+        candidate=candidate, quiz_id=1, quiz_title='Quiz', quiz_submission_id=1, quiz_category=category,
+        quiz_creator_name='Ann Lee', quiz_creator_id=candidate.pk, percentage_score=score, number_of_correct=1,
+        total_number_of_questions=2,
+    )
+
+
+def scores():
+    return set(CandidateScore.objects.values_list('candidate_id', 'category', 'score_sum', 'attempts', 'average_score'))
+
+
+class CandidateScoreSignalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ann = User.objects.create(username='ann', email='ann@example.com')
+        cls.bob = User.objects.create(username='bob', email='bob@example.com')
+
+    def test_snapshots_are_counted_overall_and_in_their_category(self):
+        first = snapshot(self.ann, 'science', 80)
+        snapshot(self.ann, 'history', 50)
+        self.assertEqual(scores(), {
+            (self.ann.pk, CandidateScore.OVERALL, 130, 2, 65.0),
+            (self.ann.pk, 'science', 80, 1, 80.0),
+            (self.ann.pk, 'history', 50, 1, 50.0),
+        })
+
+        first.percentage_score = 90
+        first.quiz_category = 'history'
+        first.save()
+        self.assertEqual(scores(), {
+            (self.ann.pk, CandidateScore.OVERALL, 140, 2, 70.0),
+            (self.ann.pk, 'science', 0, 0, None),
+            (self.ann.pk, 'history', 140, 2, 70.0),
+        })
+
+        first.candidate = self.bob
+        first.save()
+        first.delete()
+        snapshot(self.bob, '', 40)
+        self.assertEqual(scores(), {
+            (self.ann.pk, CandidateScore.OVERALL, 50, 1, 50.0),
+            (self.ann.pk, 'science', 0, 0, None),
+            (self.ann.pk, 'history', 50, 1, 50.0),
+            (self.bob.pk, CandidateScore.OVERALL, 40, 1, 40.0),
+            (self.bob.pk, 'history', 0, 0, None),
+        })
+
+    def test_rebuild_matches_the_running_totals(self):
+        for candidate, category, score in ((self.ann, 'science', 70), (self.ann, 'science', 75),
+                                           (self.bob, 'history', 33), (self.bob, '', 20)):
+            snapshot(candidate, category, score)
+        counted = scores()
+        CandidateScore.rebuild()
+        self.assertEqual(scores(), counted)
+
+
+@override_settings(PUBLIC_API_LEADERBOARD_SIZE=3, PUBLIC_API_LEADERBOARD_MIN_ATTEMPTS=2)
+class LeaderboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {}
+        # Overall: b (85 over 3), then a and c (85 over 2, a has the lower id), then d (70) outside the top 3.
+        # e has too few results. In science b also has 85 over 2, so ids decide: a, b, c.
+        results = {
+            'a': [('science', 90), ('science', 80)],
+            'b': [('science', 85), ('science', 85), ('history', 85)],
+            'c': [('science', 85), ('science', 85)],
+            'd': [('science', 70), ('science', 70)],
+            'e': [('science', 100)],
+        }
+        for name, snapshots in results.items():
+            user = User.objects.create(username=name, email=f'{name}@example.com')
+            UserProfile.objects.create(user=user, firstname=name.upper(), lastname='Lee')
+            for category, score in snapshots:
+                snapshot(user, category, score)
+            cls.users[name] = user
+        call_command('build_leaderboards', stdout=StringIO())
+
+    def setUp(self):
+        cache.clear()
+        self.client.defaults.update(HTTP_X_API_KEY=settings.API_KEY, HTTP_X_CACHE_BYPASS='1')
+
+    def board(self, **params):
+        response = self.client.get(reverse('list-leaderboard'), params)
+        self.assertEqual(response.status_code, 200)
+        names = {user.pk: name for name, user in self.users.items()}
+        return [(row['rank'], names[row['candidate']]) for row in response.json()['results']]
+
+    def rank(self, name, **params):
+        return self.client.get(reverse('get-leaderboard-rank'), {'user_id': self.users[name].pk, **params})
+
+    def test_boards_rank_by_average_then_attempts_then_id(self):
+        self.assertEqual(self.board(), [(1, 'b'), (2, 'a'), (3, 'c')])
+        self.assertEqual(self.board(category='science'), [(1, 'a'), (2, 'b'), (3, 'c')])
+        # b is the only candidate in history and has a single result there
+        self.assertEqual(self.board(category='history'), [])
+        self.assertEqual(self.board(page_size=2, cursor=''), [(1, 'b'), (2, 'a')])
+
+    def test_rank_of_a_candidate_on_the_board(self):
+        response = self.rank('c')
+        self.assertEqual(response.json(), {
+            'candidate': self.users['c'].pk, 'candidate_name': 'C Lee', 'category': '', 'rank': 3,
+            'average_score': 85.0, 'attempts': 2, 'on_leaderboard': True,
+        })
+
+    def test_rank_off_the_board_is_counted_from_the_running_totals(self):
+        # Below the top 3, or below the minimum number of results: no rank
+        for name in ('d', 'e'):
+            with self.subTest(name):
+                body = self.rank(name).json()
+                self.assertEqual((body['rank'], body['on_leaderboard']), (None, False))
+
+        # A candidate who passed everyone since the last build
+        newcomer = User.objects.create(username='f', email='f@example.com')
+        self.users['f'] = newcomer
+        snapshot(newcomer, 'science', 95)
+        snapshot(newcomer, 'science', 95)
+        body = self.rank('f', category='science').json()
+        self.assertEqual((body['rank'], body['on_leaderboard'], body['candidate_name']), (1, False, ''))
+        self.assertEqual(self.rank('d', category='science').json()['rank'], None)
+
+        call_command('build_leaderboards', stdout=StringIO())
+        self.assertEqual(self.board(category='science'), [(1, 'f'), (2, 'a'), (3, 'b')])
+
+    def test_rank_errors(self):
+        self.assertEqual(self.rank('a', category='history').status_code, 404)
+        for params in ({}, {'user_id': 'x'}):
+            with self.subTest(**params):
+                self.assertEqual(self.client.get(reverse('get-leaderboard-rank'), params).status_code, 400)
+
+    def test_boards_are_emptied_when_their_results_are_gone(self):
+        QuizResultSnapshot.objects.filter(quiz_category='science').delete()
+        LeaderboardEntry.build_all(size=3, min_attempts=1)
+        self.assertEqual(set(LeaderboardEntry.objects.values_list('category', flat=True)), {'', 'history'})
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from apps.contract.models import User, Quiz
+
+
+class PageSizeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username='creator', email='creator@example.com')
+        for i in range(8):
+            Quiz.objects.create(user=user, quiz_title=f'Quiz {i}', category='science', is_global=True)
+
+    def setUp(self):
+        self.client.defaults.update(HTTP_X_API_KEY=settings.API_KEY, HTTP_X_CACHE_BYPASS='1')
+
+    def test_invalid_page_size_is_rejected(self):
+        for url_name in ('list-quizzes-in-hallofquiz', 'list-leaderboard'):
+            for page_size in ('abc', '0', '-3'):
+                for params in ({}, {'cursor': ''}):
+                    with self.subTest(url_name=url_name, page_size=page_size, **params):
+                        response = self.client.get(reverse(url_name), {'page_size': page_size, **params})
+                        self.assertEqual(response.status_code, 400)
+                        self.assertIn('page_size', response.json())
+
+    @override_settings(PUBLIC_API_MAX_PAGE_SIZE=5)
+    def test_page_size_is_capped(self):
+        url = reverse('list-quizzes-in-hallofquiz')
+        response = self.client.get(url, {'page_size': 10000000})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 5)
+        self.assertEqual(response.json()['num_pages'], 2)
+
+        response = self.client.get(url, {'page_size': 10000000, 'cursor': ''})
+        self.assertEqual(len(response.json()['results']), 5)
+        self.assertIsNotNone(response.json()['next'])
@@ -0,0 +1,118 @@
+import datetime
+from collections import Counter
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from apps.contract.models import User, Quiz, QuizSubmission
+from apps.public_api.models import QuizActivity, QuizStats
+
+HOUR = datetime.timedelta(hours=1)
+DAY = datetime.timedelta(days=1)
+
+
+class QuizActivityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='ann', email='ann@example.com')
+        cls.quiz = Quiz.objects.create(user=cls.user, quiz_title='Quiz', category='science', is_global=True)
+        cls.other = Quiz.objects.create(user=cls.user, quiz_title='Other', category='science', is_global=True)
+
+    def submit(self, quiz):
+        return QuizSubmission.objects.create(
+            quiz=quiz, quiz_title=quiz.quiz_title, candidate_name='Ann Lee', candidate_id=self.user.pk,
+            percentage_score=50, number_of_correct=1, total_number_of_questions=2,
+        )
+
+    def buckets(self):
+        return set(QuizActivity.objects.values_list('quiz_id', 'granularity', 'bucket_start', 'submissions'))
+
+    def hour_of(self, submission):
+        return QuizActivity.floor(submission.completion_date, QuizActivity.HOUR)
+
+    def test_submissions_are_counted_in_their_hour(self):
+        first = self.submit(self.quiz)
+        second = self.submit(self.quiz)
+        # Both usually share an hour, unless the test runs across the turn of one
+        hours = Counter([self.hour_of(first), self.hour_of(second)])
+        self.assertEqual(self.buckets(),
+                         {(self.quiz.pk, QuizActivity.HOUR, hour, count) for hour, count in hours.items()})
+
+        second.quiz = self.other
+        second.save()
+        self.assertEqual(self.buckets(), {
+            (self.quiz.pk, QuizActivity.HOUR, self.hour_of(first), 1),
+            (self.other.pk, QuizActivity.HOUR, self.hour_of(second), 1),
+        })
+
+        second.delete()
+        self.assertEqual(QuizActivity.objects.get(quiz=self.other).submissions, 0)
+
+    def test_rebuild_matches_the_counted_buckets(self):
+        for quiz in (self.quiz, self.quiz, self.other):
+            self.submit(quiz)
+        counted = {bucket for bucket in self.buckets() if bucket[-1]}
+        QuizActivity.rebuild()
+        self.assertEqual(self.buckets(), counted)
+
+    def test_compaction_rolls_old_hours_into_days_and_drops_expired_buckets(self):
+        now = timezone.now()
+        old = QuizActivity.floor(now - DAY * 3, QuizActivity.DAY)
+        expired = QuizActivity.floor(now - DAY * 40, QuizActivity.DAY)
+        recent = QuizActivity.floor(now - HOUR, QuizActivity.HOUR)
+        QuizActivity.objects.bulk_create([
+            QuizActivity(quiz=self.quiz, granularity=QuizActivity.HOUR, bucket_start=old + HOUR, submissions=2),
+            QuizActivity(quiz=self.quiz, granularity=QuizActivity.HOUR, bucket_start=old + HOUR * 5, submissions=3),
+            QuizActivity(quiz=self.quiz, granularity=QuizActivity.HOUR, bucket_start=expired, submissions=7),
+            QuizActivity(quiz=self.quiz, granularity=QuizActivity.HOUR, bucket_start=recent, submissions=1),
+        ])
+        self.assertEqual(QuizActivity.compact(now), (3, 1, 0))
+        self.assertEqual(self.buckets(), {
+            (self.quiz.pk, QuizActivity.DAY, old, 5),
+            (self.quiz.pk, QuizActivity.HOUR, recent, 1),
+        })
+
+        # A submission of a compacted hour counts in its day, one of a dropped day is not counted back
+        QuizActivity.bump(self.quiz.pk, old + HOUR * 2, 1)
+        QuizActivity.bump(self.quiz.pk, expired, -1)
+        self.assertEqual(QuizActivity.objects.get(granularity=QuizActivity.DAY).submissions, 6)
+        self.assertEqual(QuizActivity.objects.count(), 2)
+
+        # Compacting again adds to the existing day
+        QuizActivity.objects.create(quiz=self.quiz, granularity=QuizActivity.HOUR, bucket_start=old, submissions=4)
+        QuizActivity.compact(now)
+        self.assertEqual(QuizActivity.objects.get(granularity=QuizActivity.DAY).submissions, 10)
+
+
+class TrendingSortTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username='ann', email='ann@example.com')
+        now = timezone.now()
+        # (all-time attempts, submissions in the last hours, submissions 3 days ago)
+        activity = {'Classic': (50, 0, 10), 'Rising': (5, 4, 0), 'Steady': (20, 2, 2)}
+        for title, (attempts, last_hours, days_ago) in activity.items():
+            quiz = Quiz.objects.create(user=user, quiz_title=title, category='science', is_global=True)
+            QuizStats.objects.filter(quiz=quiz).update(attempts=attempts)
+            QuizActivity.objects.create(quiz=quiz, granularity=QuizActivity.HOUR, submissions=last_hours,
+                                        bucket_start=QuizActivity.floor(now - HOUR, QuizActivity.HOUR))
+            QuizActivity.objects.create(quiz=quiz, granularity=QuizActivity.DAY, submissions=days_ago,
+                                        bucket_start=QuizActivity.floor(now - DAY * 3, QuizActivity.DAY))
+
+    def setUp(self):
+        self.client.defaults.update(HTTP_X_API_KEY=settings.API_KEY, HTTP_X_CACHE_BYPASS='1')
+
+    def listing(self, **params):
+        response = self.client.get(reverse('list-quizzes-in-hallofquiz'), params)
+        self.assertEqual(response.status_code, 200)
+        return [(row['quiz_title'], row.get('recent_attempts')) for row in response.json()['results']]
+
+    def test_trending_sorts_by_attempts_in_the_window(self):
+        self.assertEqual([title for title, _ in self.listing()], ['Classic', 'Steady', 'Rising'])
+        self.assertEqual(self.listing(sort='trending', window='24h'), [('Rising', 4), ('Steady', 2), ('Classic', 0)])
+        self.assertEqual(self.listing(sort='trending', window='7d'), [('Classic', 10), ('Steady', 4), ('Rising', 4)])
+
+    def test_unknown_sort_or_window_is_rejected(self):
+        for params in ({'sort': 'newest'}, {'sort': 'trending', 'window': '1y'}):
+            with self.subTest(**params):
+                self.assertEqual(self.client.get(reverse('list-quizzes-in-hallofquiz'), params).status_code, 400)
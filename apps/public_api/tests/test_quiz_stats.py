@@ -0,0 +1,88 @@
+from django.test import TestCase
+from apps.contract.models import User, Quiz, QuizSubmission, QuizFeedback
+from apps.public_api.models import QuizStats
+
+
+class QuizStatsSignalTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='ann', email='ann@example.com')
+        cls.quiz = Quiz.objects.create(user=cls.user, quiz_title='Quiz', category='science', is_global=True)
+        cls.other = Quiz.objects.create(user=cls.user, quiz_title='Other', category='science', is_global=True)
+
+    def submit(self, quiz):
+        return QuizSubmission.objects.create(
+            quiz=quiz, quiz_title=quiz.quiz_title, candidate_name='Ann Lee', candidate_id=self.user.pk,
+            percentage_score=50, number_of_correct=1, total_number_of_questions=2,
+        )
+
+    def rate(self, quiz, rating):
+        return QuizFeedback.objects.create(user=self.user, quiz=quiz, title='Feedback', message='Nice', rating=rating,
+                                           firstname='Ann', lastname='Lee', email='ann@example.com')
+
+    def assertStatsMatchSourceTables(self):
+        expected = QuizStats.compute([self.quiz.pk, self.other.pk])
+        for quiz_id, counters in expected.items():
+            with self.subTest(quiz_id=quiz_id):
+                stats = QuizStats.objects.get(quiz_id=quiz_id)
+                self.assertEqual(tuple(getattr(stats, field) for field in QuizStats.COUNTERS), counters)
+
+    def test_new_quiz_gets_empty_stats(self):
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        self.assertEqual(stats.attempts, 0)
+        self.assertIsNone(stats.average_rating)
+
+    def test_submissions_are_counted(self):
+        submission = self.submit(self.quiz)
+        self.submit(self.quiz)
+        self.assertEqual(QuizStats.objects.get(quiz=self.quiz).attempts, 2)
+
+        submission.quiz = self.other
+        submission.save()
+        self.assertEqual(QuizStats.objects.get(quiz=self.quiz).attempts, 1)
+        self.assertEqual(QuizStats.objects.get(quiz=self.other).attempts, 1)
+
+        # Saving without a change counts nothing
+        submission.save()
+        self.assertEqual(QuizStats.objects.get(quiz=self.other).attempts, 1)
+
+        submission.delete()
+        self.assertEqual(QuizStats.objects.get(quiz=self.other).attempts, 0)
+        self.assertStatsMatchSourceTables()
+
+    def test_ratings_are_counted(self):
+        feedback = self.rate(self.quiz, 4)
+        self.rate(self.quiz, 2)
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        self.assertEqual((stats.rating_sum, stats.rating_count, stats.ratings_4, stats.ratings_2), (6, 2, 1, 1))
+        self.assertEqual(stats.average_rating, 3)
+
+        feedback.rating = 5
+        feedback.save()
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        self.assertEqual((stats.rating_sum, stats.rating_count, stats.ratings_4, stats.ratings_5), (7, 2, 0, 1))
+
+        feedback.quiz = self.other
+        feedback.rating = 1
+        feedback.save()
+        self.assertStatsMatchSourceTables()
+
+        feedback.delete()
+        self.assertStatsMatchSourceTables()
+
+    def test_rating_outside_the_histogram_only_counts_in_the_average(self):
+        self.rate(self.quiz, 9)
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        self.assertEqual((stats.rating_sum, stats.rating_count), (9, 1))
+        self.assertEqual(sum(getattr(stats, field) for field in QuizStats.HISTOGRAM_FIELDS), 0)
+
+    def test_missing_stats_row_is_rebuilt_on_the_next_write(self):
+        self.submit(self.quiz)
+        QuizStats.objects.filter(quiz=self.quiz).delete()
+        self.submit(self.quiz)
+        self.assertEqual(QuizStats.objects.get(quiz=self.quiz).attempts, 2)
+
+        # Deletes do not create rows
+        QuizStats.objects.filter(quiz=self.quiz).delete()
+        QuizSubmission.objects.filter(quiz=self.quiz).first().delete()
+        self.assertFalse(QuizStats.objects.filter(quiz=self.quiz).exists())
@@ -0,0 +1,44 @@
+import datetime
+import json
+from decimal import Decimal
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from apps.public_api.renderers import FastJSONRenderer
+
+DATA = {
+    'results': [
+        {
+            'id': 1, 'title': 'Café   "quoted" \\ <tag>', 'rating': 4, 'average_rating': 3.3333333333333335,
+            'average_score': 0.1, 'create_date': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456,
+                                                                   tzinfo=datetime.timezone.utc),
+            'naive_date': datetime.datetime(2024, 5, 1, 12, 30), 'day': datetime.date(2024, 5, 1),
+            'time': datetime.time(8, 15, 30, 500), 'price': Decimal('12.50'), 'label': gettext_lazy('Quiz'),
+            'description': None, 'is_global': True, 'tags': [], 'emoji': '\U0001f600',
+            'separators': 'line\u2028paragraph\u2029',
+        },
+    ],
+    'count': 1, 'next': None, 'num_pages': 1, 'negative': -3.5,
+}
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    def test_output_is_identical_to_json_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(DATA), JSONRenderer().render(DATA))
+
+    def test_indented_output_is_identical_to_json_renderer(self):
+        for accepted in ('application/json; indent=2', 'application/json; indent=0'):
+            with self.subTest(accepted=accepted):
+                self.assertEqual(FastJSONRenderer().render(DATA, accepted),
+                                 JSONRenderer().render(DATA, accepted))
+
+    def test_values_orjson_rejects_use_json_renderer(self):
+        data = {'big': 2 ** 70, 'values': [1, 2]}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_exponent_floats_keep_their_value(self):
+        data = {'values': [1e20, 1.5e-7, 1e-05]}
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+    def test_empty_data(self):
+        self.assertEqual(FastJSONRenderer().render(None), b'')
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+from apps.contract.models import User, Quiz
+from PublicDataAPI.middleware import ResponseCacheMiddleware
+
+
+class ResponseCacheKeyTests(SimpleTestCase):
+    def key(self, query, **headers):
+        request = RequestFactory().get(f'/api/public/list-quizzes-in-hallofquiz/?{query}', headers=headers)
+        return ResponseCacheMiddleware.cache_key(request)
+
+    def test_parameter_order_and_empty_values_do_not_split_entries(self):
+        key = self.key('category=science&page=2')
+        self.assertEqual(self.key('page=2&category=science'), key)
+        self.assertEqual(self.key('page=2&title=&category=science'), key)
+        self.assertNotEqual(self.key('category=science&page=3'), key)
+        self.assertNotEqual(self.key('category=science'), key)
+
+    def test_repeated_parameters_keep_their_order(self):
+        self.assertNotEqual(self.key('fields=a&fields=b'), self.key('fields=b&fields=a'))
+        self.assertEqual(self.key('page=1&fields=a&fields=b'), self.key('fields=a&page=1&fields=b'))
+
+    def test_representation_headers_split_entries(self):
+        key = self.key('page=1')
+        self.assertNotEqual(self.key('page=1', accept='text/csv'), key)
+        self.assertNotEqual(self.key('page=1', accept_encoding='gzip'), key)
+        # Only the negotiated encoding counts, not how the header spells it
+        self.assertEqual(self.key('page=1', accept_encoding='gzip;q=0.9, identity'),
+                         self.key('page=1', accept_encoding='gzip'))
+
+    def test_path_splits_entries(self):
+        request = RequestFactory().get('/api/public/list-quiz-feedback/?page=1')
+        self.assertNotEqual(ResponseCacheMiddleware.cache_key(request), self.key('page=1'))
+
+
+class ResponseCacheMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(username='ann', email='ann@example.com')
+        Quiz.objects.create(user=user, quiz_title='Quiz', category='science', is_global=True)
+
+    def setUp(self):
+        cache.clear()
+        self.client.defaults.update(HTTP_X_API_KEY=settings.API_KEY)
+        self.url = reverse('list-quizzes-in-hallofquiz')
+
+    def test_hits_are_served_from_the_cache(self):
+        first = self.client.get(self.url, {'category': 'science', 'page': 1})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url, {'page': 1, 'category': 'science', 'title': ''})
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+        response = self.client.get(self.url, {'page': 1, 'category': 'science'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual((response.status_code, response['X-Cache']), (304, 'HIT'))
+
+    def test_clients_can_skip_the_cache(self):
+        self.client.get(self.url)
+        self.assertEqual(self.client.get(self.url, HTTP_CACHE_CONTROL='no-cache')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.url, HTTP_X_CACHE_BYPASS='1')['X-Cache'], 'BYPASS')
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            response = self.client.get(self.url, {'sort': 'nope'})
+            self.assertEqual((response.status_code, response['X-Cache']), (400, 'MISS'))
@@ -0,0 +1,118 @@
+from unittest import mock
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from apps.contract.models import Quiz
+from apps.public_api import routers
+from apps.public_api.routers import ReplicaPool, ReplicaRouter, current_scope, reading_from_replicas
+from PublicDataAPI.middleware import ReplicaRoutingMiddleware
+
+REPLICAS = ['replica_1', 'replica_2']
+
+
+@override_settings(PUBLIC_API_REPLICA_STRATEGY='round_robin', PUBLIC_API_REPLICA_CHECK_INTERVAL=60)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.healthy = set(REPLICAS)
+        patches = [
+            mock.patch.object(routers, 'replica_aliases', return_value=REPLICAS),
+            mock.patch.object(routers, 'pool', ReplicaPool()),
+            mock.patch.object(ReplicaPool, 'check', autospec=True,
+                              side_effect=lambda pool, alias: alias in self.healthy),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.router = ReplicaRouter()
+
+    def test_reads_outside_a_request_and_writes_use_the_primary(self):
+        self.assertIsNone(self.router.db_for_read(Quiz))
+        with reading_from_replicas():
+            self.assertEqual(self.router.db_for_write(Quiz), DEFAULT_DB_ALIAS)
+
+    def test_a_request_keeps_its_replica_and_releases_it(self):
+        with reading_from_replicas() as scope:
+            alias = self.router.db_for_read(Quiz)
+            self.assertIn(alias, REPLICAS)
+            self.assertEqual(self.router.db_for_read(Quiz), alias)
+            self.assertEqual(routers.pool._in_flight[alias], 1)
+        self.assertEqual(scope.alias, alias)
+        self.assertEqual(routers.pool._in_flight[alias], 0)
+        self.assertIsNone(current_scope.get())
+
+    def test_requests_without_reads_pick_no_replica(self):
+        with reading_from_replicas() as scope:
+            pass
+        self.assertIsNone(scope.alias)
+        ReplicaPool.check.assert_not_called()
+
+    def test_related_objects_are_read_from_their_instance_database(self):
+        instance = Quiz()
+        instance._state.db = 'replica_2'
+        with reading_from_replicas():
+            self.assertEqual(self.router.db_for_read(Quiz, instance=instance), 'replica_2')
+
+    def test_round_robin(self):
+        aliases = []
+        for _ in range(4):
+            with reading_from_replicas():
+                aliases.append(self.router.db_for_read(Quiz))
+        self.assertEqual(aliases, REPLICAS * 2)
+
+    @override_settings(PUBLIC_API_REPLICA_STRATEGY='least_loaded')
+    def test_least_loaded(self):
+        with reading_from_replicas():
+            busy = self.router.db_for_read(Quiz)
+            for _ in range(3):
+                with reading_from_replicas():
+                    self.assertNotEqual(self.router.db_for_read(Quiz), busy)
+
+    def test_unhealthy_replicas_are_skipped_until_checked_again(self):
+        self.healthy = {'replica_2'}
+        for _ in range(3):
+            with reading_from_replicas():
+                self.assertEqual(self.router.db_for_read(Quiz), 'replica_2')
+        # Each replica was checked once within the interval
+        self.assertEqual(ReplicaPool.check.call_count, 2)
+
+        self.healthy = set()
+        with override_settings(PUBLIC_API_REPLICA_CHECK_INTERVAL=0), reading_from_replicas():
+            self.assertEqual(self.router.db_for_read(Quiz), DEFAULT_DB_ALIAS)
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica_1', 'public_api'))
+        self.assertTrue(self.router.allow_migrate(DEFAULT_DB_ALIAS, 'public_api'))
+
+
+class ReplicaHealthCheckTests(TestCase):
+    # The checks run their query on the primary here, which is never behind
+    def test_reachable_replica_within_the_lag_is_usable(self):
+        self.assertTrue(ReplicaPool().check(DEFAULT_DB_ALIAS))
+
+    @override_settings(PUBLIC_API_REPLICA_MAX_LAG=-1)
+    def test_lagging_replica_is_not_usable(self):
+        with self.assertLogs(routers.logger, 'WARNING') as logs:
+            self.assertFalse(ReplicaPool().check(DEFAULT_DB_ALIAS))
+        self.assertIn('behind', logs.output[0])
+
+    def test_unreachable_replica_is_not_usable(self):
+        with mock.patch('django.db.backends.utils.CursorWrapper.execute', side_effect=DatabaseError('gone')), \
+                mock.patch.object(connections[DEFAULT_DB_ALIAS], 'close') as close, \
+                self.assertLogs(routers.logger, 'WARNING') as logs:
+            self.assertFalse(ReplicaPool().check(DEFAULT_DB_ALIAS))
+        self.assertIn('unreachable', logs.output[0])
+        close.assert_called_once()
+
+
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    def scope_seen_by_view(self, method):
+        seen = []
+        with mock.patch('PublicDataAPI.middleware.replica_aliases', return_value=REPLICAS):
+            middleware = ReplicaRoutingMiddleware(lambda request: seen.append(current_scope.get()))
+        middleware(RequestFactory().generic(method, '/api/public/list-quizzes-in-hallofquiz/'))
+        return seen[0]
+
+    def test_only_reads_are_routed(self):
+        for method in ReplicaRoutingMiddleware.READ_METHODS:
+            with self.subTest(method=method):
+                self.assertIsNotNone(self.scope_seen_by_view(method))
+        self.assertIsNone(self.scope_seen_by_view('POST'))
@@ -0,0 +1,44 @@
+from django.test import TestCase
+from apps.contract.models import User, UserProfile, Quiz, QuizFeedback
+from apps.public_api.search import text_search, IContainsSearchBackend
+
+TERMS = ('an', 'ann', 'ANN', 'Lee', 'astro', 'omy', 'l@ex', 'say "hi"', 'zzz')
+
+
+class TextSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        people = (('Ann', 'Lee'), ('Joanna', 'Smith'), ('Bob', 'Leeds'))
+        for i, (firstname, lastname) in enumerate(people):
+            user = User.objects.create(username=f'user{i}', email=f'user{i}@example.com')
+            UserProfile.objects.create(user=user, firstname=firstname, lastname=lastname)
+            quiz = Quiz.objects.create(user=user, quiz_title=('Astronomy', 'Say "hi"', 'Anatomy')[i],
+                                       category=('science', 'language', 'biology')[i], is_global=True)
+            QuizFeedback.objects.create(user=user, quiz=quiz, title=f'Feedback on {quiz.quiz_title}', message='Nice',
+                                        rating=3, firstname=firstname, lastname=lastname,
+                                        email=f'{firstname}l@example.com')
+
+    def assertSameRowsAsIContains(self, queryset, fields):
+        for term in TERMS:
+            with self.subTest(model=queryset.model.__name__, fields=fields, term=term):
+                expected = set(IContainsSearchBackend().filter(queryset, fields, term).values_list('pk', flat=True))
+                self.assertEqual(set(text_search(queryset, fields, term).values_list('pk', flat=True)), expected)
+
+    def test_search_matches_icontains(self):
+        self.assertSameRowsAsIContains(Quiz.objects.all(), ['quiz_title'])
+        self.assertSameRowsAsIContains(Quiz.objects.all(), ['user__profile__firstname', 'user__profile__lastname'])
+        self.assertSameRowsAsIContains(QuizFeedback.objects.all(), ['title'])
+        self.assertSameRowsAsIContains(QuizFeedback.objects.all(), ['firstname', 'lastname'])
+        self.assertSameRowsAsIContains(QuizFeedback.objects.all(), ['email', 'message'])
+
+    def test_search_follows_updates_and_deletes(self):
+        quiz = Quiz.objects.get(quiz_title='Astronomy')
+        quiz.quiz_title = 'Geology'
+        quiz.save()
+        self.assertFalse(text_search(Quiz.objects.all(), ['quiz_title'], 'astro').exists())
+        self.assertEqual(list(text_search(Quiz.objects.all(), ['quiz_title'], 'geolo')), [quiz])
+
+        QuizFeedback.objects.filter(quiz=quiz).delete()
+        quiz.delete()
+        self.assertFalse(text_search(Quiz.objects.all(), ['quiz_title'], 'geolo').exists())
+        self.assertSameRowsAsIContains(Quiz.objects.all(), ['quiz_title'])
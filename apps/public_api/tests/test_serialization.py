@@ -0,0 +1,60 @@
+from django.http import QueryDict
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from apps.contract.models import User, UserProfile, Quiz, QuizFeedback, UserFeedback
+from apps.public_api import ListUserFeedback, ListQuizFeedback, ListQuizzesInHallOfQuiz
+from apps.public_api.fieldsets import requested_fields, sparse_queryset
+from apps.public_api.serialization import ValuesSerializer
+
+
+def hall_of_quiz_queryset():
+    quizzes = ListQuizzesInHallOfQuiz.filter_global_quizzes({})
+    return ListQuizzesInHallOfQuiz.with_creator_name(ListQuizzesInHallOfQuiz.with_quiz_stats(quizzes))
+
+
+# (serializer, queryset builder, ordering, query strings selecting the fields besides all of them)
+ENDPOINTS = (
+    (ListUserFeedback.UserFeedbackSerializer, lambda: ListUserFeedback.filter_user_feedback({}),
+     ListUserFeedback.ORDERING, ('fields=full_name', 'fields=title,rating', 'exclude=message,email')),
+    (ListQuizFeedback.QuizFeedbackSerializer, lambda: ListQuizFeedback.filter_quiz_feedback({}),
+     ListQuizFeedback.ORDERING, ('fields=quiz,create_date', 'fields=full_name,email', 'exclude=quiz,message')),
+    (ListQuizzesInHallOfQuiz.QuizSerializer, hall_of_quiz_queryset, ListQuizzesInHallOfQuiz.ORDERING,
+     ('fields=quiz_title,attempts,creator_name', 'fields=id,create_date,time_limit,average_rating',
+      'exclude=description,user,creator_name')),
+)
+
+
+class ValuesSerializerParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(6):
+            user = User.objects.create(username=f'user{i}', email=f'user{i}@example.com')
+            # Creators without a profile get an empty creator_name
+            if i % 2:
+                UserProfile.objects.create(user=user, firstname=f'First{i}', lastname=f'Last{i}')
+            quiz = Quiz.objects.create(
+                user=user, quiz_title=f'Quiz {i}', category='science', is_global=True,
+                description=None if i % 3 else 'About quiz', time_limit=None if i % 2 else 12.5,
+                difficulty_level=('Easy', 'Medium', 'Hard')[i % 3],
+            )
+            QuizFeedback.objects.create(
+                user=user, quiz=quiz, title=f'Feedback {i}', message='Nice', rating=i % 6,
+                firstname='' if i == 0 else f'First{i}', lastname=f'Last{i}', email=f'user{i}@example.com',
+            )
+            UserFeedback.objects.create(
+                user=user, issue_type=UserFeedback.FEEDBACK, public_display=True, title=f'Feedback {i}',
+                message='Nice', rating=i % 6, firstname=f'First{i}', lastname='' if i == 0 else f'Last{i}',
+                email=f'user{i}@example.com',
+            )
+
+    def test_values_output_is_identical_to_serializer(self):
+        renderer = JSONRenderer()
+        for serializer_class, build, ordering, fieldsets in ENDPOINTS:
+            for query in ('', *fieldsets):
+                fields = requested_fields(QueryDict(query), serializer_class)
+                with self.subTest(serializer=serializer_class.__name__, query=query):
+                    instances = sparse_queryset(build(), serializer_class, fields, ordering).order_by(*ordering)
+                    expected = renderer.render(serializer_class(instances, many=True, fields=fields).data)
+                    values = ValuesSerializer(serializer_class, fields)
+                    actual = renderer.render(values.serialize(values.values(build(), ordering).order_by(*ordering)))
+                    self.assertEqual(actual, expected)
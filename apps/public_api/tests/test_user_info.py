@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from apps.contract.models import User, UserProfile, Quiz, Flashcard
+
+
+class UserInfoTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='ann', email='ann@example.com')
+        UserProfile.objects.create(user=cls.user, firstname='Ann', lastname='Lee', bio='Hi')
+        Quiz.objects.create(user=cls.user, quiz_title='Quiz', category='science')
+
+    def setUp(self):
+        cache.clear()
+        self.client.defaults.update(HTTP_X_API_KEY=settings.API_KEY, HTTP_X_CACHE_BYPASS='1')
+        self.url = reverse('get-user-info')
+
+    def test_user_id_lookup_takes_one_query_on_a_stats_miss_and_a_hit(self):
+        for attempt in ('miss', 'hit'):
+            with self.subTest(attempt=attempt), self.assertNumQueries(1):
+                response = self.client.get(self.url, {'user_id': self.user.pk})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json(), {
+                'firstname': 'Ann', 'lastname': 'Lee', 'bio': 'Hi', 'total_quiz_taken': 0,
+                'average_score': 0.0, 'total_quizzes_owned': 1, 'total_flashcards_owned': 0,
+            })
+
+    def test_cached_stats_are_dropped_on_write(self):
+        self.client.get(self.url, {'user_id': self.user.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            Flashcard.objects.create(user=self.user)
+        response = self.client.get(self.url, {'username': 'ann'})
+        self.assertEqual(response.json()['total_flashcards_owned'], 1)
+
+    def test_unknown_user(self):
+        for params in ({'user_id': 999999}, {'email': 'nobody@example.com'}):
+            with self.subTest(**params):
+                self.assertEqual(self.client.get(self.url, params).status_code, 404)
+
+
+class UserInfoBatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='ann', email='ann@example.com')
+        UserProfile.objects.create(user=cls.user, firstname='Ann', lastname='Lee')
+
+    def setUp(self):
+        cache.clear()
+        self.client.defaults.update(HTTP_X_API_KEY=settings.API_KEY, HTTP_X_CACHE_BYPASS='1')
+        self.url = reverse('get-user-info-batch')
+
+    def test_user_ids_match_whatever_their_spelling(self):
+        response = self.client.get(self.url, {'user_id': f'0{self.user.pk},999999', 'email': 'ann@example.com'})
+        body = response.json()
+        self.assertEqual([(row['lookup'], row['value']) for row in body['results']],
+                         [('user_id', f'0{self.user.pk}'), ('email', 'ann@example.com')])
+        self.assertEqual(body['not_found'], [{'lookup': 'user_id', 'value': '999999'}])
+
+    def test_non_integer_user_id_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {'user_id': '+1'}).status_code, 400)
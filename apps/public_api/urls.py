@@ -1,10 +1,31 @@
+from django.conf import settings
 from django.urls import path
-from . import GetUserInformation, ListQuizzesInHallOfQuiz,ListUserFeedback,ListQuizFeedback
+from . import GetUserInformation, GetUserInformationBatch, ListQuizzesInHallOfQuiz,ListUserFeedback,ListQuizFeedback, ExportPublicData, GetQuizRatingSummary, GetQuizDetail, Leaderboards
 
 urlpatterns = [
     path('get-user-info/', GetUserInformation.get_user_info, name='get-user-info'),
+    path('get-user-info-batch/', GetUserInformationBatch.get_user_info_batch, name='get-user-info-batch'),
     path('list-quizzes-in-hallofquiz/', ListQuizzesInHallOfQuiz.list_quizzes_in_hallofquiz, name='list-quizzes-in-hallofquiz'),
     path('list-user-feedback/', ListUserFeedback.list_user_feedback, name='list-user-feedback'),
     path('list-quiz-feedback/', ListQuizFeedback.list_quiz_feedback, name='list-quiz-feedback'),
+    path('get-quiz-rating-summary/', GetQuizRatingSummary.get_quiz_rating_summary, name='get-quiz-rating-summary'),
+    path('get-quiz-detail/', GetQuizDetail.get_quiz_detail, name='get-quiz-detail'),
+    path('list-leaderboard/', Leaderboards.list_leaderboard, name='list-leaderboard'),
+    path('get-leaderboard-rank/', Leaderboards.get_leaderboard_rank, name='get-leaderboard-rank'),
+    path('export-user-feedback/', ExportPublicData.export_user_feedback, name='export-user-feedback'),
+    path('export-quiz-feedback/', ExportPublicData.export_quiz_feedback, name='export-quiz-feedback'),
+    path('export-quizzes/', ExportPublicData.export_quizzes, name='export-quizzes'),
     
 ]
+
+if settings.PUBLIC_API_ASYNC_VIEWS:
+    from . import AsyncPublicData
+
+    # Matched first, so the async views serve these paths. The DRF patterns above stay in place
+    # for drf-spectacular, which only documents DRF views.
+    urlpatterns = [
+        path('get-user-info/', AsyncPublicData.get_user_info, name='get-user-info'),
+        path('list-quizzes-in-hallofquiz/', AsyncPublicData.list_quizzes_in_hallofquiz, name='list-quizzes-in-hallofquiz'),
+        path('list-user-feedback/', AsyncPublicData.list_user_feedback, name='list-user-feedback'),
+        path('list-quiz-feedback/', AsyncPublicData.list_quiz_feedback, name='list-quiz-feedback'),
+    ] + urlpatterns
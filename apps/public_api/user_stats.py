@@ -0,0 +1,174 @@
+import threading
+import uuid
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, FloatField, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from apps.contract.models import User, Quiz, QuizResultSnapshot, Flashcard
+from apps.health.metrics import USER_STATS_CACHE
+
+USER_STAT_FIELDS = ('total_quiz_taken', 'average_score', 'total_quizzes_owned', 'total_flashcards_owned')
+
+# Per-process hit/miss counters of the user stats cache, read them with user_stats_cache_info()
+_counters = {'hits': 0, 'misses': 0}
+_counters_lock = threading.Lock()
+
+
+def user_stats_annotations(user_ref):
+    # Correlated subqueries computing the dashboard stats of the user referenced by `user_ref`
+    # (e.g. 'user' on UserProfile, 'pk' on User), so stats load in the same query as the row
+    def per_user(queryset, field, aggregate, output_field):
+        rows = queryset.filter(**{field: OuterRef(user_ref)}).order_by().values(field)
+        return Subquery(rows.annotate(value=aggregate).values('value'), output_field=output_field)
+
+    return {
+        'total_quiz_taken': Coalesce(
+            per_user(QuizResultSnapshot.objects, 'candidate', Count('id'), IntegerField()), 0
+        ),
+        'average_score': Coalesce(
+            per_user(QuizResultSnapshot.objects, 'candidate', Avg('percentage_score'), FloatField()), 0.0
+        ),
+        'total_quizzes_owned': Coalesce(per_user(Quiz.objects, 'user', Count('id'), IntegerField()), 0),
+        'total_flashcards_owned': Coalesce(per_user(Flashcard.objects, 'user', Count('id'), IntegerField()), 0),
+    }
+
+
+def get_user_stats_many(user_pks):
+    """
+    Read-through cache of the dashboard stats, keyed by user pk. Returns {user_pk: stats}
+    for the users that exist; all cache misses are computed together in one query.
+    """
+    keys = {user_pk: _cache_key(user_pk) for user_pk in user_pks}
+    cached = cache.get_many(list(keys.values()))
+    stats = {user_pk: cached[key] for user_pk, key in keys.items() if key in cached}
+    missing = [user_pk for user_pk in keys if user_pk not in stats]
+
+    _record(hits=len(stats), misses=len(missing))
+
+    if missing:
+        rows = User.objects.filter(pk__in=missing).annotate(
+            **user_stats_annotations('pk')
+        ).values('pk', *USER_STAT_FIELDS)
+        computed = {row.pop('pk'): row for row in rows}
+        cache.set_many({keys[user_pk]: value for user_pk, value in computed.items()},
+                       settings.PUBLIC_API_USER_STATS_CACHE_TTL)
+        stats.update(computed)
+    return stats
+
+
+def get_profile_with_user_stats(profiles, user_pk):
+    """
+    (profile, stats) of the first profile of `profiles`, a UserProfile queryset of the user with
+    pk `user_pk`, or (None, None). The stats come from the same cache entry as get_user_stats_many;
+    on a miss they are annotated onto the profile query and cached, so it takes one query either way.
+    """
+    key = _cache_key(user_pk)
+    stats = cache.get(key)
+    _record(hits=int(stats is not None), misses=int(stats is None))
+    if stats is not None:
+        return profiles.first(), stats
+
+    profile = profiles.annotate(**user_stats_annotations('user')).first()
+    if profile is None:
+        return None, None
+    stats = {field: getattr(profile, field) for field in USER_STAT_FIELDS}
+    cache.set(key, stats, settings.PUBLIC_API_USER_STATS_CACHE_TTL)
+    return profile, stats
+
+
+async def aget_profile_with_user_stats(profiles, user_pk):
+    # Async counterpart of get_profile_with_user_stats
+    key = _cache_key(user_pk)
+    stats = await cache.aget(key)
+    _record(hits=int(stats is not None), misses=int(stats is None))
+    if stats is not None:
+        return await profiles.afirst(), stats
+
+    profile = await profiles.annotate(**user_stats_annotations('user')).afirst()
+    if profile is None:
+        return None, None
+    stats = {field: getattr(profile, field) for field in USER_STAT_FIELDS}
+    await cache.aset(key, stats, settings.PUBLIC_API_USER_STATS_CACHE_TTL)
+    return profile, stats
+
+
+def get_cached_user_stats(user_pk):
+    return get_user_stats_many([user_pk]).get(user_pk)
+
+
+async def aget_cached_user_stats(user_pk):
+    """
+    Async read of the same cache entry as get_cached_user_stats. A miss is computed with the
+    same single annotated query as get_user_stats_many, awaited with afirst().
+    """
+    key = _cache_key(user_pk)
+    stats = await cache.aget(key)
+    _record(hits=int(stats is not None), misses=int(stats is None))
+    if stats is not None:
+        return stats
+
+    stats = await User.objects.filter(pk=user_pk).annotate(
+        **user_stats_annotations('pk')
+    ).values(*USER_STAT_FIELDS).afirst()
+    if stats is not None:
+        await cache.aset(key, stats, settings.PUBLIC_API_USER_STATS_CACHE_TTL)
+    return stats
+
+
+def get_user_versions(user_pks):
+    """
+    Opaque version of the user info of each user, {user_pk: version}. It is replaced whenever the
+    user's stats are invalidated and at the latest after PUBLIC_API_USER_STATS_CACHE_TTL, so it
+    validates get-user-info responses without a query. Unknown versions start as new random ones.
+    """
+    keys = {user_pk: _version_key(user_pk) for user_pk in user_pks}
+    cached = cache.get_many(list(keys.values()))
+    versions = {user_pk: cached[key] for user_pk, key in keys.items() if key in cached}
+    missing = {user_pk: uuid.uuid4().hex for user_pk in keys if user_pk not in versions}
+    if missing:
+        cache.set_many({keys[user_pk]: version for user_pk, version in missing.items()},
+                       settings.PUBLIC_API_USER_STATS_CACHE_TTL)
+        versions.update(missing)
+    return versions
+
+
+async def aget_user_version(user_pk):
+    key = _version_key(user_pk)
+    version = await cache.aget(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        await cache.aset(key, version, settings.PUBLIC_API_USER_STATS_CACHE_TTL)
+    return version
+
+
+def invalidate_user_stats(user_pk):
+    # Delete once the write is committed so a concurrent reader cannot cache the old values again.
+    # The user info version goes with them, so validators issued before the write stop matching.
+    if user_pk is not None:
+        transaction.on_commit(lambda: cache.delete_many([_cache_key(user_pk), _version_key(user_pk)]))
+
+
+def user_stats_cache_info():
+    # Counts of this process only, public_api_user_stats_cache_total on the metrics endpoint covers every worker
+    with _counters_lock:
+        hits, misses = _counters['hits'], _counters['misses']
+    total = hits + misses
+    return {'hits': hits, 'misses': misses, 'hit_ratio': hits / total if total else None}
+
+
+def _record(hits, misses):
+    with _counters_lock:
+        _counters['hits'] += hits
+        _counters['misses'] += misses
+    # The same counts across all worker processes, for the metrics endpoint
+    USER_STATS_CACHE.labels('hit').inc(hits)
+    USER_STATS_CACHE.labels('miss').inc(misses)
+
+
+def _cache_key(user_pk):
+    return f"public_api:user_stats:{user_pk}"
+
+
+def _version_key(user_pk):
+    return f"public_api:user_version:{user_pk}"
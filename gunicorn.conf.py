@@ -0,0 +1,20 @@
+import glob
+import os
+
+# gunicorn loads this file from the working directory. With PROMETHEUS_MULTIPROC_DIR set, the
+# metrics of apps.health live in files in that directory: they are cleared when the server
+# starts, and the values of exited workers are marked dead so their in-progress gauge drops out.
+
+
+def on_starting(server):
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, '*.db')):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)